@@ -7,7 +7,7 @@ import math
 import importlib.util
 import os
 import random
-from typing import Any
+from typing import Any, Callable
 
 import pygame
 
@@ -16,11 +16,12 @@ from src.engine.settings import (
     load_settings,
     save_settings,
     load_keybinds,
-    save_keybinds,
+    store_keybinds,
     key_name as _key_name,
     DEFAULT_KEYBINDS,
 )
 from src.rendering.stage_renderer import StageRenderer
+from src.rendering.text_cache import clear_text_cache, render_cached, render_scaled_cached
 from src.rendering.hud_renderer import HUDRenderer
 from src.systems.collision import CollisionSystem
 from src.systems.combat import CombatSystem
@@ -29,10 +30,11 @@ from src.systems.shungoku import ShungokuManager
 from src.assets.sound_manager import SoundManager
 from src.assets.asset_manager import AssetManager
 from src.entities.effect import Effect
+from src.entities.effect import AttackEffect
 from src.entities.effect import StaticImageBurstEffect
 from src.entities.effect import Projectile
 from src.entities.effect import SuperProjectile
-from src.entities.player import Player, PlayerInput
+from src.entities.player import Player, PlayerInput, SpecialInputResult
 from src.entities.player_animator import PlayerAnimator
 from src.characters.ryuko import RYUKO
 from src.ui.command_list import CommandListMenu
@@ -40,12 +42,276 @@ from src.utils import constants
 from src.utils.paths import resource_path
 
 
+# キーバインドの既定値（アクション名, 既定キー）。起動時とキー設定保存時に int へ正規化してから使う。
+_KEYBIND_DEFAULTS: tuple[tuple[str, int], ...] = (
+    ("P1_LEFT", pygame.K_a),
+    ("P1_RIGHT", pygame.K_d),
+    ("P1_DOWN", pygame.K_s),
+    ("P1_JUMP", pygame.K_w),
+    ("P1_P", pygame.K_u),
+    ("P1_K", pygame.K_j),
+    ("P1_S", pygame.K_i),
+    ("P1_HS", pygame.K_k),
+    ("P1_D", pygame.K_o),
+    ("P1_LP", pygame.K_u),
+    ("P1_MP", pygame.K_i),
+    ("P1_HP", pygame.K_o),
+    ("P1_LK", pygame.K_j),
+    ("P1_MK", pygame.K_k),
+    ("P1_HK", pygame.K_l),
+    ("P2_LEFT", pygame.K_LEFT),
+    ("P2_RIGHT", pygame.K_RIGHT),
+    ("P2_DOWN", pygame.K_DOWN),
+    ("P2_JUMP", pygame.K_UP),
+    ("P2_ATTACK", pygame.K_SEMICOLON),
+)
+
+# ゲージ最大値。起動後に変わらないので、毎回 getattr しないよう一度だけ読む。
+_POWER_GAUGE_MAX = int(getattr(constants, "POWER_GAUGE_MAX", 1000))
+# 超必殺のゲージ消費量と暗転フレーム数も同様。
+_SUPER_COST = int(getattr(constants, "POWER_GAUGE_SUPER_COST", 500))
+_SUPER_FREEZE_FRAMES = int(getattr(constants, "SUPER_FREEZE_FRAMES", 30))
+# コマンド技のボタン先行入力猶予と投げダメージ。
+_COMMAND_BUTTON_EARLY_FRAMES = int(getattr(constants, "COMMAND_BUTTON_EARLY_FRAMES", 2))
+_THROW_DAMAGE = int(getattr(constants, "THROW_DAMAGE", 100))
+# 攻撃判定付きエフェクトのガード/ヒット時に出す画像（constants に定義があれば使う）。
+_GUARD_EFFECT_IMAGE = getattr(constants, "GUARD_EFFECT_IMAGE", None)
+_HIT_EFFECT_IMAGE = getattr(constants, "HIT_EFFECT_IMAGE", None)
+
+# Kキー攻撃の砂ぼこりエフェクト（6540）の固定パラメータ。P1/P2 で異なるのは位置と所有者だけ。
+_K_ATTACK_KWARGS: dict[str, int] = dict(
+    frames_per_image=2,
+    damage=80,
+    hitbox_width=100,
+    hitbox_height=60,
+    hitbox_offset_x=0,
+    hitbox_offset_y=30,  # 地面に接地（ヒットボックスの下半分を地面に配置）
+    startup_frames=2,
+    active_frames=10,
+    hitstop_frames=8,
+    hitstun_frames=15,
+    blockstun_frames=8,
+    knockback_px=20,
+    attacker_recoil_px=2,
+)
+
+
+def _spawn_k_attack(k_info: dict[str, Any], frames: list[pygame.Surface]) -> AttackEffect:
+    return AttackEffect(frames=frames, pos=k_info["pos"], owner_side=k_info["owner_side"], **_K_ATTACK_KWARGS)
+
+
+# HPバーの赤チップが現在HPへ近づく割合（1フレームあたり）。
+_HP_BAR_DAMAGE_LERP = float(constants.HP_BAR_DAMAGE_LERP)
+
+# 秒表示（タイマー・カウントダウン）の切り上げ用。0 除算しないよう 1 以上にしておく。
+_FPS = max(1, int(constants.FPS))
+# ラウンドタイマーの表示文字列（秒 → 文字列）。0 秒は "TIME UP"、1〜99 秒は 2 桁表示。
+_TIMER_TEXTS: tuple[str, ...] = ("TIME UP",) + tuple(f"{sec:02d}" for sec in range(1, 100))
+
+# CPU（P2）の思考間隔と各行動のクールダウン（フレーム数）。
+_CPU_DECISION_CD = int(constants.FPS * 0.20)
+_CPU_ATTACK_CD = int(constants.FPS * 0.45)
+_CPU_SUPER_CD = int(constants.FPS * 1.2)
+_CPU_HADOKEN_CD = int(constants.FPS * 0.9)
+_CPU_JUMP_CD = int(constants.FPS * 1.0)
+# CPU の行動抽選。16bit 乱数と比べる整数の閾値にしておき、毎回 float を作らない。
+_cpu_rng = random.Random()
+_CPU_SHINKU_CHANCE = int(0.12 * 65536)
+_CPU_HADOKEN_CHANCE = int(0.22 * 65536)
+_CPU_JUMP_CHANCE = int(0.06 * 65536)
+
+# 試合中にエッジ入力として扱うアクション（優先順）。
+_GAMEPLAY_KEY_ACTIONS: tuple[str, ...] = (
+    "P1_JUMP",
+    "P2_JUMP",
+    "P2_ATTACK",
+    "P1_P",
+    "P1_K",
+    "P1_S",
+    "P1_HS",
+    "P1_D",
+)
+
+# P1 の入力履歴表示に使うキー表（アクション名, 表示ラベル）。
+_P1_KEY_TABLE: tuple[tuple[str, str], ...] = (
+    ("P1_LEFT", "←"),
+    ("P1_DOWN", "↓"),
+    ("P1_RIGHT", "→"),
+    ("P1_JUMP", "↑"),
+    ("P1_LP", "U"),
+    ("P1_MP", "I"),
+    ("P1_HP", "O"),
+    ("P1_LK", "J"),
+    ("P1_MK", "K"),
+    ("P1_HK", "L"),
+)
+
+# メニュー操作のキー → 操作名。KEYDOWN ごとに一度だけ引き、各メニューは操作名で分岐する。
+_MENU_NAV_KEYMAP: dict[int, str] = {
+    pygame.K_UP: "up",
+    pygame.K_w: "up",
+    pygame.K_DOWN: "down",
+    pygame.K_s: "down",
+    pygame.K_LEFT: "left",
+    pygame.K_a: "left",
+    pygame.K_RIGHT: "right",
+    pygame.K_d: "right",
+    pygame.K_RETURN: "confirm",
+    pygame.K_u: "confirm",
+}
+# K_o は「戻る」とタイトルの開始キーを兼ねるため、操作名ではなくキー集合で判定する。
+_CANCEL_KEYS = frozenset({pygame.K_ESCAPE, pygame.K_o})
+# タイトルでは決定キーに加えて攻撃ボタン（U/I/O/J/K/L）でも開始できる。
+_TITLE_START_KEYS = frozenset({pygame.K_RETURN, pygame.K_u, pygame.K_i, pygame.K_o, pygame.K_j, pygame.K_k, pygame.K_l})
+
+# デバッグメニューのトグル行（表示名, 設定キー）を上から順に並べる。最後の「戻る」は含めない。
+_DEBUG_MENU_TOGGLES: tuple[tuple[str, str], ...] = (
+    ("キー履歴", "debug_ui_show_key_history"),
+    ("P1フレーム情報", "debug_ui_show_p1_frames"),
+    ("P2フレーム情報", "debug_ui_show_p2_frames"),
+    ("判定表示", "debug_draw"),
+    ("フレームメーター", "frame_meter_enabled"),
+    ("グリッド表示", "debug_show_grid"),
+)
+
+# 設定メニューの項目（状態ごと）。
+_MENU_ITEMS_TITLE: tuple[str, ...] = ("res", "bgm", "se", "keyconfig", "close")
+_MENU_ITEMS_BATTLE: tuple[str, ...] = ("res", "bgm", "se", "cmdlist", "keyconfig", "debug", "back", "close")
+_MENU_ITEMS_TRAINING: tuple[str, ...] = (
+    "res", "bgm", "se", "cmdlist", "keyconfig", "debug", "training", "back", "close",
+)
+
+# トレーニング設定の項目。
+_TRAINING_SETTINGS_ITEMS: tuple[str, ...] = (
+    "P1 HP残量",
+    "P2 HP残量",
+    "P1 SPゲージ",
+    "P2 SPゲージ",
+    "HP自動回復",
+    "SP自動回復",
+    "P2状態固定",
+    "開始位置",
+    "P2全ガード",
+    "戻る",
+)
+
+# 試合中（対戦・トレーニング）の状態。毎回 set を組み立てないよう共有する。
+_IN_PLAY_STATES = frozenset({GameState.BATTLE, GameState.TRAINING})
+
+# メインループで処理するイベントの種類（これ以外は毎フレーム破棄する）。
+_HANDLED_EVENT_TYPES: tuple[int, ...] = (
+    pygame.QUIT,
+    pygame.KEYDOWN,
+    pygame.WINDOWMINIMIZED,
+    pygame.WINDOWHIDDEN,
+    pygame.WINDOWRESTORED,
+    pygame.WINDOWSHOWN,
+    pygame.WINDOWMAXIMIZED,
+    pygame.WINDOWEXPOSED,
+)
+
+# 選択中メニュー項目の揺れ int(3 * sin(t / 120)) を 1ms 刻みで1周期ぶん表にしておく（t はミリ秒）。
+_MENU_SHAKE_PERIOD_MS = round(2 * math.pi * 120)
+_MENU_SHAKE_LUT: tuple[int, ...] = tuple(int(3 * math.sin(t / 120.0)) for t in range(_MENU_SHAKE_PERIOD_MS))
+
+
+# トレーニングのフレームメーター用。ヒットストップ中も技のフレーム数を数え続ける合成カウンタと、
+# そのカウンタからの状態分類。Enum のメンバー参照は毎回クラス属性の探索になるので、
+# 毎フレーム使う状態はモジュール変数に束縛しておく。
+_FS_IDLE = FrameState.IDLE
+_FS_STARTUP = FrameState.STARTUP
+_FS_ACTIVE = FrameState.ACTIVE
+_FS_RECOVERY = FrameState.RECOVERY
+_FS_STUN = FrameState.STUN
+_FS_SPECIAL = FrameState.SPECIAL
+# 両者とも IDLE がこのフレーム数続いたらメーターの記録を止める。
+_FRAME_METER_IDLE_PAUSE_FRAMES = 20
+# FrameSample は不変で、組み合わせも 状態 × ヒットストップ × コンボ の 24 通りしかないので、
+# 毎フレーム作らずに先に全部作って使い回す。
+_FRAME_SAMPLES: dict[tuple[FrameState, bool, bool], FrameSample] = {
+    (st, hs, combo): FrameSample(state=st, hitstop=hs, combo=combo)
+    for st in FrameState
+    for hs in (False, True)
+    for combo in (False, True)
+}
+
+
+def _classify_frame_state(pl: Player, *, synth_fc: int, in_shungoku_cinematic: bool) -> FrameState:
+    # in_shungoku_cinematic: このプレイヤーが瞬獄殺の演出中の攻撃側かどうか。
+    if in_shungoku_cinematic:
+        return _FS_SPECIAL
+    if pl.hitstun_frames_left > 0 or pl.blockstun_frames_left > 0:
+        return _FS_STUN
+
+    # 技のフレーム情報がなければ攻撃判定の区分はできないので、先に抜ける。
+    info = pl.get_last_move_frame_info()
+    if info is None:
+        return _FS_IDLE
+    oneshot_playing = (
+        pl.get_current_action_id() is not None
+        and pl._action_mode == "oneshot"
+        and not pl._action_finished
+    )
+    if not (pl.attacking or oneshot_playing or pl.is_rushing()):
+        return _FS_IDLE
+
+    f0 = max(0, synth_fc - 1)
+    startup = info.startup_frames
+    if f0 < startup:
+        return _FS_STARTUP
+    if f0 < startup + info.active_frames:
+        return _FS_ACTIVE
+    if f0 < info.total_frames:
+        return _FS_RECOVERY
+    return _FS_IDLE
+
+
+def _update_frame_meter_counter(
+    *,
+    pl: Player,
+    last_action_id: int | None,
+    last_fc: int,
+    synth_fc: int,
+) -> tuple[int | None, int, int]:
+    now_aid = pl.get_current_action_id()
+    now_fc = int(pl.get_action_frame_counter())
+    hitstop = pl.hitstop_frames_left > 0
+    if now_aid is None:
+        return None, now_fc, now_fc
+    if last_action_id is None or int(now_aid) != int(last_action_id):
+        return int(now_aid), now_fc, now_fc
+    if hitstop and now_fc == int(last_fc):
+        return int(last_action_id), now_fc, int(synth_fc) + 1
+    return int(last_action_id), now_fc, now_fc
+
 
 def main() -> None:
+    # αブレンドの blit に SDL 側の（SIMD 化された）ブリッタを使わせる。init より前に設定しておく。
+    os.environ.setdefault("PYGAME_BLEND_ALPHA_SDL2", "1")
     # Pygame 初期化。
     pygame.init()
     # メニュー操作でキー長押しリピートを有効化（初回300ms、以降50ms間隔）。
     pygame.key.set_repeat(300, 50)
+    # 使わない入力イベント（マウス・文字入力・キー離し・パッド）はそもそもキューに積ませない。
+    # 押しっぱなしの判定は get_pressed で読むので、KEYUP を捨ててもキー状態は正しく保たれる。
+    pygame.event.set_blocked(
+        [
+            pygame.MOUSEMOTION,
+            pygame.MOUSEBUTTONDOWN,
+            pygame.MOUSEBUTTONUP,
+            pygame.MOUSEWHEEL,
+            pygame.TEXTINPUT,
+            pygame.TEXTEDITING,
+            pygame.KEYUP,
+            pygame.JOYAXISMOTION,
+            pygame.JOYBALLMOTION,
+            pygame.JOYHATMOTION,
+            pygame.JOYBUTTONDOWN,
+            pygame.JOYBUTTONUP,
+            pygame.ACTIVEEVENT,
+            pygame.VIDEORESIZE,
+        ]
+    )
 
     settings = load_settings()
     bgm_volume_level = int(settings.get("bgm_volume_level", 70))
@@ -54,16 +320,68 @@ def main() -> None:
     se_volume_level = int(settings.get("se_volume_level", 60))
     se_volume_level = max(0, min(100, se_volume_level))
 
-    frame_meter_enabled = bool(settings.get("frame_meter_enabled", True))
-
     keybinds: dict[str, int] = load_keybinds(settings)
 
-    def _save_keybinds() -> None:
-        save_keybinds(settings, keybinds)
+    # int へ正規化したキーバインド。KEYDOWN / get_pressed のたびに keybinds.get + int() しないよう、
+    # 起動時とキー設定保存時にだけ作り直す。
+    keybinds_int: dict[str, int] = {}
+    # 入力履歴用のキー→ラベル表。
+    p1_name_map: dict[int, str] = {}
+    p1_key_set: frozenset[int] = frozenset()
+    # 試合中のジャンプ/攻撃ボタンのキー→アクション名。
+    gameplay_key_actions: dict[int, str] = {}
+    # 押しっぱなしで読むキー（P1右, P1左, P2右, P2左, P1下, P2下）。毎フレーム dict を引かないよう並べておく。
+    held_key_codes: tuple[int, int, int, int, int, int] = (0, 0, 0, 0, 0, 0)
+
+    def _rebuild_keybind_cache() -> None:
+        nonlocal p1_name_map, p1_key_set, held_key_codes
+        keybinds_int.clear()
+        for act, default in _KEYBIND_DEFAULTS:
+            keybinds_int[act] = int(keybinds.get(act, default))
+        keybinds_int["FIELD_RESET"] = int(keybinds.get("FIELD_RESET", keybinds.get("QUICK_RESET", pygame.K_r)))
+        p1_name_map = {keybinds_int[act]: label for act, label in _P1_KEY_TABLE}
+        p1_key_set = frozenset(p1_name_map)
+        gameplay_key_actions.clear()
+        # 同じキーが複数に割り当てられていたら、表の先頭側を優先する（逆順に入れて上書きさせる）。
+        for act in reversed(_GAMEPLAY_KEY_ACTIONS):
+            gameplay_key_actions[keybinds_int[act]] = act
+        held_key_codes = (
+            keybinds_int["P1_RIGHT"],
+            keybinds_int["P1_LEFT"],
+            keybinds_int["P2_RIGHT"],
+            keybinds_int["P2_LEFT"],
+            keybinds_int["P1_DOWN"],
+            keybinds_int["P2_DOWN"],
+        )
+
+    _rebuild_keybind_cache()
 
     def _save_settings(data: dict[str, Any]) -> None:
         save_settings(data)
 
+    # 音量スライダーのように連続で変わる設定は、押すたびに書き込まず dirty にしておき、
+    # 操作が落ち着いたら（一定時間経過・メニューを閉じた・終了時）まとめて保存する。
+    settings_dirty = False
+    settings_dirty_ms = 0
+    SETTINGS_FLUSH_DELAY_MS = 500
+
+    def _mark_settings_dirty() -> None:
+        nonlocal settings_dirty, settings_dirty_ms
+        settings_dirty = True
+        settings_dirty_ms = pygame.time.get_ticks()
+
+    def _flush_settings() -> None:
+        nonlocal settings_dirty
+        if settings_dirty:
+            _save_settings(settings)
+            settings_dirty = False
+
+    def _save_keybinds() -> None:
+        # キー割り当ても settings dict へ反映するだけにして、書き込みは遅延保存に任せる。
+        store_keybinds(settings, keybinds)
+        _mark_settings_dirty()
+        _rebuild_keybind_cache()
+
     jp_font_path = resource_path("assets/fonts/TogeMaruGothic-700-Bold.ttf")
     mono_font_name = "consolas"
     if jp_font_path.exists():
@@ -82,8 +400,9 @@ def main() -> None:
         debug_font = pygame.font.SysFont("meiryo", 22)
         frame_meter_adv_font = pygame.font.SysFont("meiryo", 36)
         menu_font = pygame.font.SysFont(mono_font_name, 34)
+    # ポーズ表示用（既定フォント）。
+    pause_font = pygame.font.Font(None, 48)
 
-    stage_renderer = StageRenderer(rain_count=90)
     hud_renderer = HUDRenderer(
         title_font=title_font,
         prompt_font=prompt_font,
@@ -96,9 +415,16 @@ def main() -> None:
     screen = pygame.display.set_mode((constants.SCREEN_WIDTH, constants.SCREEN_HEIGHT))
     pygame.display.set_caption(constants.GAME_TITLE)
     clock = pygame.time.Clock()
-
-    # ステージ（論理解像度）への描画先。ここにゲームを描いて、最後にウィンドウへ拡大して表示する。
-    stage_surface = pygame.Surface((constants.STAGE_WIDTH, constants.STAGE_HEIGHT)).convert()
+    # タイトル/キャラ選択で選択項目の横に点滅させる矢印。
+    menu_arrow = menu_font.render("▶", True, (90, 255, 220)).convert_alpha()
+    # ポーズ中の案内文とその半透明の下地。文言は固定なので一度だけ作る。
+    pause_text = pause_font.render("PAUSED (M: Resume / >: Frame Advance)", True, (255, 255, 0)).convert_alpha()
+    pause_bg = pygame.Surface((pause_text.get_width() + 20, pause_text.get_height() + 10)).convert()
+    pause_bg.fill((0, 0, 0))
+    pause_bg.set_alpha(180)
+
+    # ステージ背景は convert() するため、display 初期化後に生成する。
+    stage_renderer = StageRenderer(rain_count=90)
 
     # 解像度候補（ゲーム内で切り替え可能）。
     resolutions: list[tuple[int, int]] = [
@@ -116,6 +442,9 @@ def main() -> None:
     # Phase 1 は「塗りつぶし矩形」だけでキャラクターを表現する。
     p1 = Player(x=150, color=constants.COLOR_P1, character=RYUKO)
     p2 = Player(x=constants.STAGE_WIDTH - 200, color=constants.COLOR_P2, character=RYUKO)
+    # 毎フレーム Player に渡す入力。apply_input は中身を読むだけなので、同じインスタンスを書き換えて使い回す。
+    p1_input = PlayerInput(move_x=0, jump_pressed=False, crouch=False, attack_id=None)
+    p2_input = PlayerInput(move_x=0, jump_pressed=False, crouch=False, attack_id=None)
 
     actions_by_id: dict[int, dict[str, Any]] = {}
 
@@ -125,29 +454,25 @@ def main() -> None:
         air_py = resource_path("assets/images/RYUKO2nd/ryuko_air_actions.py")
         sprites_root = resource_path("assets/images/RYUKO2nd/organized")
 
-        spec = importlib.util.spec_from_file_location("ryuko_air_actions", str(air_py))
-        if spec is not None and spec.loader is not None:
-            module = importlib.util.module_from_spec(spec)
-            spec.loader.exec_module(module)
-            actions = getattr(module, "ACTIONS", None)
-            if isinstance(actions, list):
-                PlayerAnimator.apply_all_patches(actions)
-                if not PlayerAnimator.actions_have_frame_clsns(actions):
-                    air_parser_py = resource_path("scripts/organize_ryuko2nd_assets.py")
-                    air_file = resource_path("assets/images/RYUKO2nd/RYUKO.AIR")
-                    parser_spec = importlib.util.spec_from_file_location("ryuko_air_parser", str(air_parser_py))
-                    if parser_spec is not None and parser_spec.loader is not None:
-                        parser_module = importlib.util.module_from_spec(parser_spec)
-                        parser_spec.loader.exec_module(parser_module)
-                        parse_air_file = getattr(parser_module, "parse_air_file", None)
-                        if callable(parse_air_file):
-                            parsed_actions = parse_air_file(air_file)
-                            if isinstance(parsed_actions, list):
-                                actions = parsed_actions
-                                PlayerAnimator.apply_all_patches(actions)
-                actions_by_id = {int(a.get("action")): a for a in actions if isinstance(a, dict) and "action" in a}
-                p1.set_mugen_animation(actions=actions, sprites_root=sprites_root)
-                p2.set_mugen_animation(actions=actions, sprites_root=sprites_root)
+        actions = AssetManager.load_air_actions(air_py)
+        if isinstance(actions, list):
+            PlayerAnimator.apply_all_patches(actions)
+            if not PlayerAnimator.actions_have_frame_clsns(actions):
+                air_parser_py = resource_path("scripts/organize_ryuko2nd_assets.py")
+                air_file = resource_path("assets/images/RYUKO2nd/RYUKO.AIR")
+                parser_spec = importlib.util.spec_from_file_location("ryuko_air_parser", str(air_parser_py))
+                if parser_spec is not None and parser_spec.loader is not None:
+                    parser_module = importlib.util.module_from_spec(parser_spec)
+                    parser_spec.loader.exec_module(parser_module)
+                    parse_air_file = getattr(parser_module, "parse_air_file", None)
+                    if callable(parse_air_file):
+                        parsed_actions = parse_air_file(air_file)
+                        if isinstance(parsed_actions, list):
+                            actions = parsed_actions
+                            PlayerAnimator.apply_all_patches(actions)
+            actions_by_id = {int(a.get("action")): a for a in actions if isinstance(a, dict) and "action" in a}
+            p1.set_mugen_animation(actions=actions, sprites_root=sprites_root)
+            p2.set_mugen_animation(actions=actions, sprites_root=sprites_root)
     except Exception:
         pass
     
@@ -159,20 +484,110 @@ def main() -> None:
 
     # すべてのゲームアセットを一括読み込み
     assets = AssetManager.load_all_assets(p1, p2)
+
+    # 瞬獄殺KO演出（5400番）の画像は左右両方の向きを先に作っておく（描画のたびに flip しない）。
+    # キーは (サイド, 画像番号, 向き)。
+    shungoku_ko_sprites: dict[tuple[int, int, int], pygame.Surface] = {}
+    for side, pl in ((1, p1), (2, p2)):
+        pl_sprites = getattr(pl, "_sprites", {})
+        for idx in range(1, 17):
+            img = pl_sprites.get((5400, idx))
+            if img is not None:
+                shungoku_ko_sprites[(side, idx, 1)] = img
+                shungoku_ko_sprites[(side, idx, -1)] = pygame.transform.flip(img, True, False)
+
+    # ステージ（論理解像度）への描画先。ここにゲームを描いて、最後にウィンドウへ拡大して表示する。
+    # アセット読込後に作り、最終的な画面フォーマットへ揃える。
+    stage_surface = pygame.Surface((constants.STAGE_WIDTH, constants.STAGE_HEIGHT)).convert()
+    # 拡大結果の書き込み先。毎フレーム新しい Surface を確保しないよう使い回す（解像度変更時に作り直す）。
+    scaled_buf: pygame.Surface | None = None
+    # 超必殺の暗転フラッシュ用オーバーレイ。ステージサイズは固定なので一度だけ作り、set_alpha で濃さを付ける。
+    flash_white = pygame.Surface((constants.STAGE_WIDTH, constants.STAGE_HEIGHT)).convert()
+    flash_white.fill((255, 255, 255))
+    flash_white.set_alpha(170)
+    flash_black = pygame.Surface((constants.STAGE_WIDTH, constants.STAGE_HEIGHT)).convert()
+    flash_black.fill((0, 0, 0))
+    flash_black.set_alpha(160)
+
+    # メニュー表示中の背景（拡大済みステージ＋暗幕）と、前フレームで転送したパネル構成。
+    menu_backdrop = pygame.Surface((constants.SCREEN_WIDTH, constants.SCREEN_HEIGHT)).convert()
+    menu_backdrop_ready = False
+    menu_presented_layers: tuple | None = None
+    # メニュー画面を描き直す必要があるか（キー入力やウィンドウの再表示で立てる）。
+    menu_ui_dirty = True
+    # 選択行の強調枠。毎フレーム Rect を作らず、位置だけ書き換えて使い回す。
+    menu_highlight_rect = pygame.Rect(0, 0, 0, 0)
+
+    # 地面のライン（幅2px）。毎フレーム draw.line で引かず、一度作った帯を貼るだけにする。
+    ground_line = pygame.Surface((constants.STAGE_WIDTH, 2)).convert()
+    ground_line.fill((80, 80, 80))
+
+    def _scale_stage_to_screen() -> pygame.Surface:
+        nonlocal scaled_buf
+        size = (constants.SCREEN_WIDTH, constants.SCREEN_HEIGHT)
+        if stage_surface.get_size() == size:
+            # 等倍なら拡大処理自体が不要。
+            return stage_surface
+        if scaled_buf is None or scaled_buf.get_size() != size:
+            scaled_buf = pygame.Surface(size).convert()
+        pygame.transform.smoothscale(stage_surface, size, scaled_buf)
+        return scaled_buf
+
+    def _blit_stage_scaled(dest: pygame.Surface, offset_x: int = 0) -> None:
+        # stage_surface を画面サイズへ拡大して dest に描く。
+        # ずらさずに全面へ描くときは拡大結果を dest へ直接書き込み、中間バッファからの全面コピーを省く。
+        size = (constants.SCREEN_WIDTH, constants.SCREEN_HEIGHT)
+        if offset_x == 0 and stage_surface.get_size() != size and dest.get_size() == size:
+            pygame.transform.smoothscale(stage_surface, size, dest)
+            return
+        dest.blit(_scale_stage_to_screen(), (offset_x, 0))
+
+    # 画面を暗くする半透明の黒幕とメニューのパネル。毎フレーム SRCALPHA の Surface を確保して塗り直す代わりに、
+    # 一度だけ作って set_alpha で濃さを変える（画面サイズのものは解像度変更時に作り直す）。
+    dim_stage = pygame.Surface((constants.STAGE_WIDTH, constants.STAGE_HEIGHT)).convert()
+    dim_stage.fill((0, 0, 0))
+    dim_screen_buf: pygame.Surface | None = None
+    menu_panel_bufs: dict[tuple[int, int], pygame.Surface] = {}
+
+    def _dim_screen(alpha: int) -> pygame.Surface:
+        nonlocal dim_screen_buf
+        if dim_screen_buf is None:
+            dim_screen_buf = pygame.Surface((constants.SCREEN_WIDTH, constants.SCREEN_HEIGHT)).convert()
+            dim_screen_buf.fill((0, 0, 0))
+        dim_screen_buf.set_alpha(alpha)
+        return dim_screen_buf
+
+    def _dim_stage(alpha: int) -> pygame.Surface:
+        dim_stage.set_alpha(alpha)
+        return dim_stage
+
+    def _menu_panel(size: tuple[int, int]) -> pygame.Surface:
+        panel = menu_panel_bufs.get(size)
+        if panel is None:
+            panel = pygame.Surface(size).convert()
+            panel.fill((18, 18, 22))
+            panel.set_alpha(235)
+            menu_panel_bufs[size] = panel
+        return panel
     
     effects: list[Effect] = []
+    # 攻撃判定を持つエフェクトだけを別に持っておく（ヒット判定で effects 全体を型チェックしないため）。
+    attack_effects: list[AttackEffect] = []
     projectiles: list[Projectile] = []
 
-    # 判定枠線（Hurtbox/Pushbox/Hitbox）を描画するかどうか。
-    # F3 で切り替える。
-    debug_draw = bool(settings.get("debug_draw", constants.DEBUG_DRAW_DEFAULT))
-    debug_show_grid = bool(settings.get("debug_show_grid", False))
+    # デバッグ表示の ON/OFF（デバッグメニューの各トグル行）。キーは設定ファイルのキーと同じ。
+    # debug_draw は判定枠線（Hurtbox/Pushbox/Hitbox）の描画で、F3 でも切り替える。
+    debug_flags: dict[str, bool] = {
+        "debug_ui_show_key_history": bool(settings.get("debug_ui_show_key_history", True)),
+        "debug_ui_show_p1_frames": bool(settings.get("debug_ui_show_p1_frames", True)),
+        "debug_ui_show_p2_frames": bool(settings.get("debug_ui_show_p2_frames", True)),
+        "debug_draw": bool(settings.get("debug_draw", constants.DEBUG_DRAW_DEFAULT)),
+        "frame_meter_enabled": bool(settings.get("frame_meter_enabled", True)),
+        "debug_show_grid": bool(settings.get("debug_show_grid", False)),
+    }
 
     debugmenu_open = False
     debugmenu_selection = 0
-    debug_ui_show_key_history = bool(settings.get("debug_ui_show_key_history", True))
-    debug_ui_show_p1_frames = bool(settings.get("debug_ui_show_p1_frames", True))
-    debug_ui_show_p2_frames = bool(settings.get("debug_ui_show_p2_frames", True))
 
     # ESC で表示する簡易メニュー。
     menu_open = False
@@ -194,6 +609,11 @@ def main() -> None:
     training_p2_all_guard = False
     training_auto_recover_hp = False
     training_auto_recover_sp = False
+    # 自動回復の目標値。残量設定を変えたときだけ計算し直す（毎フレーム割合から求めない）。
+    training_hp_target_p1 = p1.max_hp
+    training_hp_target_p2 = p2.max_hp
+    training_sp_target_p1 = _POWER_GAUGE_MAX
+    training_sp_target_p2 = _POWER_GAUGE_MAX
 
     training_p2_state_lock = 0
     training_start_position = 0
@@ -238,6 +658,13 @@ def main() -> None:
     shungoku_super_se_cooldown = shungoku_state.super_se_cooldown
     shungoku_ko_anim_frames_per_image = shungoku_state.ko_anim_frames_per_image
     shungoku_pan_total_frames = shungoku_state.pan_total_frames
+    # 瞬獄殺のカメラパンは経過フレームに対して山形（0→1→0）に動く。パン量は発動ごとに
+    # 決まるので、開始時に経過フレームで引ける表（ピクセル）を作っておく。
+    shungoku_pan_ease: tuple[float, ...] = tuple(
+        max(0.0, min(1.0, (t / 0.5) if t < 0.5 else ((1.0 - t) / 0.5)))
+        for t in (i / max(1, shungoku_pan_total_frames) for i in range(shungoku_pan_total_frames + 1))
+    )
+    shungoku_pan_offsets: tuple[int, ...] = ()
 
     keyconfig_actions: list[tuple[str, str]] = [
         ("P1 左", "P1_LEFT"),
@@ -256,13 +683,58 @@ def main() -> None:
         ("P2 攻撃", "P2_ATTACK"),
         ("フィールドリセット(トレモ専用)", "FIELD_RESET"),
     ]
+    # 左右キーでの P1 列 ⇔ P2 列の移動先。行構成は固定なので、起動時に一度だけ求めておく。
+    keyconfig_p1_idx = tuple(i for i, (_l, a) in enumerate(keyconfig_actions) if a.startswith("P1_"))
+    keyconfig_p2_idx = tuple(i for i, (_l, a) in enumerate(keyconfig_actions) if a.startswith("P2_"))
+    keyconfig_right_of: dict[int, int] = {}
+    keyconfig_left_of: dict[int, int] = {}
+    if keyconfig_p1_idx and keyconfig_p2_idx:
+        for pos, i in enumerate(keyconfig_p1_idx):
+            keyconfig_right_of[i] = keyconfig_p2_idx[min(pos, len(keyconfig_p2_idx) - 1)]
+        for pos, i in enumerate(keyconfig_p2_idx):
+            keyconfig_left_of[i] = keyconfig_p1_idx[min(pos, len(keyconfig_p1_idx) - 1)]
+    # キーコンフィグ画面の左右の列（左: P1 と共通の操作、右: P2）。行構成は固定なので描画のたびに振り分けない。
+    keyconfig_left_rows: tuple[tuple[str, str, int], ...] = tuple(
+        (label, act, i) for i, (label, act) in enumerate(keyconfig_actions) if not act.startswith("P2_")
+    )
+    keyconfig_right_rows: tuple[tuple[str, str, int], ...] = tuple(
+        (label, act, i) for i, (label, act) in enumerate(keyconfig_actions) if act.startswith("P2_")
+    )
+    keyconfig_left_idxs = tuple(i for _l, _a, i in keyconfig_left_rows)
+    keyconfig_right_idxs = tuple(i for _l, _a, i in keyconfig_right_rows)
+
+    # 列幅に収まるよう末尾を「…」で詰めた行ラベル。ラベルも列幅もほぼ固定なので (ラベル, 最大幅) で覚えておく。
+    keyconfig_label_fit: dict[tuple[str, int], str] = {}
+
+    def _fit_keyconfig_label(label: str, max_w: int) -> str:
+        key = (label, max_w)
+        fitted = keyconfig_label_fit.get(key)
+        if fitted is not None:
+            return fitted
+        fitted = label
+        try:
+            if keycfg_font.size(label)[0] > max_w:
+                # label[:n] + "…" の幅は n について単調なので、収まる最長の n を二分探索する。
+                lo, hi = 1, max(1, len(label) - 2)
+                best = 0
+                while lo <= hi:
+                    mid = (lo + hi) // 2
+                    if keycfg_font.size(label[:mid] + "…")[0] <= max_w:
+                        best = mid
+                        lo = mid + 1
+                    else:
+                        hi = mid - 1
+                fitted = label[:best] + "…" if best > 0 else label[:1]
+        except Exception:
+            pass
+        keyconfig_label_fit[key] = fitted
+        return fitted
 
     # CommandListMenuインスタンスを作成（actions_by_id読み込み後に初期化）
     command_list_menu: CommandListMenu | None = None
 
     # タイトル画面とバトル画面の状態管理。
     game_state = GameState.TITLE
-    title_start_keys = {pygame.K_u, pygame.K_i, pygame.K_o, pygame.K_j, pygame.K_k, pygame.K_l}
     title_menu_items = ["BATTLE", "TRAINING", "SETTING", "EXIT"]
     title_menu_selection = 0
 
@@ -291,7 +763,6 @@ def main() -> None:
     # 背景画像はassetsから取得
     stage_bg_img = assets.stage_bg_img
     stage_bg_frames: list[pygame.Surface] = stage_renderer.stage_bg_frames
-    rain_drops = stage_renderer.rain_drops
 
     sound_manager = SoundManager()
     sound_manager.se_volume_level = se_volume_level
@@ -351,6 +822,11 @@ def main() -> None:
 
     # タイトル背景はassetsから取得
     title_bg_img = assets.title_bg_img
+    # タイトル/キャラ選択の背景は「ステージサイズに拡大して薄くしたもの」しか使わないので、先に作っておく。
+    title_bg_dim: pygame.Surface | None = None
+    if title_bg_img is not None:
+        title_bg_dim = pygame.transform.smoothscale(title_bg_img, (constants.STAGE_WIDTH, constants.STAGE_HEIGHT))
+        title_bg_dim.set_alpha(60)
 
     # “押した瞬間だけ True” にしたい入力は、KEYDOWN でトリガを立てて
     # フレームの先頭で False に戻す（エッジ入力）。
@@ -359,7 +835,7 @@ def main() -> None:
     p1_attack_id: str | None = None
     p2_attack_id: str | None = None
 
-    p1_key_history: list[str] = []
+    p1_key_history: deque[str] = deque(maxlen=16)
 
     # HPバー用の「赤チップ残り」値（見た目用）。
     p1_chip_hp: float = float(p1.max_hp)
@@ -378,7 +854,7 @@ def main() -> None:
     cpu_special_cooldown: int = 0
 
     def _apply_resolution(size: tuple[int, int]) -> None:
-        nonlocal screen
+        nonlocal screen, scaled_buf, dim_screen_buf
         w, h = size
 
         # 画面（ウィンドウ）サイズだけを変更する。
@@ -387,6 +863,11 @@ def main() -> None:
         constants.SCREEN_HEIGHT = int(h)
 
         screen = pygame.display.set_mode((constants.SCREEN_WIDTH, constants.SCREEN_HEIGHT))
+        scaled_buf = None
+        dim_screen_buf = None
+        menu_panel_bufs.clear()
+        # 画面モードを作り直したので、display 形式に変換済みのテキストも作り直させる。
+        clear_text_cache()
 
     def reset_match() -> None:
         # デバッグ用の「試合リセット」。
@@ -395,7 +876,7 @@ def main() -> None:
         nonlocal p1_chip_hp, p2_chip_hp, round_timer_frames_left, battle_countdown_frames_left, battle_countdown_last_announce
 
         if game_state == GameState.TRAINING:
-            preset = int(training_start_position)
+            preset = training_start_position
             if preset == 1:
                 p1.pos_x = float(140 + (p1.rect.width // 2))
                 p2.pos_x = float(260 + (p2.rect.width // 2))
@@ -436,7 +917,7 @@ def main() -> None:
         p2_chip_hp = float(p2.hp)
 
         if game_state == GameState.TRAINING:
-            max_sp = int(getattr(constants, "POWER_GAUGE_MAX", 1000))
+            max_sp = _POWER_GAUGE_MAX
             p1.power_gauge = int(round(max_sp * (float(training_sp_percent_p1) / 100.0)))
             p2.power_gauge = int(round(max_sp * (float(training_sp_percent_p2) / 100.0)))
 
@@ -498,6 +979,36 @@ def main() -> None:
         nonlocal shungoku_super_se_cooldown
         shungoku_super_se_cooldown = 0
 
+    # トレーニング設定メニューの値変更。キー入力のたびに作り直さないよう、ここで一度だけ定義する。
+    def _apply_training_hp(*, side: int, percent: int) -> None:
+        nonlocal p1_chip_hp, p2_chip_hp, training_hp_target_p1, training_hp_target_p2
+        if side == 1:
+            training_hp_target_p1 = round(p1.max_hp * (float(percent) / 100.0))
+            p1.hp = training_hp_target_p1
+            p1_chip_hp = float(p1.hp)
+        else:
+            training_hp_target_p2 = round(p2.max_hp * (float(percent) / 100.0))
+            p2.hp = training_hp_target_p2
+            p2_chip_hp = float(p2.hp)
+
+    def _apply_training_sp(*, side: int, percent: int) -> None:
+        nonlocal training_sp_target_p1, training_sp_target_p2
+        sp = round(_POWER_GAUGE_MAX * (float(percent) / 100.0))
+        if side == 1:
+            training_sp_target_p1 = sp
+            p1.power_gauge = sp
+        else:
+            training_sp_target_p2 = sp
+            p2.power_gauge = sp
+
+    def _cycle_p2_lock(delta: int) -> None:
+        nonlocal training_p2_state_lock
+        training_p2_state_lock = (training_p2_state_lock + delta) % 4
+
+    def _cycle_start_pos(delta: int) -> None:
+        nonlocal training_start_position
+        training_start_position = (training_start_position + delta) % 3
+
     _apply_resolution((constants.SCREEN_WIDTH, constants.SCREEN_HEIGHT))
     reset_match()
 
@@ -507,20 +1018,581 @@ def main() -> None:
     frame_paused = False
     frame_advance = False
 
+    # ------------------------------------------------------------------
+    # キー入力のディスパッチ表
+    # ------------------------------------------------------------------
+
+    # どの画面でも最初に判定し、該当キーなら（効果の有無に関わらず）消費するキー。
+    def _key_toggle_debug_draw() -> None:
+        if game_state == GameState.TRAINING:
+            debug_flags["debug_draw"] = not debug_flags["debug_draw"]
+
+    def _key_toggle_frame_pause() -> None:
+        # Mキー: フレームポーズのトグル
+        nonlocal frame_paused
+        if game_state in _IN_PLAY_STATES:
+            frame_paused = not frame_paused
+
+    def _key_frame_advance() -> None:
+        # >キー（Shiftなし）: ポーズ中に1フレーム進める
+        nonlocal frame_advance
+        if game_state in _IN_PLAY_STATES and frame_paused:
+            frame_advance = True
+
+    global_key_handlers: dict[int, Callable[[], None]] = {
+        pygame.K_F3: _key_toggle_debug_draw,
+        pygame.K_m: _key_toggle_frame_pause,
+        pygame.K_PERIOD: _key_frame_advance,
+    }
+
+    # (画面, キー) ごとのデバッグ用ショートカット。True を返したらイベントを消費する。
+    def _key_cheat_shungoku() -> bool:
+        if menu_open:
+            return False
+        p1.power_gauge = _POWER_GAUGE_MAX
+        p1.start_shungokusatsu()
+        return True
+
+    def _key_cheat_shinku() -> bool:
+        nonlocal super_freeze_frames_left, super_freeze_attacker_side
+        p1.power_gauge = _POWER_GAUGE_MAX
+        if p1.spend_power(_SUPER_COST):
+            p1.start_shinku_hadoken()
+            if beam_se is not None:
+                beam_se.play()
+            super_freeze_frames_left = _SUPER_FREEZE_FRAMES
+            super_freeze_attacker_side = 1
+        return True
+
+    state_key_handlers: dict[tuple[GameState, int], Callable[[], bool]] = {}
+    for _st in _IN_PLAY_STATES:
+        state_key_handlers[(_st, pygame.K_h)] = _key_cheat_shungoku
+        state_key_handlers[(_st, pygame.K_n)] = _key_cheat_shinku
+
+    # キー入力による試合リセットと BGM 切り替えは、同じフレームに何度要求されても
+    # イベント処理の後で一度だけ実行する（最終的な game_state に対して適用される）。
+    match_reset_requested = False
+    bgm_update_requested = False
+
+    def _request_match_reset() -> None:
+        nonlocal match_reset_requested
+        match_reset_requested = True
+
+    def _request_bgm_update() -> None:
+        nonlocal bgm_update_requested
+        bgm_update_requested = True
+
+    # 画面ごとのキー処理（タイトル・キャラ選択・リザルト）。True を返したらイベントを消費する。
+    def _keydown_result(key: int, nav: str | None) -> bool:
+        nonlocal game_state, menu_open, cmdlist_open, running
+        nonlocal p1_round_wins, p2_round_wins, result_winner_side, result_anim_counter, result_menu_selection
+        if key == pygame.K_ESCAPE:
+            game_state = GameState.TITLE
+            menu_open = False
+            cmdlist_open = False
+            p1_round_wins = 0
+            p2_round_wins = 0
+            result_winner_side = None
+            result_anim_counter = 0
+            _request_match_reset()
+            effects.clear()
+            attack_effects.clear()
+            projectile_system.projectiles.clear()
+            _request_bgm_update()
+            return True
+
+        if nav == "up":
+            result_menu_selection = (result_menu_selection - 1) % len(result_menu_items)
+            menu_move_se.play()
+            return True
+        if nav == "down":
+            result_menu_selection = (result_menu_selection + 1) % len(result_menu_items)
+            menu_move_se.play()
+            return True
+
+        if nav == "confirm":
+            menu_confirm_se.play()
+
+            selected = result_menu_items[result_menu_selection]
+            if selected == "rematch":
+                game_state = GameState.BATTLE
+                debug_flags["debug_draw"] = False
+                menu_open = False
+                cmdlist_open = False
+                p1_round_wins = 0
+                p2_round_wins = 0
+                result_winner_side = None
+                result_anim_counter = 0
+                _request_match_reset()
+                effects.clear()
+                attack_effects.clear()
+                projectiles.clear()
+                _request_bgm_update()
+            elif selected == "back_to_title":
+                game_state = GameState.TITLE
+                menu_open = False
+                cmdlist_open = False
+                p1_round_wins = 0
+                p2_round_wins = 0
+                result_winner_side = None
+                result_anim_counter = 0
+                _request_match_reset()
+                effects.clear()
+                attack_effects.clear()
+                projectiles.clear()
+                _request_bgm_update()
+            elif selected == "exit":
+                running = False
+            return True
+        return False
+
+    def _keydown_title_settings(key: int, nav: str | None) -> bool:
+        nonlocal menu_open, keyconfig_open, keyconfig_waiting_action, keyconfig_selection, menu_selection
+        nonlocal current_res_index, bgm_volume_level, se_volume_level, bgm_volume_changed, se_volume_changed
+        if key == pygame.K_ESCAPE:
+            menu_open = False
+            keyconfig_open = False
+            keyconfig_waiting_action = None
+        elif nav == "up":
+            menu_selection = (menu_selection - 1) % len(_MENU_ITEMS_TITLE)
+            menu_move_se.play()
+        elif nav == "down":
+            menu_selection = (menu_selection + 1) % len(_MENU_ITEMS_TITLE)
+            menu_move_se.play()
+        elif nav == "left":
+            if menu_selection == 0:
+                current_res_index = (current_res_index - 1) % len(resolutions)
+            elif menu_selection == 1:
+                bgm_volume_level = max(0, bgm_volume_level - 1)
+                settings["bgm_volume_level"] = int(bgm_volume_level)
+                _mark_settings_dirty()
+                bgm_volume_changed = True
+            elif menu_selection == 2:
+                se_volume_level = max(0, se_volume_level - 1)
+                settings["se_volume_level"] = int(se_volume_level)
+                _mark_settings_dirty()
+                se_volume_changed = True
+        elif nav == "right":
+            if menu_selection == 0:
+                current_res_index = (current_res_index + 1) % len(resolutions)
+            elif menu_selection == 1:
+                bgm_volume_level = min(100, bgm_volume_level + 1)
+                settings["bgm_volume_level"] = int(bgm_volume_level)
+                _mark_settings_dirty()
+                bgm_volume_changed = True
+            elif menu_selection == 2:
+                se_volume_level = min(100, se_volume_level + 1)
+                settings["se_volume_level"] = int(se_volume_level)
+                _mark_settings_dirty()
+                se_volume_changed = True
+        elif nav == "confirm":
+            menu_confirm_se.play()
+            if menu_selection == 0:
+                _apply_resolution(resolutions[current_res_index])
+                _request_match_reset()
+            elif menu_selection == 3:
+                keyconfig_open = True
+                keyconfig_selection = 0
+                keyconfig_waiting_action = None
+            elif menu_selection == 4:
+                menu_open = False
+        return True
+
+    def _keydown_title(key: int, nav: str | None) -> bool:
+        nonlocal game_state, menu_open, cmdlist_open, running
+        nonlocal title_menu_selection, char_select_selection, char_select_p2_cpu, char_select_next_state
+        if menu_open:
+            return _keydown_title_settings(key, nav)
+        if nav == "up":
+            title_menu_selection = (title_menu_selection - 1) % len(title_menu_items)
+            menu_move_se.play()
+        elif nav == "down":
+            title_menu_selection = (title_menu_selection + 1) % len(title_menu_items)
+            menu_move_se.play()
+        elif key in _TITLE_START_KEYS:
+            menu_confirm_se.play()
+            selected = title_menu_items[title_menu_selection]
+            if selected == "BATTLE":
+                start_se.play()
+                game_state = GameState.CHAR_SELECT
+                debug_flags["debug_draw"] = False
+                menu_open = False
+                cmdlist_open = False
+                char_select_selection = 0
+                char_select_p2_cpu = True
+                char_select_next_state = GameState.BATTLE
+                _request_bgm_update()
+            elif selected == "TRAINING":
+                start_se.play()
+                game_state = GameState.CHAR_SELECT
+                debug_flags["debug_draw"] = True
+                menu_open = False
+                cmdlist_open = False
+                char_select_selection = 0
+                char_select_p2_cpu = False
+                char_select_next_state = GameState.TRAINING
+                _request_bgm_update()
+            elif selected == "SETTING":
+                menu_open = True
+            elif selected == "EXIT":
+                running = False
+        return True
+
+    def _keydown_char_select(key: int, nav: str | None) -> bool:
+        nonlocal game_state, menu_open, cmdlist_open, running
+        nonlocal char_select_selection, char_select_p2_cpu, cpu_enabled_battle, cpu_enabled_training
+        nonlocal p1_round_wins, p2_round_wins, result_winner_side, result_menu_selection
+        if key == pygame.K_ESCAPE:
+            game_state = GameState.TITLE
+            menu_open = False
+            cmdlist_open = False
+            _request_bgm_update()
+            return True
+
+        if nav == "up":
+            char_select_selection = (char_select_selection - 1) % len(char_select_items)
+            menu_move_se.play()
+            return True
+        if nav == "down":
+            char_select_selection = (char_select_selection + 1) % len(char_select_items)
+            menu_move_se.play()
+            return True
+
+        if nav in ("left", "right"):
+            if char_select_items[char_select_selection] == "P2":
+                char_select_p2_cpu = not char_select_p2_cpu
+                menu_move_se.play()
+            return True
+
+        if nav == "confirm":
+            menu_confirm_se.play()
+
+            sel = char_select_items[char_select_selection]
+            if sel == "START":
+                if char_select_next_state == GameState.BATTLE:
+                    cpu_enabled_battle = bool(char_select_p2_cpu)
+                elif char_select_next_state == GameState.TRAINING:
+                    cpu_enabled_training = bool(char_select_p2_cpu)
+                game_state = char_select_next_state
+                menu_open = False
+                cmdlist_open = False
+                p1_round_wins = 0
+                p2_round_wins = 0
+                result_winner_side = None
+                result_menu_selection = 0
+                _request_match_reset()
+                _request_bgm_update()
+            elif sel == "BACK":
+                game_state = GameState.TITLE
+                menu_open = False
+                cmdlist_open = False
+                _request_bgm_update()
+            elif sel == "P2":
+                char_select_p2_cpu = not char_select_p2_cpu
+            return True
+        return False
+
+    screen_keydown_handlers: dict[GameState, Callable[[int, str | None], bool]] = {
+        GameState.RESULT: _keydown_result,
+        GameState.TITLE: _keydown_title,
+        GameState.CHAR_SELECT: _keydown_char_select,
+    }
+
+    # 試合中メニュー（ESC）とゲームプレイのキー処理。
+    def _keydown_training_settings(key: int, nav: str | None) -> None:
+        nonlocal training_settings_open, training_settings_selection
+        nonlocal training_hp_percent_p1, training_hp_percent_p2, training_sp_percent_p1, training_sp_percent_p2
+        nonlocal training_auto_recover_hp, training_auto_recover_sp, training_p2_all_guard
+        item_count = len(_TRAINING_SETTINGS_ITEMS)
+        if nav == "up":
+            training_settings_selection = (training_settings_selection - 1) % item_count
+            menu_move_se.play()
+        elif nav == "down":
+            training_settings_selection = (training_settings_selection + 1) % item_count
+            menu_move_se.play()
+        elif nav == "confirm" and not (4 <= training_settings_selection <= 8):
+            training_settings_open = False
+            menu_move_se.play()
+        elif nav in ("left", "right", "confirm"):
+            # 左右は値を増減、決定は「右」と同じ向きで切り替える。
+            idx = training_settings_selection
+            step = -1 if nav == "left" else 1
+            if idx == 0:
+                training_hp_percent_p1 = max(0, min(100, training_hp_percent_p1 + 10 * step))
+                _apply_training_hp(side=1, percent=training_hp_percent_p1)
+            elif idx == 1:
+                training_hp_percent_p2 = max(0, min(100, training_hp_percent_p2 + 10 * step))
+                _apply_training_hp(side=2, percent=training_hp_percent_p2)
+            elif idx == 2:
+                training_sp_percent_p1 = max(0, min(100, training_sp_percent_p1 + 10 * step))
+                _apply_training_sp(side=1, percent=training_sp_percent_p1)
+            elif idx == 3:
+                training_sp_percent_p2 = max(0, min(100, training_sp_percent_p2 + 10 * step))
+                _apply_training_sp(side=2, percent=training_sp_percent_p2)
+            elif idx == 4:
+                training_auto_recover_hp = not training_auto_recover_hp
+            elif idx == 5:
+                training_auto_recover_sp = not training_auto_recover_sp
+            elif idx == 6:
+                _cycle_p2_lock(step)
+            elif idx == 7:
+                _cycle_start_pos(step)
+            elif idx == 8:
+                training_p2_all_guard = not training_p2_all_guard
+            if idx <= 8:
+                (menu_confirm_se if nav == "confirm" else menu_move_se).play()
+        elif key in _CANCEL_KEYS:
+            training_settings_open = False
+            menu_move_se.play()
+
+    def _keydown_debug_menu(key: int, nav: str | None) -> None:
+        nonlocal debugmenu_open, debugmenu_selection
+        # トグル行 + 「戻る」。
+        debug_item_count = len(_DEBUG_MENU_TOGGLES) + 1
+        if nav == "up":
+            debugmenu_selection = (debugmenu_selection - 1) % debug_item_count
+            menu_move_se.play()
+        elif nav == "down":
+            debugmenu_selection = (debugmenu_selection + 1) % debug_item_count
+            menu_move_se.play()
+        elif nav in ("left", "right", "confirm"):
+            idx = debugmenu_selection
+            if idx < len(_DEBUG_MENU_TOGGLES):
+                flag_key = _DEBUG_MENU_TOGGLES[idx][1]
+                debug_flags[flag_key] = not debug_flags[flag_key]
+                settings[flag_key] = debug_flags[flag_key]
+                _mark_settings_dirty()
+                menu_confirm_se.play()
+            else:
+                debugmenu_open = False
+                menu_move_se.play()
+        elif key in _CANCEL_KEYS:
+            debugmenu_open = False
+            menu_move_se.play()
+
+    def _keydown_keyconfig(key: int, nav: str | None) -> None:
+        nonlocal keyconfig_open, keyconfig_selection, keyconfig_waiting_action
+        if nav == "up":
+            keyconfig_selection = (keyconfig_selection - 1) % max(1, len(keyconfig_actions))
+            menu_move_se.play()
+        elif nav == "down":
+            keyconfig_selection = (keyconfig_selection + 1) % max(1, len(keyconfig_actions))
+            menu_move_se.play()
+        elif nav == "right" or nav == "left":
+            if keyconfig_waiting_action is None:
+                dest_map = keyconfig_right_of if nav == "right" else keyconfig_left_of
+                dest = dest_map.get(keyconfig_selection)
+                if dest is not None:
+                    keyconfig_selection = dest
+                    menu_move_se.play()
+        elif nav == "confirm":
+            _label, act = keyconfig_actions[keyconfig_selection]
+            keyconfig_waiting_action = str(act)
+            menu_confirm_se.play()
+        elif key in _CANCEL_KEYS:
+            keyconfig_open = False
+            keyconfig_waiting_action = None
+            if key == pygame.K_o:
+                menu_move_se.play()
+
+    def _keydown_menu(event: pygame.event.Event, nav: str | None) -> None:
+        nonlocal game_state, menu_open, menu_selection, current_res_index
+        nonlocal bgm_volume_level, se_volume_level, bgm_volume_changed, se_volume_changed
+        nonlocal keyconfig_open, keyconfig_selection, keyconfig_waiting_action
+        nonlocal debugmenu_open, debugmenu_selection, training_settings_open, training_settings_selection
+        # CommandListMenuの入力処理
+        if game_state in _IN_PLAY_STATES and command_list_menu is not None:
+            if command_list_menu.handle_input(event, menu_move_se=menu_move_se, menu_confirm_se=menu_confirm_se):
+                return
+
+        if game_state == GameState.TRAINING:
+            _items = _MENU_ITEMS_TRAINING
+        elif game_state == GameState.BATTLE:
+            _items = _MENU_ITEMS_BATTLE
+        else:
+            _items = _MENU_ITEMS_TITLE
+        menu_item_count = len(_items)
+        if nav == "up":
+            menu_selection = (menu_selection - 1) % menu_item_count
+            menu_move_se.play()
+        elif nav == "down":
+            menu_selection = (menu_selection + 1) % menu_item_count
+            menu_move_se.play()
+        elif nav == "left":
+            if menu_selection == 0:
+                current_res_index = (current_res_index - 1) % len(resolutions)
+            elif menu_selection == 1:
+                bgm_volume_level = max(0, bgm_volume_level - 1)
+                settings["bgm_volume_level"] = int(bgm_volume_level)
+                _mark_settings_dirty()
+                bgm_volume_changed = True
+            elif menu_selection == 2:
+                se_volume_level = max(0, se_volume_level - 1)
+                settings["se_volume_level"] = int(se_volume_level)
+                _mark_settings_dirty()
+                se_volume_changed = True
+        elif nav == "right":
+            if menu_selection == 0:
+                current_res_index = (current_res_index + 1) % len(resolutions)
+            elif menu_selection == 1:
+                bgm_volume_level = min(100, bgm_volume_level + 1)
+                settings["bgm_volume_level"] = int(bgm_volume_level)
+                _mark_settings_dirty()
+                bgm_volume_changed = True
+            elif menu_selection == 2:
+                se_volume_level = min(100, se_volume_level + 1)
+                settings["se_volume_level"] = int(se_volume_level)
+                _mark_settings_dirty()
+                se_volume_changed = True
+        elif nav == "confirm":
+            menu_confirm_se.play()
+            selected_key = _items[int(menu_selection)] if _items else ""
+            if selected_key == "res":
+                _apply_resolution(resolutions[current_res_index])
+                _request_match_reset()
+            elif selected_key == "cmdlist":
+                if command_list_menu is not None:
+                    command_list_menu.open()
+            elif selected_key == "keyconfig":
+                keyconfig_open = True
+                keyconfig_selection = 0
+                keyconfig_waiting_action = None
+            elif selected_key == "debug" and game_state == GameState.TRAINING:
+                debugmenu_open = True
+                debugmenu_selection = 0
+            elif selected_key == "training" and game_state == GameState.TRAINING:
+                training_settings_open = True
+                training_settings_selection = 0
+            elif selected_key == "back" and game_state in _IN_PLAY_STATES:
+                game_state = GameState.TITLE
+                menu_open = False
+                _request_match_reset()
+                effects.clear()
+                attack_effects.clear()
+                projectiles.clear()
+                _request_bgm_update()
+            elif selected_key == "close":
+                menu_open = False
+
+    def _keydown_gameplay(key: int) -> None:
+        nonlocal p1_jump_pressed, p2_jump_pressed, p1_attack_id, p2_attack_id
+        action = gameplay_key_actions.get(key)
+        if action is None:
+            return
+        if action == "P1_JUMP":
+            p1_jump_pressed = True
+        elif action == "P2_JUMP":
+            p2_jump_pressed = True
+        elif action == "P2_ATTACK":
+            p2_attack_id = action
+        else:
+            # Guilty Gear Strive button layout (5 buttons)
+            p1_attack_id = action
+
+    # タイトル/キャラ選択では、フレームの残り時間を clock.tick で眠る代わりにイベント待ちで眠る。
+    # キー入力が来たら即座に起きて次のフレームで処理するので、メニュー操作の遅延が縮む。
+    menu_frame_ms = max(1, 1000 // int(constants.FPS))
+    menu_frame_deadline_ms = 0
+    menu_woken_event: pygame.event.Event | None = None
+
+    def _wait_menu_frame() -> None:
+        nonlocal menu_frame_deadline_ms, menu_woken_event
+        remaining = menu_frame_deadline_ms - pygame.time.get_ticks()
+        if remaining > 0:
+            ev = pygame.event.wait(remaining)
+            if ev.type in _HANDLED_EVENT_TYPES:
+                menu_woken_event = ev
+        menu_frame_deadline_ms = pygame.time.get_ticks() + menu_frame_ms
+
+    # 必殺技入力の結果（超必殺の暗転・瞬獄殺の開始予約）を反映する。ループの外で一度だけ定義する。
+    def _apply_special_results(res: SpecialInputResult, *, side: int, player: Player) -> None:
+        nonlocal super_freeze_frames_left, super_freeze_attacker_side
+        # ほとんどのフレームは何も発動していないので、先にまとめて判定して抜ける。
+        if not (res.did_shinku or res.did_shungoku):
+            return
+        if res.did_shinku:
+            if beam_se is not None:
+                beam_se.play()
+            super_freeze_frames_left = _SUPER_FREEZE_FRAMES
+            super_freeze_attacker_side = int(side)
+        if res.did_shungoku:
+            nonlocal shungoku_start_queued_side
+            if shungoku_start_queued_side != 0:
+                return
+            nonlocal shungoku_super_se_cooldown
+            if shungoku_super_se_cooldown <= 0:
+                if sound_manager.shungoku_super_se is not None:
+                    sound_manager.shungoku_super_se.play()
+                shungoku_super_se_cooldown = 12
+            super_freeze_frames_left = max(super_freeze_frames_left, 10)
+            super_freeze_attacker_side = int(side)
+            shungoku_start_queued_side = int(side)
+            nonlocal shungoku_pan_frames_left, shungoku_pan_target_px, shungoku_pan_offsets
+            shungoku_pan_frames_left = shungoku_pan_total_frames
+            try:
+                dx = int(player.rect.centerx) - constants.STAGE_WIDTH // 2
+            except Exception:
+                dx = 0
+            shungoku_pan_target_px = max(-18, min(18, round(dx * 0.35)))
+            shungoku_pan_offsets = tuple(round(-float(shungoku_pan_target_px) * ease) for ease in shungoku_pan_ease)
+
     running = True
+    # ウィンドウが最小化されている間は、描画も更新もせずに CPU を手放す。
+    window_minimized = False
     while running:
+        if window_minimized:
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    running = False
+                elif event.type in (pygame.WINDOWRESTORED, pygame.WINDOWMAXIMIZED, pygame.WINDOWSHOWN):
+                    window_minimized = False
+                    menu_ui_dirty = True
+                    # 隠れていた間にウィンドウの中身が失われているかもしれないので、次は全体を転送する。
+                    menu_presented_layers = None
+            pygame.time.wait(50)
+            continue
+
+        if settings_dirty and (
+            (not menu_open) or pygame.time.get_ticks() - settings_dirty_ms >= SETTINGS_FLUSH_DELAY_MS
+        ):
+            _flush_settings()
+
         # 毎フレーム、エッジ入力をリセット。
         p1_jump_pressed = False
         p2_jump_pressed = False
         p1_attack_id = None
         p2_attack_id = None
 
+        # キーリピートで同一フレームに音量が何段も変わっても、ミキサーへの反映はフレーム末に一度だけ行う。
+        bgm_volume_changed = False
+        se_volume_changed = False
+
         # イベント処理：終了、デバッグ切り替え、ジャンプ/攻撃の押下（瞬間）入力。
-        for event in pygame.event.get():
+        # 扱う種類だけを取り出し、マウス移動などの残りは Python 側に持ち込まずに捨てる。
+        events = pygame.event.get(_HANDLED_EVENT_TYPES)
+        pygame.event.clear()
+        if menu_woken_event is not None:
+            # メニューの待機中に受け取ったイベントを先頭に戻す。
+            events.insert(0, menu_woken_event)
+            menu_woken_event = None
+        for event in events:
             if event.type == pygame.QUIT:
                 running = False
+            elif event.type in (pygame.WINDOWMINIMIZED, pygame.WINDOWHIDDEN):
+                window_minimized = True
+            elif event.type in (pygame.WINDOWRESTORED, pygame.WINDOWMAXIMIZED, pygame.WINDOWSHOWN):
+                # 同じフレーム内で最小化の後に復帰していれば、後に来た方を優先する。
+                window_minimized = False
+                menu_ui_dirty = True
+                menu_presented_layers = None
+            elif event.type == pygame.WINDOWEXPOSED:
+                # ウィンドウの中身が失われているので、パネル部分だけでなく全体を転送し直す。
+                menu_ui_dirty = True
+                menu_presented_layers = None
             elif event.type == pygame.KEYDOWN:
-                if bool(menu_open) and bool(keyconfig_open) and (keyconfig_waiting_action is not None):
+                # メニューの表示が変わりうるのはキー入力だけなので、描き直しが必要な印を付ける。
+                menu_ui_dirty = True
+                if menu_open and keyconfig_open and (keyconfig_waiting_action is not None):
                     if event.key == pygame.K_ESCAPE:
                         keyconfig_waiting_action = None
                         continue
@@ -529,289 +1601,34 @@ def main() -> None:
                     keyconfig_waiting_action = None
                     continue
 
-                if event.key == pygame.K_F3:
-                    if game_state == GameState.TRAINING:
-                        debug_draw = not debug_draw
-                    continue
-
-                # Mキー: フレームポーズのトグル
-                if event.key == pygame.K_m:
-                    if game_state in {GameState.BATTLE, GameState.TRAINING}:
-                        frame_paused = not frame_paused
-                    continue
-
-                # >キー: ポーズ中に1フレーム進める
-                if event.key == pygame.K_PERIOD:  # >キー（Shiftなし）
-                    if game_state in {GameState.BATTLE, GameState.TRAINING} and frame_paused:
-                        frame_advance = True
+                key_handler = global_key_handlers.get(event.key)
+                if key_handler is not None:
+                    key_handler()
                     continue
 
                 if (
                     game_state == GameState.TRAINING
-                    and (not bool(menu_open))
-                    and event.key == int(keybinds.get("FIELD_RESET", keybinds.get("QUICK_RESET", pygame.K_r)))
+                    and (not menu_open)
+                    and event.key == keybinds_int["FIELD_RESET"]
                 ):
-                    reset_match()
+                    _request_match_reset()
                     continue
 
-                if (
-                    game_state in {GameState.BATTLE, GameState.TRAINING}
-                    and (not bool(menu_open))
-                    and event.key == pygame.K_h
-                ):
-                    mx = int(getattr(constants, "POWER_GAUGE_MAX", 1000))
-                    p1.power_gauge = int(mx)
-                    p1.start_shungokusatsu()
+                state_handler = state_key_handlers.get((game_state, event.key))
+                if state_handler is not None and state_handler():
                     continue
 
-                if game_state == GameState.RESULT:
-                    if event.key == pygame.K_ESCAPE:
-                        game_state = GameState.TITLE
-                        menu_open = False
-                        cmdlist_open = False
-                        p1_round_wins = 0
-                        p2_round_wins = 0
-                        result_winner_side = None
-                        result_anim_counter = 0
-                        reset_match()
-                        effects.clear()
-                        projectile_system.projectiles.clear()
-                        _ensure_bgm_for_state(game_state)
-                        continue
-
-                    if event.key in {pygame.K_UP, pygame.K_w}:
-                        result_menu_selection = (result_menu_selection - 1) % len(result_menu_items)
-                        if menu_move_se is not None:
-                            menu_move_se.play()
-                        continue
-                    if event.key in {pygame.K_DOWN, pygame.K_s}:
-                        result_menu_selection = (result_menu_selection + 1) % len(result_menu_items)
-                        if menu_move_se is not None:
-                            menu_move_se.play()
-                        continue
+                nav = _MENU_NAV_KEYMAP.get(event.key)
 
-                    if event.key == pygame.K_RETURN or event.key == pygame.K_u:
-                        if menu_confirm_se is not None:
-                            menu_confirm_se.play()
-
-                        selected = result_menu_items[result_menu_selection]
-                        if selected == "rematch":
-                            game_state = GameState.BATTLE
-                            debug_draw = False
-                            menu_open = False
-                            cmdlist_open = False
-                            p1_round_wins = 0
-                            p2_round_wins = 0
-                            result_winner_side = None
-                            result_anim_counter = 0
-                            reset_match()
-                            effects.clear()
-                            projectiles.clear()
-                            _ensure_bgm_for_state(game_state)
-                        elif selected == "back_to_title":
-                            game_state = GameState.TITLE
-                            menu_open = False
-                            cmdlist_open = False
-                            p1_round_wins = 0
-                            p2_round_wins = 0
-                            result_winner_side = None
-                            result_anim_counter = 0
-                            reset_match()
-                            effects.clear()
-                            projectiles.clear()
-                            _ensure_bgm_for_state(game_state)
-                        elif selected == "exit":
-                            running = False
-                        continue
+                if event.key in p1_key_set:
+                    p1_key_history.appendleft(p1_name_map.get(int(event.key), str(event.key)))
 
-                if event.key == pygame.K_n and game_state in {GameState.BATTLE, GameState.TRAINING}:
-                    super_cost = int(getattr(constants, "POWER_GAUGE_SUPER_COST", 500))
-                    p1.power_gauge = int(getattr(constants, "POWER_GAUGE_MAX", 1000))
-                    if p1.spend_power(super_cost):
-                        p1.start_shinku_hadoken()
-                        if beam_se is not None:
-                            beam_se.play()
-                        super_freeze_frames_left = int(getattr(constants, "SUPER_FREEZE_FRAMES", 30))
-                        super_freeze_attacker_side = 1
+                screen_handler = screen_keydown_handlers.get(game_state)
+                if screen_handler is not None and screen_handler(event.key, nav):
                     continue
 
-                if event.key in {
-                    int(keybinds.get("P1_LEFT", pygame.K_a)),
-                    int(keybinds.get("P1_DOWN", pygame.K_s)),
-                    int(keybinds.get("P1_RIGHT", pygame.K_d)),
-                    int(keybinds.get("P1_JUMP", pygame.K_w)),
-                    int(keybinds.get("P1_LP", pygame.K_u)),
-                    int(keybinds.get("P1_MP", pygame.K_i)),
-                    int(keybinds.get("P1_HP", pygame.K_o)),
-                    int(keybinds.get("P1_LK", pygame.K_j)),
-                    int(keybinds.get("P1_MK", pygame.K_k)),
-                    int(keybinds.get("P1_HK", pygame.K_l)),
-                }:
-                    name_map = {
-                        int(keybinds.get("P1_LEFT", pygame.K_a)): "←",
-                        int(keybinds.get("P1_DOWN", pygame.K_s)): "↓",
-                        int(keybinds.get("P1_RIGHT", pygame.K_d)): "→",
-                        int(keybinds.get("P1_JUMP", pygame.K_w)): "↑",
-                        int(keybinds.get("P1_LP", pygame.K_u)): "U",
-                        int(keybinds.get("P1_MP", pygame.K_i)): "I",
-                        int(keybinds.get("P1_HP", pygame.K_o)): "O",
-                        int(keybinds.get("P1_LK", pygame.K_j)): "J",
-                        int(keybinds.get("P1_MK", pygame.K_k)): "K",
-                        int(keybinds.get("P1_HK", pygame.K_l)): "L",
-                    }
-                    p1_key_history.insert(0, name_map.get(int(event.key), str(event.key)))
-                    p1_key_history = p1_key_history[:16]
-
-                if game_state == GameState.TITLE and menu_open:
-                    if event.key == pygame.K_ESCAPE:
-                        menu_open = False
-                        keyconfig_open = False
-                        keyconfig_waiting_action = None
-                    elif event.key in {pygame.K_UP, pygame.K_w}:
-                        menu_selection = (menu_selection - 1) % 5
-                        if menu_move_se is not None:
-                            menu_move_se.play()
-                    elif event.key in {pygame.K_DOWN, pygame.K_s}:
-                        menu_selection = (menu_selection + 1) % 5
-                        if menu_move_se is not None:
-                            menu_move_se.play()
-                    elif event.key in {pygame.K_LEFT, pygame.K_a}:
-                        if menu_selection == 0:
-                            current_res_index = (current_res_index - 1) % len(resolutions)
-                        elif menu_selection == 1:
-                            bgm_volume_level = max(0, bgm_volume_level - 1)
-                            settings["bgm_volume_level"] = int(bgm_volume_level)
-                            _save_settings(settings)
-                            _apply_bgm_volume()
-                        elif menu_selection == 2:
-                            se_volume_level = max(0, se_volume_level - 1)
-                            settings["se_volume_level"] = int(se_volume_level)
-                            _save_settings(settings)
-                            _apply_se_volume()
-                    elif event.key in {pygame.K_RIGHT, pygame.K_d}:
-                        if menu_selection == 0:
-                            current_res_index = (current_res_index + 1) % len(resolutions)
-                        elif menu_selection == 1:
-                            bgm_volume_level = min(100, bgm_volume_level + 1)
-                            settings["bgm_volume_level"] = int(bgm_volume_level)
-                            _save_settings(settings)
-                            _apply_bgm_volume()
-                        elif menu_selection == 2:
-                            se_volume_level = min(100, se_volume_level + 1)
-                            settings["se_volume_level"] = int(se_volume_level)
-                            _save_settings(settings)
-                            _apply_se_volume()
-                    elif event.key == pygame.K_RETURN or event.key == pygame.K_u:
-                        if menu_confirm_se is not None:
-                            menu_confirm_se.play()
-                        if menu_selection == 0:
-                            _apply_resolution(resolutions[current_res_index])
-                            reset_match()
-                        elif menu_selection == 3:
-                            keyconfig_open = True
-                            keyconfig_selection = 0
-                            keyconfig_waiting_action = None
-                        elif menu_selection == 4:
-                            menu_open = False
-                    continue
-
-                if game_state == GameState.TITLE:
-                    if event.key in {pygame.K_UP, pygame.K_w}:
-                        title_menu_selection = (title_menu_selection - 1) % len(title_menu_items)
-                        if menu_move_se is not None:
-                            menu_move_se.play()
-                    elif event.key in {pygame.K_DOWN, pygame.K_s}:
-                        title_menu_selection = (title_menu_selection + 1) % len(title_menu_items)
-                        if menu_move_se is not None:
-                            menu_move_se.play()
-                    elif event.key == pygame.K_RETURN or event.key == pygame.K_u or event.key in title_start_keys:
-                        if menu_confirm_se is not None:
-                            menu_confirm_se.play()
-                        selected = title_menu_items[title_menu_selection]
-                        if selected == "BATTLE":
-                            if start_se is not None:
-                                start_se.play()
-                            game_state = GameState.CHAR_SELECT
-                            debug_draw = False
-                            menu_open = False
-                            cmdlist_open = False
-                            char_select_selection = 0
-                            char_select_p2_cpu = True
-                            char_select_next_state = GameState.BATTLE
-                            _ensure_bgm_for_state(game_state)
-                        elif selected == "TRAINING":
-                            if start_se is not None:
-                                start_se.play()
-                            game_state = GameState.CHAR_SELECT
-                            debug_draw = True
-                            menu_open = False
-                            cmdlist_open = False
-                            char_select_selection = 0
-                            char_select_p2_cpu = False
-                            char_select_next_state = GameState.TRAINING
-                            _ensure_bgm_for_state(game_state)
-                        elif selected == "SETTING":
-                            menu_open = True
-                        elif selected == "EXIT":
-                            running = False
-                    continue
-
-                if game_state == GameState.CHAR_SELECT:
-                    if event.key == pygame.K_ESCAPE:
-                        game_state = GameState.TITLE
-                        menu_open = False
-                        cmdlist_open = False
-                        _ensure_bgm_for_state(game_state)
-                        continue
-
-                    if event.key in {pygame.K_UP, pygame.K_w}:
-                        char_select_selection = (char_select_selection - 1) % len(char_select_items)
-                        if menu_move_se is not None:
-                            menu_move_se.play()
-                        continue
-                    if event.key in {pygame.K_DOWN, pygame.K_s}:
-                        char_select_selection = (char_select_selection + 1) % len(char_select_items)
-                        if menu_move_se is not None:
-                            menu_move_se.play()
-                        continue
-
-                    if event.key in {pygame.K_LEFT, pygame.K_RIGHT, pygame.K_a, pygame.K_d}:
-                        if char_select_items[char_select_selection] == "P2":
-                            char_select_p2_cpu = not bool(char_select_p2_cpu)
-                            if menu_move_se is not None:
-                                menu_move_se.play()
-                        continue
-
-                    if event.key == pygame.K_RETURN or event.key == pygame.K_u:
-                        if menu_confirm_se is not None:
-                            menu_confirm_se.play()
-
-                        sel = char_select_items[char_select_selection]
-                        if sel == "START":
-                            if char_select_next_state == GameState.BATTLE:
-                                cpu_enabled_battle = bool(char_select_p2_cpu)
-                            elif char_select_next_state == GameState.TRAINING:
-                                cpu_enabled_training = bool(char_select_p2_cpu)
-                            game_state = char_select_next_state
-                            menu_open = False
-                            cmdlist_open = False
-                            p1_round_wins = 0
-                            p2_round_wins = 0
-                            result_winner_side = None
-                            result_menu_selection = 0
-                            reset_match()
-                            _ensure_bgm_for_state(game_state)
-                        elif sel == "BACK":
-                            game_state = GameState.TITLE
-                            menu_open = False
-                            cmdlist_open = False
-                            _ensure_bgm_for_state(game_state)
-                        elif sel == "P2":
-                            char_select_p2_cpu = not bool(char_select_p2_cpu)
-                        continue
-
                 if event.key == pygame.K_r:
-                    reset_match()
+                    _request_match_reset()
                 elif event.key == pygame.K_ESCAPE:
                     menu_open = not menu_open
                     if not menu_open:
@@ -825,400 +1642,50 @@ def main() -> None:
                     if keyconfig_open:
                         keyconfig_open = False
                         keyconfig_waiting_action = None
-                        if menu_move_se is not None:
-                            menu_move_se.play()
+                        menu_move_se.play()
                     elif cmdlist_open:
                         _start_cmdlist_close()
-                        if menu_move_se is not None:
-                            menu_move_se.play()
+                        menu_move_se.play()
                     elif debugmenu_open:
                         debugmenu_open = False
-                        if menu_move_se is not None:
-                            menu_move_se.play()
+                        menu_move_se.play()
                     elif training_settings_open:
                         training_settings_open = False
-                        if menu_move_se is not None:
-                            menu_move_se.play()
+                        menu_move_se.play()
                     else:
                         menu_open = False
-                        if menu_move_se is not None:
-                            menu_move_se.play()
+                        menu_move_se.play()
                 elif menu_open:
                     if training_settings_open and game_state == GameState.TRAINING:
-                        items = [
-                            "P1 HP残量",
-                            "P2 HP残量",
-                            "P1 SPゲージ",
-                            "P2 SPゲージ",
-                            "HP自動回復",
-                            "SP自動回復",
-                            "P2状態固定",
-                            "開始位置",
-                            "P2全ガード",
-                            "戻る",
-                        ]
-                        item_count = len(items)
-
-                        def _apply_training_hp(*, side: int, percent: int) -> None:
-                            nonlocal p1_chip_hp, p2_chip_hp
-                            if side == 1:
-                                p1.hp = int(round(p1.max_hp * (float(percent) / 100.0)))
-                                p1_chip_hp = float(p1.hp)
-                            else:
-                                p2.hp = int(round(p2.max_hp * (float(percent) / 100.0)))
-                                p2_chip_hp = float(p2.hp)
-
-                        def _apply_training_sp(*, side: int, percent: int) -> None:
-                            max_sp = int(getattr(constants, "POWER_GAUGE_MAX", 1000))
-                            sp = int(round(max_sp * (float(percent) / 100.0)))
-                            if side == 1:
-                                p1.power_gauge = sp
-                            else:
-                                p2.power_gauge = sp
-
-                        def _cycle_p2_lock(delta: int) -> None:
-                            nonlocal training_p2_state_lock
-                            training_p2_state_lock = (int(training_p2_state_lock) + int(delta)) % 4
-
-                        def _cycle_start_pos(delta: int) -> None:
-                            nonlocal training_start_position
-                            training_start_position = (int(training_start_position) + int(delta)) % 3
-
-                        if event.key in {pygame.K_UP, pygame.K_w}:
-                            training_settings_selection = (training_settings_selection - 1) % item_count
-                            if menu_move_se is not None:
-                                menu_move_se.play()
-                        elif event.key in {pygame.K_DOWN, pygame.K_s}:
-                            training_settings_selection = (training_settings_selection + 1) % item_count
-                            if menu_move_se is not None:
-                                menu_move_se.play()
-                        elif event.key in {pygame.K_LEFT, pygame.K_a}:
-                            idx = int(training_settings_selection)
-                            if idx == 0:
-                                training_hp_percent_p1 = max(0, int(training_hp_percent_p1) - 10)
-                                _apply_training_hp(side=1, percent=int(training_hp_percent_p1))
-                                if menu_move_se is not None:
-                                    menu_move_se.play()
-                            elif idx == 1:
-                                training_hp_percent_p2 = max(0, int(training_hp_percent_p2) - 10)
-                                _apply_training_hp(side=2, percent=int(training_hp_percent_p2))
-                                if menu_move_se is not None:
-                                    menu_move_se.play()
-                            elif idx == 2:
-                                training_sp_percent_p1 = max(0, int(training_sp_percent_p1) - 10)
-                                _apply_training_sp(side=1, percent=int(training_sp_percent_p1))
-                                if menu_move_se is not None:
-                                    menu_move_se.play()
-                            elif idx == 3:
-                                training_sp_percent_p2 = max(0, int(training_sp_percent_p2) - 10)
-                                _apply_training_sp(side=2, percent=int(training_sp_percent_p2))
-                                if menu_move_se is not None:
-                                    menu_move_se.play()
-                            elif idx == 4:
-                                training_auto_recover_hp = not bool(training_auto_recover_hp)
-                                if menu_move_se is not None:
-                                    menu_move_se.play()
-                            elif idx == 5:
-                                training_auto_recover_sp = not bool(training_auto_recover_sp)
-                                if menu_move_se is not None:
-                                    menu_move_se.play()
-                            elif idx == 6:
-                                _cycle_p2_lock(-1)
-                                if menu_move_se is not None:
-                                    menu_move_se.play()
-                            elif idx == 7:
-                                _cycle_start_pos(-1)
-                                if menu_move_se is not None:
-                                    menu_move_se.play()
-                            elif idx == 8:
-                                training_p2_all_guard = not bool(training_p2_all_guard)
-                                if menu_move_se is not None:
-                                    menu_move_se.play()
-                        elif event.key in {pygame.K_RIGHT, pygame.K_d}:
-                            idx = int(training_settings_selection)
-                            if idx == 0:
-                                training_hp_percent_p1 = min(100, int(training_hp_percent_p1) + 10)
-                                _apply_training_hp(side=1, percent=int(training_hp_percent_p1))
-                                if menu_move_se is not None:
-                                    menu_move_se.play()
-                            elif idx == 1:
-                                training_hp_percent_p2 = min(100, int(training_hp_percent_p2) + 10)
-                                _apply_training_hp(side=2, percent=int(training_hp_percent_p2))
-                                if menu_move_se is not None:
-                                    menu_move_se.play()
-                            elif idx == 2:
-                                training_sp_percent_p1 = min(100, int(training_sp_percent_p1) + 10)
-                                _apply_training_sp(side=1, percent=int(training_sp_percent_p1))
-                                if menu_move_se is not None:
-                                    menu_move_se.play()
-                            elif idx == 3:
-                                training_sp_percent_p2 = min(100, int(training_sp_percent_p2) + 10)
-                                _apply_training_sp(side=2, percent=int(training_sp_percent_p2))
-                                if menu_move_se is not None:
-                                    menu_move_se.play()
-                            elif idx == 4:
-                                training_auto_recover_hp = not bool(training_auto_recover_hp)
-                                if menu_move_se is not None:
-                                    menu_move_se.play()
-                            elif idx == 5:
-                                training_auto_recover_sp = not bool(training_auto_recover_sp)
-                                if menu_move_se is not None:
-                                    menu_move_se.play()
-                            elif idx == 6:
-                                _cycle_p2_lock(+1)
-                                if menu_move_se is not None:
-                                    menu_move_se.play()
-                            elif idx == 7:
-                                _cycle_start_pos(+1)
-                                if menu_move_se is not None:
-                                    menu_move_se.play()
-                            elif idx == 8:
-                                training_p2_all_guard = not bool(training_p2_all_guard)
-                                if menu_move_se is not None:
-                                    menu_move_se.play()
-                        elif event.key == pygame.K_RETURN or event.key == pygame.K_u:
-                            idx = int(training_settings_selection)
-                            if idx == 4:
-                                training_auto_recover_hp = not bool(training_auto_recover_hp)
-                                if menu_confirm_se is not None:
-                                    menu_confirm_se.play()
-                            elif idx == 5:
-                                training_auto_recover_sp = not bool(training_auto_recover_sp)
-                                if menu_confirm_se is not None:
-                                    menu_confirm_se.play()
-                            elif idx == 6:
-                                training_p2_state_lock = (int(training_p2_state_lock) + 1) % 4
-                                if menu_confirm_se is not None:
-                                    menu_confirm_se.play()
-                            elif idx == 7:
-                                training_start_position = (int(training_start_position) + 1) % 3
-                                if menu_confirm_se is not None:
-                                    menu_confirm_se.play()
-                            elif idx == 8:
-                                training_p2_all_guard = not bool(training_p2_all_guard)
-                                if menu_confirm_se is not None:
-                                    menu_confirm_se.play()
-                            else:
-                                training_settings_open = False
-                                if menu_move_se is not None:
-                                    menu_move_se.play()
-                        elif event.key in {pygame.K_ESCAPE, pygame.K_o}:
-                            training_settings_open = False
-                            if menu_move_se is not None:
-                                menu_move_se.play()
-                        continue
-
-                    if debugmenu_open and game_state == GameState.TRAINING:
-                        debug_items = [
-                            "キー履歴: ",
-                            "P1フレーム情報: ",
-                            "P2フレーム情報: ",
-                            "判定表示: ",
-                            "フレームメーター: ",
-                            "グリッド表示: ",
-                            "戻る",
-                        ]
-                        debug_item_count = len(debug_items)
-                        if event.key in {pygame.K_UP, pygame.K_w}:
-                            debugmenu_selection = (debugmenu_selection - 1) % debug_item_count
-                            if menu_move_se is not None:
-                                menu_move_se.play()
-                        elif event.key in {pygame.K_DOWN, pygame.K_s}:
-                            debugmenu_selection = (debugmenu_selection + 1) % debug_item_count
-                            if menu_move_se is not None:
-                                menu_move_se.play()
-                        elif event.key in {pygame.K_LEFT, pygame.K_a, pygame.K_RIGHT, pygame.K_d, pygame.K_RETURN, pygame.K_u}:
-                            idx = int(debugmenu_selection)
-                            if idx == 0:
-                                debug_ui_show_key_history = not bool(debug_ui_show_key_history)
-                                settings["debug_ui_show_key_history"] = bool(debug_ui_show_key_history)
-                                _save_settings(settings)
-                                if menu_confirm_se is not None:
-                                    menu_confirm_se.play()
-                            elif idx == 1:
-                                debug_ui_show_p1_frames = not bool(debug_ui_show_p1_frames)
-                                settings["debug_ui_show_p1_frames"] = bool(debug_ui_show_p1_frames)
-                                _save_settings(settings)
-                                if menu_confirm_se is not None:
-                                    menu_confirm_se.play()
-                            elif idx == 2:
-                                debug_ui_show_p2_frames = not bool(debug_ui_show_p2_frames)
-                                settings["debug_ui_show_p2_frames"] = bool(debug_ui_show_p2_frames)
-                                _save_settings(settings)
-                                if menu_confirm_se is not None:
-                                    menu_confirm_se.play()
-                            elif idx == 3:
-                                debug_draw = not bool(debug_draw)
-                                settings["debug_draw"] = bool(debug_draw)
-                                _save_settings(settings)
-                                if menu_confirm_se is not None:
-                                    menu_confirm_se.play()
-                            elif idx == 4:
-                                frame_meter_enabled = not bool(frame_meter_enabled)
-                                settings["frame_meter_enabled"] = bool(frame_meter_enabled)
-                                _save_settings(settings)
-                                if menu_confirm_se is not None:
-                                    menu_confirm_se.play()
-                            elif idx == 5:
-                                debug_show_grid = not bool(debug_show_grid)
-                                settings["debug_show_grid"] = bool(debug_show_grid)
-                                _save_settings(settings)
-                                if menu_confirm_se is not None:
-                                    menu_confirm_se.play()
-                            else:
-                                debugmenu_open = False
-                                if menu_move_se is not None:
-                                    menu_move_se.play()
-                        elif event.key in {pygame.K_ESCAPE, pygame.K_o}:
-                            debugmenu_open = False
-                            if menu_move_se is not None:
-                                menu_move_se.play()
-                        continue
-
-                    if keyconfig_open:
-                        if event.key in {pygame.K_UP, pygame.K_w}:
-                            keyconfig_selection = (keyconfig_selection - 1) % max(1, len(keyconfig_actions))
-                            if menu_move_se is not None:
-                                menu_move_se.play()
-                        elif event.key in {pygame.K_DOWN, pygame.K_s}:
-                            keyconfig_selection = (keyconfig_selection + 1) % max(1, len(keyconfig_actions))
-                            if menu_move_se is not None:
-                                menu_move_se.play()
-                        elif event.key in {pygame.K_RIGHT, pygame.K_d}:
-                            if keyconfig_waiting_action is None and keyconfig_actions:
-                                cur_act = str(keyconfig_actions[int(keyconfig_selection)][1])
-                                p1_idx = [i for i, (_l, a) in enumerate(keyconfig_actions) if str(a).startswith("P1_")]
-                                p2_idx = [i for i, (_l, a) in enumerate(keyconfig_actions) if str(a).startswith("P2_")]
-                                if cur_act.startswith("P1_") and p1_idx and p2_idx:
-                                    pos = p1_idx.index(int(keyconfig_selection)) if int(keyconfig_selection) in p1_idx else 0
-                                    keyconfig_selection = int(p2_idx[min(pos, len(p2_idx) - 1)])
-                                    if menu_move_se is not None:
-                                        menu_move_se.play()
-                        elif event.key in {pygame.K_LEFT, pygame.K_a}:
-                            if keyconfig_waiting_action is None and keyconfig_actions:
-                                cur_act = str(keyconfig_actions[int(keyconfig_selection)][1])
-                                p1_idx = [i for i, (_l, a) in enumerate(keyconfig_actions) if str(a).startswith("P1_")]
-                                p2_idx = [i for i, (_l, a) in enumerate(keyconfig_actions) if str(a).startswith("P2_")]
-                                if cur_act.startswith("P2_") and p1_idx and p2_idx:
-                                    pos = p2_idx.index(int(keyconfig_selection)) if int(keyconfig_selection) in p2_idx else 0
-                                    keyconfig_selection = int(p1_idx[min(pos, len(p1_idx) - 1)])
-                                    if menu_move_se is not None:
-                                        menu_move_se.play()
-                        elif event.key == pygame.K_RETURN or event.key == pygame.K_u:
-                            _label, act = keyconfig_actions[keyconfig_selection]
-                            keyconfig_waiting_action = str(act)
-                            if menu_confirm_se is not None:
-                                menu_confirm_se.play()
-                        elif event.key in {pygame.K_ESCAPE, pygame.K_o}:
-                            keyconfig_open = False
-                            keyconfig_waiting_action = None
-                            if event.key == pygame.K_o and menu_move_se is not None:
-                                menu_move_se.play()
-                        continue
-
-                    # CommandListMenuの入力処理
-                    if game_state in {GameState.BATTLE, GameState.TRAINING} and command_list_menu is not None:
-                        if command_list_menu.handle_input(event, menu_move_se=menu_move_se, menu_confirm_se=menu_confirm_se):
-                            continue
-
-                    if game_state in {GameState.BATTLE, GameState.TRAINING}:
-                        _items = ["res", "bgm", "se", "cmdlist", "keyconfig", "debug", "back", "close"]
-                        if game_state == GameState.TRAINING:
-                            _items = ["res", "bgm", "se", "cmdlist", "keyconfig", "debug", "training", "back", "close"]
+                        _keydown_training_settings(event.key, nav)
+                    elif debugmenu_open and game_state == GameState.TRAINING:
+                        _keydown_debug_menu(event.key, nav)
+                    elif keyconfig_open:
+                        _keydown_keyconfig(event.key, nav)
                     else:
-                        _items = [
-                            "res",
-                            "bgm",
-                            "se",
-                            "keyconfig",
-                            "close",
-                        ]
-                    menu_item_count = len(_items)
-                    if event.key in {pygame.K_UP, pygame.K_w}:
-                        menu_selection = (menu_selection - 1) % menu_item_count
-                        if menu_move_se is not None:
-                            menu_move_se.play()
-                    elif event.key in {pygame.K_DOWN, pygame.K_s}:
-                        menu_selection = (menu_selection + 1) % menu_item_count
-                        if menu_move_se is not None:
-                            menu_move_se.play()
-                    elif event.key in {pygame.K_LEFT, pygame.K_a}:
-                        if menu_selection == 0:
-                            current_res_index = (current_res_index - 1) % len(resolutions)
-                        elif menu_selection == 1:
-                            bgm_volume_level = max(0, bgm_volume_level - 1)
-                            settings["bgm_volume_level"] = int(bgm_volume_level)
-                            _save_settings(settings)
-                            _apply_bgm_volume()
-                        elif menu_selection == 2:
-                            se_volume_level = max(0, se_volume_level - 1)
-                            settings["se_volume_level"] = int(se_volume_level)
-                            _save_settings(settings)
-                            _apply_se_volume()
-                    elif event.key in {pygame.K_RIGHT, pygame.K_d}:
-                        if menu_selection == 0:
-                            current_res_index = (current_res_index + 1) % len(resolutions)
-                        elif menu_selection == 1:
-                            bgm_volume_level = min(100, bgm_volume_level + 1)
-                            settings["bgm_volume_level"] = int(bgm_volume_level)
-                            _save_settings(settings)
-                            _apply_bgm_volume()
-                        elif menu_selection == 2:
-                            se_volume_level = min(100, se_volume_level + 1)
-                            settings["se_volume_level"] = int(se_volume_level)
-                            _save_settings(settings)
-                            _apply_se_volume()
-                    elif event.key == pygame.K_RETURN or event.key == pygame.K_u:
-                        if menu_confirm_se is not None:
-                            menu_confirm_se.play()
-                        selected_key = _items[int(menu_selection)] if _items else ""
-                        if selected_key == "res":
-                            _apply_resolution(resolutions[current_res_index])
-                            reset_match()
-                        elif selected_key == "cmdlist":
-                            if command_list_menu is not None:
-                                command_list_menu.open()
-                        elif selected_key == "keyconfig":
-                            keyconfig_open = True
-                            keyconfig_selection = 0
-                            keyconfig_waiting_action = None
-                        elif selected_key == "debug" and game_state == GameState.TRAINING:
-                            debugmenu_open = True
-                            debugmenu_selection = 0
-                        elif selected_key == "training" and game_state == GameState.TRAINING:
-                            training_settings_open = True
-                            training_settings_selection = 0
-                        elif selected_key == "back" and game_state in {GameState.BATTLE, GameState.TRAINING}:
-                            game_state = GameState.TITLE
-                            menu_open = False
-                            reset_match()
-                            effects.clear()
-                            projectiles.clear()
-                            _ensure_bgm_for_state(game_state)
-                        elif selected_key == "close":
-                            menu_open = False
-                elif event.key == int(keybinds.get("P1_JUMP", pygame.K_w)):
-                    p1_jump_pressed = True
-                elif event.key == int(keybinds.get("P2_JUMP", pygame.K_UP)):
-                    p2_jump_pressed = True
-                elif event.key == int(keybinds.get("P2_ATTACK", pygame.K_SEMICOLON)):
-                    p2_attack_id = "P2_ATTACK"
-                # Guilty Gear Strive button layout (5 buttons)
-                elif event.key == int(keybinds.get("P1_P", pygame.K_u)):
-                    p1_attack_id = "P1_P"
-                elif event.key == int(keybinds.get("P1_K", pygame.K_j)):
-                    p1_attack_id = "P1_K"
-                elif event.key == int(keybinds.get("P1_S", pygame.K_i)):
-                    p1_attack_id = "P1_S"
-                elif event.key == int(keybinds.get("P1_HS", pygame.K_k)):
-                    p1_attack_id = "P1_HS"
-                elif event.key == int(keybinds.get("P1_D", pygame.K_o)):
-                    p1_attack_id = "P1_D"
+                        _keydown_menu(event, nav)
+                else:
+                    _keydown_gameplay(event.key)
+
+        if match_reset_requested:
+            match_reset_requested = False
+            reset_match()
+            # 解像度適用などメニューからのリセットでは立ち位置が変わるので、メニュー背景も作り直す。
+            menu_backdrop_ready = False
+        elif not menu_open:
+            menu_backdrop_ready = False
+        if bgm_update_requested:
+            bgm_update_requested = False
+            _ensure_bgm_for_state(game_state)
+        if bgm_volume_changed:
+            _apply_bgm_volume()
+        if se_volume_changed:
+            _apply_se_volume()
 
         tick_ms = pygame.time.get_ticks()
 
-        if int(shungoku_start_queued_side) in {1, 2} and int(super_freeze_frames_left) <= 0:
-            starter = p1 if int(shungoku_start_queued_side) == 1 else p2
+        if shungoku_start_queued_side in {1, 2} and super_freeze_frames_left <= 0:
+            starter = p1 if shungoku_start_queued_side == 1 else p2
             if bool(getattr(starter, "_shungoku_pending_start", False)):
                 try:
                     starter.start_shungokusatsu()
@@ -1234,35 +1701,24 @@ def main() -> None:
 
             stage_renderer.draw_background(
                 stage_surface,
-                tick_ms=int(tick_ms),
+                tick_ms=tick_ms,
                 stage_bg_frames=stage_bg_frames,
                 stage_bg_img=stage_bg_img,
             )
 
             stage_renderer.draw_rain(stage_surface)
 
-            pygame.draw.line(
-                stage_surface,
-                (80, 80, 80),
-                (0, constants.GROUND_Y),
-                (constants.STAGE_WIDTH, constants.GROUND_Y),
-                2,
-            )
+            stage_surface.blit(ground_line, (0, constants.GROUND_Y))
 
-            flash = pygame.Surface((constants.STAGE_WIDTH, constants.STAGE_HEIGHT), pygame.SRCALPHA)
-            phase = int(super_freeze_frames_left)
-            if (phase // 2) % 2 == 0:
-                flash.fill((255, 255, 255, 170))
-            else:
-                flash.fill((0, 0, 0, 160))
+            phase = super_freeze_frames_left
+            flash = flash_white if (phase // 2) % 2 == 0 else flash_black
             stage_surface.blit(flash, (0, 0))
 
-            p1.draw(stage_surface, debug_draw=debug_draw)
-            p2.draw(stage_surface, debug_draw=debug_draw)
+            p1.draw(stage_surface, debug_draw=debug_flags["debug_draw"])
+            p2.draw(stage_surface, debug_draw=debug_flags["debug_draw"])
 
-            scaled = pygame.transform.smoothscale(stage_surface, (constants.SCREEN_WIDTH, constants.SCREEN_HEIGHT))
             shake = 2 if (phase % 2 == 0) else -2
-            screen.blit(scaled, (shake, 0))
+            _blit_stage_scaled(screen, shake)
             pygame.display.flip()
             clock.tick(constants.FPS)
             continue
@@ -1281,42 +1737,40 @@ def main() -> None:
                         bbox = img.get_bounding_rect(min_alpha=1)
                         if bbox.width > 0 and bbox.height > 0:
                             img = img.subsurface(bbox).copy()
+                        # 表示サイズへの拡大は読込時に一度だけ行う。
+                        if img.get_size() != (constants.STAGE_WIDTH, constants.STAGE_HEIGHT):
+                            img = pygame.transform.smoothscale(img, (constants.STAGE_WIDTH, constants.STAGE_HEIGHT))
                         result_bg_frames.append(img)
                     except pygame.error:
                         pass
 
             if result_bg_frames:
-                result_anim_counter = int(result_anim_counter) + 1
-                idx = min((int(result_anim_counter) // 10), len(result_bg_frames) - 1)
-                img = result_bg_frames[idx]
-                if img.get_size() != (constants.STAGE_WIDTH, constants.STAGE_HEIGHT):
-                    img = pygame.transform.smoothscale(img, (constants.STAGE_WIDTH, constants.STAGE_HEIGHT))
-                stage_surface.blit(img, (0, 0))
+                result_anim_counter = result_anim_counter + 1
+                idx = min((result_anim_counter // 10), len(result_bg_frames) - 1)
+                stage_surface.blit(result_bg_frames[idx], (0, 0))
             else:
                 stage_surface.fill((0, 0, 0))
 
-            overlay = pygame.Surface((constants.STAGE_WIDTH, constants.STAGE_HEIGHT), pygame.SRCALPHA)
-            overlay.fill((0, 0, 0, 120))
-            stage_surface.blit(overlay, (0, 0))
+            stage_surface.blit(_dim_stage(120), (0, 0))
 
-            title = title_font.render("RESULT", True, (245, 245, 245))
+            title = render_cached(title_font, "RESULT", (245, 245, 245))
             stage_surface.blit(title, title.get_rect(midtop=(constants.STAGE_WIDTH // 2, 60)))
 
-            winner_text = "DRAW" if result_winner_side is None else ("P1 WIN" if int(result_winner_side) == 1 else "P2 WIN")
-            w_surf = font.render(winner_text, True, (255, 240, 120))
+            winner_text = "DRAW" if result_winner_side is None else ("P1 WIN" if result_winner_side == 1 else "P2 WIN")
+            w_surf = render_cached(font, winner_text, (255, 240, 120))
             stage_surface.blit(w_surf, w_surf.get_rect(midtop=(constants.STAGE_WIDTH // 2, 120)))
 
             y = 220
+            sel = result_menu_selection
+            cx = constants.STAGE_WIDTH // 2
             for i, item in enumerate(result_menu_items):
-                selected = i == int(result_menu_selection)
+                selected = i == sel
                 color = (255, 240, 120) if selected else (240, 240, 240)
-                label = item
-                surf = font.render(label, True, color)
-                stage_surface.blit(surf, surf.get_rect(midtop=(constants.STAGE_WIDTH // 2, y)))
+                surf = render_cached(font, item, color)
+                stage_surface.blit(surf, surf.get_rect(midtop=(cx, y)))
                 y += 40
 
-            scaled = pygame.transform.smoothscale(stage_surface, (constants.SCREEN_WIDTH, constants.SCREEN_HEIGHT))
-            screen.blit(scaled, (0, 0))
+            _blit_stage_scaled(screen)
             pygame.display.flip()
             clock.tick(constants.FPS)
             continue
@@ -1325,111 +1779,111 @@ def main() -> None:
             stage_surface.fill((0, 0, 0))
 
             tick = pygame.time.get_ticks()
-            if title_bg_img is not None:
-                bg = pygame.transform.smoothscale(title_bg_img, (constants.STAGE_WIDTH, constants.STAGE_HEIGHT))
-                bg.set_alpha(60)
-                stage_surface.blit(bg, (0, 0))
+            if title_bg_dim is not None:
+                stage_surface.blit(title_bg_dim, (0, 0))
 
             if char_select_thumb is None:
                 p = resource_path("assets/images/RYUKO2nd/キャラサムネ.png")
                 if p.exists():
                     try:
-                        char_select_thumb = pygame.image.load(str(p)).convert_alpha()
+                        thumb = pygame.image.load(str(p)).convert_alpha()
+                        # 表示幅（ステージ幅の 45%）への縮小は読込時に一度だけ行う。
+                        max_w = int(constants.STAGE_WIDTH * 0.45)
+                        scale = max_w / max(1, thumb.get_width())
+                        w = max(1, int(round(thumb.get_width() * scale)))
+                        h = max(1, int(round(thumb.get_height() * scale)))
+                        char_select_thumb = pygame.transform.smoothscale(thumb, (w, h))
                     except pygame.error:
                         char_select_thumb = None
 
             if char_select_thumb is not None:
-                max_w = int(constants.STAGE_WIDTH * 0.45)
-                scale = max_w / max(1, char_select_thumb.get_width())
-                w = max(1, int(round(char_select_thumb.get_width() * scale)))
-                h = max(1, int(round(char_select_thumb.get_height() * scale)))
-                thumb = pygame.transform.smoothscale(char_select_thumb, (w, h))
-                stage_surface.blit(thumb, (int(constants.STAGE_WIDTH * 0.08), int(constants.STAGE_HEIGHT * 0.22)))
+                stage_surface.blit(char_select_thumb, (int(constants.STAGE_WIDTH * 0.08), int(constants.STAGE_HEIGHT * 0.22)))
 
-            overlay = pygame.Surface((constants.STAGE_WIDTH, constants.STAGE_HEIGHT), pygame.SRCALPHA)
-            overlay.fill((0, 0, 0, 120))
-            stage_surface.blit(overlay, (0, 0))
+            stage_surface.blit(_dim_stage(120), (0, 0))
 
-            scaled = pygame.transform.smoothscale(stage_surface, (constants.SCREEN_WIDTH, constants.SCREEN_HEIGHT))
-            screen.blit(scaled, (0, 0))
+            _blit_stage_scaled(screen)
 
-            title_surface = title_font.render("CHARACTER SELECT", True, (245, 245, 245))
+            title_surface = render_cached(title_font, "CHARACTER SELECT", (245, 245, 245))
             if char_select_next_state == GameState.TRAINING:
-                title_surface = title_font.render("TRAINING SETUP", True, (245, 245, 245))
+                title_surface = render_cached(title_font, "TRAINING SETUP", (245, 245, 245))
             title_rect = title_surface.get_rect(center=(constants.SCREEN_WIDTH // 2, 110))
             screen.blit(title_surface, title_rect)
 
             right_x = int(constants.SCREEN_WIDTH * 0.65)
             base_y = int(constants.SCREEN_HEIGHT * 0.34)
+            sel = char_select_selection
+            show_arrow = (tick // 250) % 2 == 0
             for i, item in enumerate(char_select_items):
-                selected = i == int(char_select_selection)
-                local_shake = int(3 * math.sin((tick / 120.0) + i)) if selected else 0
+                selected = i == sel
+                local_shake = _MENU_SHAKE_LUT[(tick + i * 120) % _MENU_SHAKE_PERIOD_MS] if selected else 0
 
                 text_color = (255, 240, 120) if selected else (210, 210, 210)
-                text_surf = menu_font.render(item, True, text_color)
+                text_surf = render_cached(menu_font, item, text_color)
 
                 text_rect = text_surf.get_rect(midtop=(right_x + local_shake, base_y + i * 54))
                 screen.blit(text_surf, text_rect)
 
-                if selected and (tick // 250) % 2 == 0:
-                    arrow = menu_font.render("▶", True, (90, 255, 220))
-                    arrow_rect = arrow.get_rect(midright=(text_rect.left - 14, text_rect.centery))
-                    screen.blit(arrow, arrow_rect)
+                if selected and show_arrow:
+                    arrow_rect = menu_arrow.get_rect(midright=(text_rect.left - 14, text_rect.centery))
+                    screen.blit(menu_arrow, arrow_rect)
 
-            hint = font.render("ESC: 戻る / Enter: 決定", True, (235, 235, 235))
+            hint = render_cached(font, "ESC: 戻る / Enter: 決定", (235, 235, 235))
             screen.blit(hint, hint.get_rect(midbottom=(constants.SCREEN_WIDTH // 2, constants.SCREEN_HEIGHT - 22)))
 
             pygame.display.flip()
-            clock.tick(constants.FPS)
+            _wait_menu_frame()
             continue
 
         if menu_open:
-            stage_surface.fill(constants.COLOR_BG)
-
-            stage_renderer.draw_background(
-                stage_surface,
-                tick_ms=int(tick_ms),
-                stage_bg_frames=stage_bg_frames,
-                stage_bg_img=stage_bg_img,
-            )
-
-            stage_renderer.draw_rain(stage_surface)
+            # 前回描いてからキー入力も背景の作り直しもなければ、画面はそのままでよい。
+            # コマンドリストはプレビューが動くので毎フレーム描く。
+            cmdlist_visible = command_list_menu is not None and command_list_menu.is_open
+            if menu_backdrop_ready and not menu_ui_dirty and not cmdlist_visible:
+                clock.tick(constants.FPS)
+                continue
+            menu_ui_dirty = False
+            # メニュー中は試合が止まっているので、背景（ステージ＋暗幕）は開いた最初のフレームで一度だけ作る。
+            if not menu_backdrop_ready or menu_backdrop.get_size() != screen.get_size():
+                stage_surface.fill(constants.COLOR_BG)
+
+                stage_renderer.draw_background(
+                    stage_surface,
+                    tick_ms=tick_ms,
+                    stage_bg_frames=stage_bg_frames,
+                    stage_bg_img=stage_bg_img,
+                )
 
-            pygame.draw.line(
-                stage_surface,
-                (80, 80, 80),
-                (0, constants.GROUND_Y),
-                (constants.STAGE_WIDTH, constants.GROUND_Y),
-                2,
-            )
+                stage_renderer.draw_rain(stage_surface)
 
-            p1.draw(stage_surface, debug_draw=debug_draw)
-            p2.draw(stage_surface, debug_draw=debug_draw)
+                stage_surface.blit(ground_line, (0, constants.GROUND_Y))
 
-            scaled = pygame.transform.smoothscale(stage_surface, (constants.SCREEN_WIDTH, constants.SCREEN_HEIGHT))
-            screen.blit(scaled, (0, 0))
+                p1.draw(stage_surface, debug_draw=debug_flags["debug_draw"])
+                p2.draw(stage_surface, debug_draw=debug_flags["debug_draw"])
 
-            overlay = pygame.Surface((constants.SCREEN_WIDTH, constants.SCREEN_HEIGHT), pygame.SRCALPHA)
-            overlay.fill((0, 0, 0, 160))
-            screen.blit(overlay, (0, 0))
+                if menu_backdrop.get_size() != screen.get_size():
+                    menu_backdrop = pygame.Surface(screen.get_size()).convert()
+                _blit_stage_scaled(menu_backdrop)
+                menu_backdrop.blit(_dim_screen(160), (0, 0))
+                menu_backdrop_ready = True
+                menu_presented_layers = None
+            screen.blit(menu_backdrop, (0, 0))
 
-            w = int(constants.SCREEN_WIDTH)
-            h = int(constants.SCREEN_HEIGHT)
-            panel_w = int(min(760, w - 80))
-            panel_h = int(min(520, h - 140))
+            w = constants.SCREEN_WIDTH
+            h = constants.SCREEN_HEIGHT
+            panel_w = min(760, w - 80)
+            panel_h = min(520, h - 140)
             panel_x = (w - panel_w) // 2
             panel_y = (h - panel_h) // 2
 
-            panel = pygame.Surface((panel_w, panel_h), pygame.SRCALPHA)
-            panel.fill((18, 18, 22, 235))
-            screen.blit(panel, (panel_x, panel_y))
-            pygame.draw.rect(screen, (90, 255, 220), pygame.Rect(panel_x, panel_y, panel_w, panel_h), 2)
+            screen.blit(_menu_panel((panel_w, panel_h)), (panel_x, panel_y))
+            menu_dirty_rect = pygame.Rect(panel_x, panel_y, panel_w, panel_h)
+            pygame.draw.rect(screen, (90, 255, 220), menu_dirty_rect, 2)
 
-            title = font.render("MENU", True, (245, 245, 245))
+            title = render_cached(font, "MENU", (245, 245, 245))
             screen.blit(title, (panel_x + 26, panel_y + 18))
 
             res_w, res_h = resolutions[current_res_index]
-            if game_state in {GameState.BATTLE, GameState.TRAINING}:
+            if game_state in _IN_PLAY_STATES:
                 if game_state == GameState.TRAINING:
                     items = [
                         f"解像度: {res_w}x{res_h}  (←→ 変更 / Enter 適用)",
@@ -1463,120 +1917,105 @@ def main() -> None:
                 ]
             y = panel_y + 74
             if not cmdlist_open:
+                # 強調枠は先に描き、文字は最後に fblits でまとめて描く（行同士は重ならない）。
+                item_blits: list[tuple[pygame.Surface, tuple[int, int]]] = []
+                sel = menu_selection
+                text_x = panel_x + 36
                 for i, text in enumerate(items):
-                    selected = (i == int(menu_selection))
+                    selected = i == sel
                     if selected:
-                        pygame.draw.rect(
-                            screen,
-                            (90, 255, 220, 28),
-                            pygame.Rect(panel_x + 22, y - 6, panel_w - 44, 40),
-                            0,
-                        )
-                        pygame.draw.rect(
-                            screen,
-                            (90, 255, 220),
-                            pygame.Rect(panel_x + 22, y - 6, panel_w - 44, 40),
-                            1,
-                        )
+                        menu_highlight_rect.update(panel_x + 22, y - 6, panel_w - 44, 40)
+                        pygame.draw.rect(screen, (90, 255, 220, 28), menu_highlight_rect, 0)
+                        pygame.draw.rect(screen, (90, 255, 220), menu_highlight_rect, 1)
                     color = (255, 240, 120) if selected else (230, 230, 230)
-                    surf = font.render(text, True, color)
-                    screen.blit(surf, (panel_x + 36, y))
+                    item_blits.append((render_cached(font, text, color), (text_x, y)))
                     y += 44
+                screen.fblits(item_blits)
 
             if game_state == GameState.TRAINING and training_settings_open:
-                overlay5 = pygame.Surface((constants.SCREEN_WIDTH, constants.SCREEN_HEIGHT), pygame.SRCALPHA)
-                overlay5.fill((0, 0, 0, 210))
-                screen.blit(overlay5, (0, 0))
-
-                w = int(constants.SCREEN_WIDTH)
-                h = int(constants.SCREEN_HEIGHT)
-                panel_w = int(min(760, w - 80))
-                panel_h = int(min(520, h - 140))
+                screen.blit(_dim_screen(210), (0, 0))
+
+                w = constants.SCREEN_WIDTH
+                h = constants.SCREEN_HEIGHT
+                panel_w = min(760, w - 80)
+                panel_h = min(520, h - 140)
                 panel_x = (w - panel_w) // 2
                 panel_y = (h - panel_h) // 2
 
-                panel = pygame.Surface((panel_w, panel_h), pygame.SRCALPHA)
-                panel.fill((18, 18, 22, 235))
-                screen.blit(panel, (panel_x, panel_y))
-                pygame.draw.rect(screen, (90, 255, 220), pygame.Rect(panel_x, panel_y, panel_w, panel_h), 2)
+                screen.blit(_menu_panel((panel_w, panel_h)), (panel_x, panel_y))
+                panel_rect = pygame.Rect(panel_x, panel_y, panel_w, panel_h)
+                pygame.draw.rect(screen, (90, 255, 220), panel_rect, 2)
+                menu_dirty_rect.union_ip(panel_rect)
 
-                header = title_font.render("TRAINING", True, (245, 245, 245))
-                header_scale_w = max(1, int(round(header.get_width() * 0.38)))
-                header_scale_h = max(1, int(round(header.get_height() * 0.38)))
-                header = pygame.transform.smoothscale(header, (header_scale_w, header_scale_h))
+                header = render_scaled_cached(title_font, "TRAINING", (245, 245, 245), 0.38)
                 screen.blit(header, (panel_x + 26, panel_y + 18))
 
-                sub = keycfg_font.render("←→: 調整 / Enter: 切替 / ESC or O: 戻る", True, (220, 220, 220))
+                sub = render_cached(keycfg_font, "←→: 調整 / Enter: 切替 / ESC or O: 戻る", (220, 220, 220))
                 screen.blit(sub, (panel_x + 28, panel_y + 58))
 
                 lock_label = "なし"
-                if int(training_p2_state_lock) == 1:
+                if training_p2_state_lock == 1:
                     lock_label = "立ち"
-                elif int(training_p2_state_lock) == 2:
+                elif training_p2_state_lock == 2:
                     lock_label = "しゃがみ"
-                elif int(training_p2_state_lock) == 3:
+                elif training_p2_state_lock == 3:
                     lock_label = "ジャンプ"
 
                 pos_label = "画面中央"
-                if int(training_start_position) == 1:
+                if training_start_position == 1:
                     pos_label = "左端"
-                elif int(training_start_position) == 2:
+                elif training_start_position == 2:
                     pos_label = "右端"
 
                 rows = [
-                    ("P1 HP残量", f"{int(training_hp_percent_p1)}%"),
-                    ("P2 HP残量", f"{int(training_hp_percent_p2)}%"),
-                    ("P1 SPゲージ", f"{int(training_sp_percent_p1)}%"),
-                    ("P2 SPゲージ", f"{int(training_sp_percent_p2)}%"),
-                    ("HP自動回復", "ON" if bool(training_auto_recover_hp) else "OFF"),
-                    ("SP自動回復", "ON" if bool(training_auto_recover_sp) else "OFF"),
+                    ("P1 HP残量", f"{training_hp_percent_p1}%"),
+                    ("P2 HP残量", f"{training_hp_percent_p2}%"),
+                    ("P1 SPゲージ", f"{training_sp_percent_p1}%"),
+                    ("P2 SPゲージ", f"{training_sp_percent_p2}%"),
+                    ("HP自動回復", "ON" if training_auto_recover_hp else "OFF"),
+                    ("SP自動回復", "ON" if training_auto_recover_sp else "OFF"),
                     ("P2状態固定", lock_label),
                     ("開始位置", pos_label),
-                    ("P2全ガード", "ON" if bool(training_p2_all_guard) else "OFF"),
+                    ("P2全ガード", "ON" if training_p2_all_guard else "OFF"),
                     ("戻る", ""),
                 ]
                 y0 = panel_y + 110
                 line_h = 44
                 y_max = panel_y + panel_h - 56
-                visible = max(1, int((y_max - y0) // line_h))
+                visible = max(1, (y_max - y0) // line_h)
                 max_scroll = max(0, len(rows) - visible)
                 try:
-                    target_scroll = int(training_settings_scroll)
-                    sel = int(training_settings_selection)
+                    target_scroll = training_settings_scroll
+                    sel = training_settings_selection
                     if sel < target_scroll:
                         target_scroll = sel
                     if sel >= target_scroll + visible:
                         target_scroll = sel - visible + 1
-                    training_settings_scroll = max(0, min(max_scroll, int(target_scroll)))
+                    training_settings_scroll = max(0, min(max_scroll, target_scroll))
                 except Exception:
                     training_settings_scroll = 0
 
-                y = int(y0)
-                for i in range(int(training_settings_scroll), min(len(rows), int(training_settings_scroll) + visible)):
+                y = y0
+                row_blits: list[tuple[pygame.Surface, tuple[int, int]]] = []
+                sel = training_settings_selection
+                text_x = panel_x + 36
+                first = training_settings_scroll
+                for i in range(first, min(len(rows), first + visible)):
                     label, value = rows[i]
-                    selected = i == int(training_settings_selection)
+                    selected = i == sel
                     if selected:
-                        pygame.draw.rect(
-                            screen,
-                            (90, 255, 220, 28),
-                            pygame.Rect(panel_x + 22, y - 6, panel_w - 44, 40),
-                            0,
-                        )
-                        pygame.draw.rect(
-                            screen,
-                            (90, 255, 220),
-                            pygame.Rect(panel_x + 22, y - 6, panel_w - 44, 40),
-                            1,
-                        )
+                        menu_highlight_rect.update(panel_x + 22, y - 6, panel_w - 44, 40)
+                        pygame.draw.rect(screen, (90, 255, 220, 28), menu_highlight_rect, 0)
+                        pygame.draw.rect(screen, (90, 255, 220), menu_highlight_rect, 1)
                     color = (255, 240, 120) if selected else (230, 230, 230)
                     text = label if not value else f"{label}: {value}"
-                    surf = font.render(text, True, color)
-                    screen.blit(surf, (panel_x + 36, y))
-                    y += int(line_h)
+                    row_blits.append((render_cached(font, text, color), (text_x, y)))
+                    y += line_h
+                screen.fblits(row_blits)
 
                 # スクロールバー（必要な場合のみ描画）
-                if int(len(rows)) > int(visible):
-                    track_h = int(y_max - y0)
+                if len(rows) > visible:
+                    track_h = y_max - y0
                     thumb_height = max(20, int(round(float(track_h) * (float(visible) / float(len(rows))))))
                     thumb_y = y0 + int(round(float(training_settings_scroll) * (float(track_h - thumb_height) / max(1, float(max_scroll)))))
                     # トラック
@@ -1585,35 +2024,30 @@ def main() -> None:
                     pygame.draw.rect(screen, (180, 180, 180), pygame.Rect(panel_x + panel_w - 17, thumb_y, 10, thumb_height))
 
             if keyconfig_open:
-                overlay3 = pygame.Surface((constants.SCREEN_WIDTH, constants.SCREEN_HEIGHT), pygame.SRCALPHA)
-                overlay3.fill((0, 0, 0, 210))
-                screen.blit(overlay3, (0, 0))
+                screen.blit(_dim_screen(210), (0, 0))
 
-                w = int(constants.SCREEN_WIDTH)
-                h = int(constants.SCREEN_HEIGHT)
+                w = constants.SCREEN_WIDTH
+                h = constants.SCREEN_HEIGHT
 
-                panel_w = int(min(860, w - 80))
-                panel_h = int(min(560, h - 140))
+                panel_w = min(860, w - 80)
+                panel_h = min(560, h - 140)
                 panel_x = (w - panel_w) // 2
                 panel_y = (h - panel_h) // 2
 
-                panel = pygame.Surface((panel_w, panel_h), pygame.SRCALPHA)
-                panel.fill((18, 18, 22, 235))
-                screen.blit(panel, (panel_x, panel_y))
-                pygame.draw.rect(screen, (90, 255, 220), pygame.Rect(panel_x, panel_y, panel_w, panel_h), 2)
+                screen.blit(_menu_panel((panel_w, panel_h)), (panel_x, panel_y))
+                panel_rect = pygame.Rect(panel_x, panel_y, panel_w, panel_h)
+                pygame.draw.rect(screen, (90, 255, 220), panel_rect, 2)
+                menu_dirty_rect.union_ip(panel_rect)
 
                 header_txt = "KEY CONFIG"
                 sub_txt = "ESC: 戻る"
                 if keyconfig_waiting_action is not None:
                     sub_txt = "設定したいキーを押してください (ESCでキャンセル)"
 
-                header = title_font.render(header_txt, True, (245, 245, 245))
-                header_scale_w = max(1, int(round(header.get_width() * 0.42)))
-                header_scale_h = max(1, int(round(header.get_height() * 0.42)))
-                header = pygame.transform.smoothscale(header, (header_scale_w, header_scale_h))
+                header = render_scaled_cached(title_font, header_txt, (245, 245, 245), 0.42)
                 screen.blit(header, (panel_x + 26, panel_y + 18))
 
-                sub = font.render(sub_txt, True, (220, 220, 220))
+                sub = render_cached(font, sub_txt, (220, 220, 220))
                 screen.blit(sub, (panel_x + 28, panel_y + 58))
 
                 inner_x = panel_x + 26
@@ -1627,92 +2061,88 @@ def main() -> None:
                 right_x = inner_x + col_w + col_gap
 
                 tag_h = 34
-                pygame.draw.rect(screen, (25, 25, 35), pygame.Rect(left_x, inner_y - 44, col_w, tag_h), 0)
-                pygame.draw.rect(screen, (25, 25, 35), pygame.Rect(right_x, inner_y - 44, col_w, tag_h), 0)
-                pygame.draw.rect(screen, (80, 80, 110), pygame.Rect(left_x, inner_y - 44, col_w, tag_h), 1)
-                pygame.draw.rect(screen, (80, 80, 110), pygame.Rect(right_x, inner_y - 44, col_w, tag_h), 1)
-
-                p1_tag = font.render("P1", True, (90, 255, 220))
-                p2_tag = font.render("P2", True, (90, 255, 220))
+                left_tag_rect = pygame.Rect(left_x, inner_y - 44, col_w, tag_h)
+                right_tag_rect = pygame.Rect(right_x, inner_y - 44, col_w, tag_h)
+                pygame.draw.rect(screen, (25, 25, 35), left_tag_rect, 0)
+                pygame.draw.rect(screen, (25, 25, 35), right_tag_rect, 0)
+                pygame.draw.rect(screen, (80, 80, 110), left_tag_rect, 1)
+                pygame.draw.rect(screen, (80, 80, 110), right_tag_rect, 1)
+
+                p1_tag = render_cached(font, "P1", (90, 255, 220))
+                p2_tag = render_cached(font, "P2", (90, 255, 220))
                 screen.blit(p1_tag, p1_tag.get_rect(midleft=(left_x + 14, inner_y - 27)))
                 screen.blit(p2_tag, p2_tag.get_rect(midleft=(right_x + 14, inner_y - 27)))
 
-                rows: list[tuple[str, str, int]] = []
-                for idx, (label, act) in enumerate(keyconfig_actions):
-                    rows.append((str(label), str(act), int(idx)))
-
-                left_rows = [r for r in rows if (r[1].startswith("P1_") or (not r[1].startswith("P2_")))]
-                right_rows = [r for r in rows if r[1].startswith("P2_")]
+                left_rows = keyconfig_left_rows
+                right_rows = keyconfig_right_rows
+                left_idxs = keyconfig_left_idxs
+                right_idxs = keyconfig_right_idxs
 
                 line_h = 44
-                visible = max(1, int(inner_h // line_h))
-                left_idxs = [int(idx) for _l, _a, idx in left_rows]
-                right_idxs = [int(idx) for _l, _a, idx in right_rows]
+                visible = max(1, inner_h // line_h)
 
                 try:
-                    sel = int(keyconfig_selection)
+                    sel = keyconfig_selection
                     if sel in left_idxs:
                         pos = left_idxs.index(sel)
-                        target = int(keyconfig_scroll_left)
+                        target = keyconfig_scroll_left
                         if pos < target:
                             target = pos
                         if pos >= target + visible:
                             target = pos - visible + 1
-                        keyconfig_scroll_left = max(0, min(max(0, len(left_rows) - visible), int(target)))
+                        keyconfig_scroll_left = max(0, min(max(0, len(left_rows) - visible), target))
                     if sel in right_idxs:
                         pos = right_idxs.index(sel)
-                        target = int(keyconfig_scroll_right)
+                        target = keyconfig_scroll_right
                         if pos < target:
                             target = pos
                         if pos >= target + visible:
                             target = pos - visible + 1
-                        keyconfig_scroll_right = max(0, min(max(0, len(right_rows) - visible), int(target)))
+                        keyconfig_scroll_right = max(0, min(max(0, len(right_rows) - visible), target))
                 except Exception:
                     keyconfig_scroll_left = 0
                     keyconfig_scroll_right = 0
 
-                def _draw_rows(rows_in: list[tuple[str, str, int]], *, x: int, scroll: int) -> None:
-                    y = int(inner_y)
-                    for label, act, idx in rows_in[int(scroll) : int(scroll) + visible]:
-                        selected = (idx == int(keyconfig_selection)) and (keyconfig_waiting_action is None)
+                # 入力待ち中はどの行も強調しない。
+                sel = keyconfig_selection if keyconfig_waiting_action is None else -1
+                max_label_w = max(40, col_w - 10 - 170)
+                # 両列の文字は1つのリストに集めて、最後に1回の fblits で描く。
+                row_blits: list[tuple[pygame.Surface, tuple[int, int]]] = []
+
+                def _draw_rows(rows_in: tuple[tuple[str, str, int], ...], *, x: int, scroll: int) -> None:
+                    y = inner_y
+                    for label, act, idx in rows_in[scroll : scroll + visible]:
+                        selected = idx == sel
                         if selected:
-                            pygame.draw.rect(screen, (90, 255, 220, 28), pygame.Rect(x, y - 6, col_w, line_h), 0)
-                            pygame.draw.rect(screen, (90, 255, 220), pygame.Rect(x, y - 6, col_w, line_h), 1)
+                            menu_highlight_rect.update(x, y - 6, col_w, line_h)
+                            pygame.draw.rect(screen, (90, 255, 220, 28), menu_highlight_rect, 0)
+                            pygame.draw.rect(screen, (90, 255, 220), menu_highlight_rect, 1)
 
-                        key_code = int(keybinds.get(str(act), DEFAULT_KEYBINDS.get(str(act), 0)))
+                        key_code = keybinds_int.get(act, int(DEFAULT_KEYBINDS.get(act, 0)))
                         key_text = _key_name(key_code)
 
                         name_c = (245, 245, 245) if selected else (220, 220, 220)
                         key_c = (255, 240, 120) if selected else (200, 200, 200)
 
                         # Long labels (e.g. FIELD_RESET) can overlap with key name, so clamp to fit.
-                        label_txt = str(label)
-                        max_label_w = int(max(40, col_w - 10 - 170))
-                        try:
-                            while label_txt and int(keycfg_font.size(label_txt)[0]) > int(max_label_w):
-                                if len(label_txt) <= 1:
-                                    break
-                                label_txt = label_txt[:-1]
-                                if len(label_txt) >= 2:
-                                    label_txt = label_txt[:-1] + "…"
-                        except Exception:
-                            pass
-                        left = keycfg_font.render(str(label_txt), True, name_c)
-                        right = keycfg_font.render(str(key_text), True, key_c)
-                        screen.blit(left, (x + 8, y))
-                        screen.blit(right, right.get_rect(midright=(x + col_w - 10, y + (left.get_height() // 2) + 2)))
+                        label_txt = _fit_keyconfig_label(label, max_label_w)
+                        left = render_cached(keycfg_font, label_txt, name_c)
+                        right = render_cached(keycfg_font, key_text, key_c)
+                        row_blits.append((left, (x + 8, y)))
+                        row_blits.append((right, right.get_rect(midright=(x + col_w - 10, y + (left.get_height() // 2) + 2)).topleft))
 
                         y += line_h
 
-                _draw_rows(left_rows, x=left_x, scroll=int(keyconfig_scroll_left))
-                _draw_rows(right_rows, x=right_x, scroll=int(keyconfig_scroll_right))
+                _draw_rows(left_rows, x=left_x, scroll=keyconfig_scroll_left)
+                _draw_rows(right_rows, x=right_x, scroll=keyconfig_scroll_right)
+                screen.fblits(row_blits)
 
                 # スクロールバー（P1側とP2側で別々に描画）
-                max_visible_rows = max(1, int(inner_h // line_h))
+                max_visible_rows = max(1, inner_h // line_h)
                 
                 # P1側（左）のスクロールバー
-                if int(len(left_rows)) > int(max_visible_rows):
-                    max_scroll_left = max(1, int(len(left_rows)) - int(max_visible_rows))
+                if len(left_rows) > max_visible_rows:
+                    max_scroll_left = max(1, len(left_rows) - max_visible_rows)
                     thumb_height_left = max(20, int(round(float(inner_h) * (float(max_visible_rows) / float(len(left_rows))))))
                     thumb_y_left = inner_y + int(round(float(keyconfig_scroll_left) * (float(inner_h - thumb_height_left) / float(max_scroll_left))))
                     # トラック
@@ -1721,8 +2151,8 @@ def main() -> None:
                     pygame.draw.rect(screen, (180, 180, 180), pygame.Rect(left_x + col_w - 13, thumb_y_left, 8, thumb_height_left))
                 
                 # P2側（右）のスクロールバー
-                if int(len(right_rows)) > int(max_visible_rows):
-                    max_scroll_right = max(1, int(len(right_rows)) - int(max_visible_rows))
+                if len(right_rows) > max_visible_rows:
+                    max_scroll_right = max(1, len(right_rows) - max_visible_rows)
                     thumb_height_right = max(20, int(round(float(inner_h) * (float(max_visible_rows) / float(len(right_rows))))))
                     thumb_y_right = inner_y + int(round(float(keyconfig_scroll_right) * (float(inner_h - thumb_height_right) / float(max_scroll_right))))
                     # トラック
@@ -1730,72 +2160,74 @@ def main() -> None:
                     # サム
                     pygame.draw.rect(screen, (180, 180, 180), pygame.Rect(right_x + col_w - 13, thumb_y_right, 8, thumb_height_right))
 
-                footer = keycfg_font.render("↑↓: 選択 / A← D→: 列移動 / Enter: 変更 / ESC: 戻る", True, (220, 220, 220))
+                footer = render_cached(keycfg_font, "↑↓: 選択 / A← D→: 列移動 / Enter: 変更 / ESC: 戻る", (220, 220, 220))
                 screen.blit(footer, footer.get_rect(midbottom=(w // 2, panel_y + panel_h - 18)))
 
             if game_state == GameState.TRAINING and debugmenu_open:
-                overlay4 = pygame.Surface((constants.SCREEN_WIDTH, constants.SCREEN_HEIGHT), pygame.SRCALPHA)
-                overlay4.fill((0, 0, 0, 210))
-                screen.blit(overlay4, (0, 0))
-
-                w = int(constants.SCREEN_WIDTH)
-                h = int(constants.SCREEN_HEIGHT)
-                panel_w = int(min(760, w - 80))
-                panel_h = int(min(520, h - 140))
+                screen.blit(_dim_screen(210), (0, 0))
+
+                w = constants.SCREEN_WIDTH
+                h = constants.SCREEN_HEIGHT
+                panel_w = min(760, w - 80)
+                panel_h = min(520, h - 140)
                 panel_x = (w - panel_w) // 2
                 panel_y = (h - panel_h) // 2
 
-                panel = pygame.Surface((panel_w, panel_h), pygame.SRCALPHA)
-                panel.fill((18, 18, 22, 235))
-                screen.blit(panel, (panel_x, panel_y))
-                pygame.draw.rect(screen, (90, 255, 220), pygame.Rect(panel_x, panel_y, panel_w, panel_h), 2)
+                screen.blit(_menu_panel((panel_w, panel_h)), (panel_x, panel_y))
+                panel_rect = pygame.Rect(panel_x, panel_y, panel_w, panel_h)
+                pygame.draw.rect(screen, (90, 255, 220), panel_rect, 2)
+                menu_dirty_rect.union_ip(panel_rect)
 
-                header = title_font.render("DEBUG", True, (245, 245, 245))
-                header_scale_w = max(1, int(round(header.get_width() * 0.42)))
-                header_scale_h = max(1, int(round(header.get_height() * 0.42)))
-                header = pygame.transform.smoothscale(header, (header_scale_w, header_scale_h))
+                header = render_scaled_cached(title_font, "DEBUG", (245, 245, 245), 0.42)
                 screen.blit(header, (panel_x + 26, panel_y + 18))
 
-                sub = keycfg_font.render("Enter: 切替 / ESC or O: 戻る", True, (220, 220, 220))
+                sub = render_cached(keycfg_font, "Enter: 切替 / ESC or O: 戻る", (220, 220, 220))
                 screen.blit(sub, (panel_x + 28, panel_y + 58))
 
-                dbg_rows = [
-                    ("キー履歴", bool(debug_ui_show_key_history)),
-                    ("P1フレーム情報", bool(debug_ui_show_p1_frames)),
-                    ("P2フレーム情報", bool(debug_ui_show_p2_frames)),
-                    ("判定表示", bool(debug_draw)),
-                    ("フレームメーター", bool(frame_meter_enabled)),
-                    ("グリッド表示", bool(debug_show_grid)),
-                    ("戻る", True),
-                ]
+                dbg_rows = [(label, debug_flags[flag_key]) for label, flag_key in _DEBUG_MENU_TOGGLES]
+                dbg_rows.append(("戻る", True))
                 y = panel_y + 110
+                row_blits = []
+                sel = debugmenu_selection
+                text_x = panel_x + 36
                 for i, (label, enabled) in enumerate(dbg_rows):
-                    selected = i == int(debugmenu_selection)
+                    selected = i == sel
                     if selected:
-                        pygame.draw.rect(
-                            screen,
-                            (90, 255, 220, 28),
-                            pygame.Rect(panel_x + 22, y - 6, panel_w - 44, 40),
-                            0,
-                        )
-                        pygame.draw.rect(
-                            screen,
-                            (90, 255, 220),
-                            pygame.Rect(panel_x + 22, y - 6, panel_w - 44, 40),
-                            1,
-                        )
+                        menu_highlight_rect.update(panel_x + 22, y - 6, panel_w - 44, 40)
+                        pygame.draw.rect(screen, (90, 255, 220, 28), menu_highlight_rect, 0)
+                        pygame.draw.rect(screen, (90, 255, 220), menu_highlight_rect, 1)
                     color = (255, 240, 120) if selected else (230, 230, 230)
                     suffix = "" if label == "戻る" else ("ON" if enabled else "OFF")
                     text = f"{label}: {suffix}" if suffix else label
-                    surf = font.render(text, True, color)
-                    screen.blit(surf, (panel_x + 36, y))
+                    row_blits.append((render_cached(font, text, color), (text_x, y)))
                     y += 44
+                screen.fblits(row_blits)
 
             # CommandListMenuの描画
-            if game_state in {GameState.BATTLE, GameState.TRAINING} and command_list_menu is not None:
+            if game_state in _IN_PLAY_STATES and command_list_menu is not None:
                 command_list_menu.draw(screen, p1, title_font=title_font, keycfg_font=keycfg_font)
-
-            pygame.display.flip()
+                if cmdlist_visible and not command_list_menu.is_open:
+                    # 閉じるアニメーションの最後のフレームはまだリストが描かれているので、
+                    # 次のフレームでリストのない画面を描き直す。
+                    menu_ui_dirty = True
+
+            # 開いているパネルの組み合わせが前フレームと同じなら、パネルの外側は変わっていない。
+            # その場合はパネル部分だけをウィンドウへ転送する。
+            # コマンドリストはパネル外にも動きがあるので毎回全体を転送する。開閉でも画面全体が変わるので、
+            # このフレームでリストを描いたかどうかも組み合わせに含める（閉じ終わりのフレームは描いた側に数える）。
+            menu_layers = (
+                screen.get_size(),
+                game_state,
+                training_settings_open,
+                debugmenu_open,
+                keyconfig_open,
+                cmdlist_visible,
+            )
+            if menu_layers == menu_presented_layers and not cmdlist_visible:
+                pygame.display.update(menu_dirty_rect)
+            else:
+                pygame.display.flip()
+                menu_presented_layers = menu_layers
             clock.tick(constants.FPS)
             continue
 
@@ -1804,74 +2236,82 @@ def main() -> None:
 
             tick = pygame.time.get_ticks()
 
-            if title_bg_img is not None:
-                bg = pygame.transform.smoothscale(title_bg_img, (constants.STAGE_WIDTH, constants.STAGE_HEIGHT))
-                bg.set_alpha(60)
-                stage_surface.blit(bg, (0, 0))
+            if title_bg_dim is not None:
+                stage_surface.blit(title_bg_dim, (0, 0))
 
-            title_bg_overlay = pygame.Surface((constants.STAGE_WIDTH, constants.STAGE_HEIGHT), pygame.SRCALPHA)
-            title_bg_overlay.fill((0, 0, 0, 140))
-            stage_surface.blit(title_bg_overlay, (0, 0))
+            stage_surface.blit(_dim_stage(140), (0, 0))
 
-            scaled = pygame.transform.smoothscale(stage_surface, (constants.SCREEN_WIDTH, constants.SCREEN_HEIGHT))
-            screen.blit(scaled, (0, 0))
+            _blit_stage_scaled(screen)
 
-            title_surface = title_font.render(constants.GAME_TITLE, True, (245, 245, 245))
+            title_surface = render_cached(title_font, constants.GAME_TITLE, (245, 245, 245))
             title_rect = title_surface.get_rect(center=(constants.SCREEN_WIDTH // 2, constants.SCREEN_HEIGHT // 2 - 150))
             screen.blit(title_surface, title_rect)
 
             cx = constants.SCREEN_WIDTH // 2
             base_y = constants.SCREEN_HEIGHT // 2 - 20
+            show_arrow = (tick // 250) % 2 == 0
             for i, name in enumerate(title_menu_items):
                 selected = i == title_menu_selection
-                local_shake = int(3 * math.sin((tick / 120.0) + i)) if selected else 0
+                local_shake = _MENU_SHAKE_LUT[(tick + i * 120) % _MENU_SHAKE_PERIOD_MS] if selected else 0
 
                 text_color = (255, 240, 120) if selected else (210, 210, 210)
-                text_surf = menu_font.render(name, True, text_color)
+                text_surf = render_cached(menu_font, name, text_color)
 
                 text_rect = text_surf.get_rect(center=(cx + local_shake, base_y + i * 50))
                 screen.blit(text_surf, text_rect)
 
-                if selected and (tick // 250) % 2 == 0:
-                    arrow = menu_font.render("▶", True, (90, 255, 220))
-                    arrow_rect = arrow.get_rect(midright=(text_rect.left - 14, text_rect.centery))
-                    screen.blit(arrow, arrow_rect)
+                if selected and show_arrow:
+                    arrow_rect = menu_arrow.get_rect(midright=(text_rect.left - 14, text_rect.centery))
+                    screen.blit(menu_arrow, arrow_rect)
 
             pygame.display.flip()
-            clock.tick(constants.FPS)
+            _wait_menu_frame()
             continue
 
+        # フレームポーズ中は入力適用・AI・物理・判定をまとめてスキップ（フレーム進行時は例外）。
+        # 描画は止めずに行い、止まった1フレームをそのまま表示し続ける。
+        should_update = not frame_paused or frame_advance
+        if frame_advance:
+            frame_advance = False  # 1フレーム進めたらリセット
+
+        # 入力（intent）を Player に渡す。
+        can_play_round = (round_over_frames_left <= 0) and (
+            (game_state != GameState.BATTLE) or (battle_countdown_frames_left <= 0)
+        )
+
         # 押しっぱなし入力（左右移動・しゃがみ）は get_pressed で取得。
-        keys = pygame.key.get_pressed()
+        # 入力を Player に渡さないフレーム（カウント中・決着後・ポーズ中）は読まずに中立にしておく。
+        if can_play_round and should_update:
+            keys = pygame.key.get_pressed()
 
-        # move_x は -1/0/+1 の3値にする。
-        p1_move_x = int(keys[int(keybinds.get("P1_RIGHT", pygame.K_d))]) - int(keys[int(keybinds.get("P1_LEFT", pygame.K_a))])
-        p2_move_x = int(keys[int(keybinds.get("P2_RIGHT", pygame.K_RIGHT))]) - int(keys[int(keybinds.get("P2_LEFT", pygame.K_LEFT))])
+            k_p1_right, k_p1_left, k_p2_right, k_p2_left, k_p1_down, k_p2_down = held_key_codes
 
-        p1_crouch = bool(keys[int(keybinds.get("P1_DOWN", pygame.K_s))])
-        p2_crouch = bool(keys[int(keybinds.get("P2_DOWN", pygame.K_DOWN))])
+            # move_x は -1/0/+1 の3値にする（get_pressed は bool を返すので、そのまま引き算できる）。
+            p1_move_x = keys[k_p1_right] - keys[k_p1_left]
+            p2_move_x = keys[k_p2_right] - keys[k_p2_left]
 
-        # 向きは相手の位置から決める（Phase 1 の簡易仕様）。
-        p1.facing = 1 if p2.rect.centerx >= p1.rect.centerx else -1
-        p2.facing = 1 if p1.rect.centerx >= p2.rect.centerx else -1
+            p1_crouch = keys[k_p1_down]
+            p2_crouch = keys[k_p2_down]
+        else:
+            p1_move_x = p2_move_x = 0
+            p1_crouch = p2_crouch = False
 
-        # 入力（intent）を Player に渡す。
-        can_play_round = (int(round_over_frames_left) <= 0) and (
-            (game_state != GameState.BATTLE) or (int(battle_countdown_frames_left) <= 0)
-        )
+        # 向きは相手の位置から決める（Phase 1 の簡易仕様）。
+        # 2人の間の距離は CPU の判断でも使うので、ここで一度だけ求めておく。
+        dx = p1.rect.centerx - p2.rect.centerx
+        adx = abs(dx)
+        p1.facing = 1 if dx <= 0 else -1
+        p2.facing = 1 if dx >= 0 else -1
 
         # CPU control (P2)
         cpu_enabled_now = (game_state == GameState.BATTLE and cpu_enabled_battle) or (
             game_state == GameState.TRAINING and cpu_enabled_training
         )
-        if cpu_enabled_now and can_play_round:
-            cpu_decision_frames_left = max(0, int(cpu_decision_frames_left) - 1)
-            cpu_attack_cooldown = max(0, int(cpu_attack_cooldown) - 1)
-            cpu_jump_cooldown = max(0, int(cpu_jump_cooldown) - 1)
-            cpu_special_cooldown = max(0, int(cpu_special_cooldown) - 1)
-
-            dx = float(p1.rect.centerx - p2.rect.centerx)
-            adx = abs(dx)
+        if cpu_enabled_now and can_play_round and should_update:
+            cpu_decision_frames_left = max(0, cpu_decision_frames_left - 1)
+            cpu_attack_cooldown = max(0, cpu_attack_cooldown - 1)
+            cpu_jump_cooldown = max(0, cpu_jump_cooldown - 1)
+            cpu_special_cooldown = max(0, cpu_special_cooldown - 1)
 
             # Default: approach if far, hold if mid, back off a bit if too close.
             move_dir = 0
@@ -1880,41 +2320,40 @@ def main() -> None:
             elif adx < 90:
                 move_dir = -1 if dx > 0 else 1
 
-            p2_move_x = int(move_dir)
+            p2_move_x = move_dir
             p2_crouch = False
 
             # Simple decision cadence to avoid spamming.
             if cpu_decision_frames_left <= 0:
-                cpu_decision_frames_left = int(constants.FPS * 0.20)
+                cpu_decision_frames_left = _CPU_DECISION_CD
 
                 # 1) Close-range normal attack
                 if adx < 115 and cpu_attack_cooldown <= 0 and (not p2.attacking) and (not p2.in_hitstun) and (not p2.in_blockstun):
                     p2.start_attack("P2_L_PUNCH")
-                    cpu_attack_cooldown = int(constants.FPS * 0.45)
+                    cpu_attack_cooldown = _CPU_ATTACK_CD
 
                 # 2) Mid-range specials
                 if cpu_special_cooldown <= 0 and (not p2.in_hitstun) and (not p2.in_blockstun):
                     # Prefer shinku if power is enough and distance is good.
-                    super_cost = int(getattr(constants, "POWER_GAUGE_SUPER_COST", 500))
-                    if adx > 170 and p2.can_spend_power(super_cost) and (random.random() < 0.12):
-                        if p2.spend_power(super_cost):
+                    if adx > 170 and p2.can_spend_power(_SUPER_COST) and (_cpu_rng.getrandbits(16) < _CPU_SHINKU_CHANCE):
+                        if p2.spend_power(_SUPER_COST):
                             p2.start_shinku_hadoken()
                             if beam_se is not None:
                                 beam_se.play()
-                            super_freeze_frames_left = int(getattr(constants, "SUPER_FREEZE_FRAMES", 30))
+                            super_freeze_frames_left = _SUPER_FREEZE_FRAMES
                             super_freeze_attacker_side = 2
-                            cpu_special_cooldown = int(constants.FPS * 1.2)
-                    elif adx > 150 and (random.random() < 0.22):
+                            cpu_special_cooldown = _CPU_SUPER_CD
+                    elif adx > 150 and (_cpu_rng.getrandbits(16) < _CPU_HADOKEN_CHANCE):
                         p2.start_hadoken()
-                        cpu_special_cooldown = int(constants.FPS * 0.9)
+                        cpu_special_cooldown = _CPU_HADOKEN_CD
 
                 # 3) Occasional jump to vary behavior
-                if cpu_jump_cooldown <= 0 and adx > 140 and (random.random() < 0.06):
+                if cpu_jump_cooldown <= 0 and adx > 140 and (_cpu_rng.getrandbits(16) < _CPU_JUMP_CHANCE):
                     p2_jump_pressed = True
-                    cpu_jump_cooldown = int(constants.FPS * 1.0)
+                    cpu_jump_cooldown = _CPU_JUMP_CD
 
         if game_state == GameState.TRAINING and can_play_round:
-            lock = int(training_p2_state_lock)
+            lock = training_p2_state_lock
             if lock == 1:
                 p2_move_x = 0
                 p2_crouch = False
@@ -1926,14 +2365,14 @@ def main() -> None:
             elif lock == 3:
                 p2_move_x = 0
                 p2_crouch = False
-                if bool(getattr(p2, "on_ground", False)):
+                if p2.on_ground:
                     p2_jump_pressed = True
 
-        if can_play_round and int(shungoku_posthit_lock_side) in {1, 2}:
-            defender = p1 if int(shungoku_posthit_lock_defender_side) == 1 else p2
-            defender_down = bool(getattr(defender, "_down_anim_active", False))
+        if can_play_round and shungoku_posthit_lock_side in {1, 2}:
+            defender = p1 if shungoku_posthit_lock_defender_side == 1 else p2
+            defender_down = defender._down_anim_active
             if not defender_down:
-                attacker = p1 if int(shungoku_posthit_lock_side) == 1 else p2
+                attacker = p1 if shungoku_posthit_lock_side == 1 else p2
                 try:
                     attacker._set_action(attacker._best_action_id([0]), mode="loop")
                 except Exception:
@@ -1942,11 +2381,11 @@ def main() -> None:
                 shungoku_posthit_lock_defender_side = 0
 
                 # 瞬獄殺ヒット後：相手が起き上がった瞬間に BGM を再開する。
-                if bool(bgm_suspended):
+                if bgm_suspended:
                     bgm_suspended = False
                     _ensure_bgm_for_state(game_state)
             else:
-                if int(shungoku_posthit_lock_side) == 1:
+                if shungoku_posthit_lock_side == 1:
                     p1_move_x = 0
                     p1_crouch = False
                     p1_jump_pressed = False
@@ -1957,72 +2396,31 @@ def main() -> None:
                     p2_jump_pressed = False
                     p2_attack_id = None
 
-        if can_play_round:
-            p1.apply_input(
-                PlayerInput(
-                    move_x=p1_move_x,
-                    jump_pressed=p1_jump_pressed,
-                    crouch=p1_crouch,
-                    attack_id=p1_attack_id,
-                )
-            )
-            p2.apply_input(
-                PlayerInput(
-                    move_x=p2_move_x,
-                    jump_pressed=p2_jump_pressed,
-                    crouch=p2_crouch,
-                    attack_id=p2_attack_id,
-                )
-            )
-
-        def _apply_special_results(res: dict[str, Any], *, side: int, player: Player) -> None:
-            nonlocal super_freeze_frames_left, super_freeze_attacker_side
-            if bool(res.get("did_shinku")):
-                if beam_se is not None:
-                    beam_se.play()
-                super_freeze_frames_left = int(getattr(constants, "SUPER_FREEZE_FRAMES", 30))
-                super_freeze_attacker_side = int(side)
-            if bool(res.get("did_shungoku")):
-                nonlocal shungoku_start_queued_side
-                if int(shungoku_start_queued_side) != 0:
-                    return
-                nonlocal shungoku_super_se_cooldown
-                if int(shungoku_super_se_cooldown) <= 0:
-                    if sound_manager.shungoku_super_se is not None:
-                        sound_manager.shungoku_super_se.play()
-                    shungoku_super_se_cooldown = 12
-                super_freeze_frames_left = max(int(super_freeze_frames_left), 10)
-                super_freeze_attacker_side = int(side)
-                shungoku_start_queued_side = int(side)
-                nonlocal shungoku_pan_frames_left, shungoku_pan_target_px
-                shungoku_pan_frames_left = int(shungoku_pan_total_frames)
-                try:
-                    dx = int(player.rect.centerx) - int(constants.STAGE_WIDTH // 2)
-                except Exception:
-                    dx = 0
-                shungoku_pan_target_px = int(max(-18, min(18, round(dx * 0.35))))
-
-        if can_play_round:
-            early = int(getattr(constants, "COMMAND_BUTTON_EARLY_FRAMES", 2))
-            super_cost = int(getattr(constants, "POWER_GAUGE_SUPER_COST", 500))
-
-            res1 = p1.process_special_inputs(attack_id=p1_attack_id, early_frames=early, super_cost=super_cost)
+        if can_play_round and should_update:
+            p1_input.move_x = p1_move_x
+            p1_input.jump_pressed = p1_jump_pressed
+            p1_input.crouch = p1_crouch
+            p1_input.attack_id = p1_attack_id
+            p1.apply_input(p1_input)
+            p2_input.move_x = p2_move_x
+            p2_input.jump_pressed = p2_jump_pressed
+            p2_input.crouch = p2_crouch
+            p2_input.attack_id = p2_attack_id
+            p2.apply_input(p2_input)
+
+        if can_play_round and should_update:
+            res1 = p1.process_special_inputs(attack_id=p1_attack_id, early_frames=_COMMAND_BUTTON_EARLY_FRAMES, super_cost=_SUPER_COST)
             _apply_special_results(res1, side=1, player=p1)
-            if bool(res1.get("clear_attack_id")):
+            if res1.clear_attack_id:
                 p1_attack_id = None
 
-            res2 = p2.process_special_inputs(attack_id=p2_attack_id, early_frames=early, super_cost=super_cost)
+            res2 = p2.process_special_inputs(attack_id=p2_attack_id, early_frames=_COMMAND_BUTTON_EARLY_FRAMES, super_cost=_SUPER_COST)
             _apply_special_results(res2, side=2, player=p2)
-            if bool(res2.get("clear_attack_id")):
+            if res2.clear_attack_id:
                 p2_attack_id = None
 
-        if int(shungoku_super_se_cooldown) > 0:
-            shungoku_super_se_cooldown = max(0, int(shungoku_super_se_cooldown) - 1)
-
-        # フレームポーズ中は更新をスキップ（フレーム進行時は例外）
-        should_update = not frame_paused or frame_advance
-        if frame_advance:
-            frame_advance = False  # 1フレーム進めたらリセット
+        if shungoku_super_se_cooldown > 0 and should_update:
+            shungoku_super_se_cooldown = max(0, shungoku_super_se_cooldown - 1)
 
         # 物理更新（KO中/カウント中でもアニメは進める）。
         if shungoku_cine_frames_left <= 0 and should_update:
@@ -2042,47 +2440,12 @@ def main() -> None:
 
             # Kキー攻撃の砂ぼこりエフェクト（6540）スポーン（攻撃判定あり）
             if assets.k_attack_dust_frames:
-                from src.entities.effect import AttackEffect
-                k_info = p1.consume_k_attack_effect_spawn()
-                if k_info is not None:
-                    effects.append(AttackEffect(
-                        frames=assets.k_attack_dust_frames,
-                        pos=k_info["pos"],
-                        frames_per_image=2,
-                        owner_side=k_info["owner_side"],
-                        damage=80,
-                        hitbox_width=100,
-                        hitbox_height=60,
-                        hitbox_offset_x=0,
-                        hitbox_offset_y=30,  # 地面に接地（ヒットボックスの下半分を地面に配置）
-                        startup_frames=2,
-                        active_frames=10,
-                        hitstop_frames=8,
-                        hitstun_frames=15,
-                        blockstun_frames=8,
-                        knockback_px=20,
-                        attacker_recoil_px=2,
-                    ))
-                k_info = p2.consume_k_attack_effect_spawn()
-                if k_info is not None:
-                    effects.append(AttackEffect(
-                        frames=assets.k_attack_dust_frames,
-                        pos=k_info["pos"],
-                        frames_per_image=2,
-                        owner_side=k_info["owner_side"],
-                        damage=80,
-                        hitbox_width=100,
-                        hitbox_height=60,
-                        hitbox_offset_x=0,
-                        hitbox_offset_y=30,  # 地面に接地（ヒットボックスの下半分を地面に配置）
-                        startup_frames=2,
-                        active_frames=10,
-                        hitstop_frames=8,
-                        hitstun_frames=15,
-                        blockstun_frames=8,
-                        knockback_px=20,
-                        attacker_recoil_px=2,
-                    ))
+                for player in (p1, p2):
+                    k_info = player.consume_k_attack_effect_spawn()
+                    if k_info is not None:
+                        k_effect = _spawn_k_attack(k_info, assets.k_attack_dust_frames)
+                        effects.append(k_effect)
+                        attack_effects.append(k_effect)
 
             if p1.consume_hadoken_spawn():
                 projectile_system.spawn_hadoken(p1, p1=p1, p2=p2)
@@ -2105,12 +2468,23 @@ def main() -> None:
             if end_side_2 == 2:
                 p2.reset_combo_count()
 
-            # エフェクト更新。
+            # エフェクト更新。終わったものは同じ走査の中で詰めて取り除く（リストは作り直さない）。
+            alive = 0
             for e in effects:
                 e.update()
-            effects = [e for e in effects if not e.finished]
-
-            if game_state in {GameState.BATTLE, GameState.TRAINING}:
+                if not e.finished:
+                    effects[alive] = e
+                    alive += 1
+            del effects[alive:]
+            if attack_effects:
+                alive = 0
+                for e in attack_effects:
+                    if not e.finished:
+                        attack_effects[alive] = e
+                        alive += 1
+                del attack_effects[alive:]
+
+            if game_state in _IN_PLAY_STATES:
                 stage_renderer.update_rain()
 
             projectile_system.update()
@@ -2118,15 +2492,18 @@ def main() -> None:
             # 押し合い（Pushbox）解決。
             shungoku_active = (
                 shungoku_cine_frames_left > 0
-                or bool(getattr(p1, "_shungoku_active", False))
-                or bool(getattr(p2, "_shungoku_active", False))
+                or p1._shungoku_active
+                or p2._shungoku_active
             )
             CollisionSystem.resolve_pushbox_overlap(p1, p2, shungoku_active=shungoku_active)
 
         # ポーズ中は以下の判定もスキップ
         if should_update:
+            # 攻撃側/防御側の組み合わせ。投げと通常ヒットの両方で使う。
+            player_pairs = ((p1, p2), (p2, p1))
+
             # 投げ技のヒット判定（通常攻撃より優先）
-            for attacker, defender in ((p1, p2), (p2, p1)):
+            for attacker, defender in player_pairs:
                 if attacker.is_throw_active():
                     throw_hitbox = attacker.get_throw_hitbox()
                     defender_hurtbox = defender.get_hurtbox()
@@ -2164,8 +2541,7 @@ def main() -> None:
                         defender.hitstun_timer = throw_anim_frames
                         
                         # ダメージを与える
-                        throw_damage = int(getattr(constants, "THROW_DAMAGE", 100))
-                        defender.hp = max(0, defender.hp - throw_damage)
+                        defender.hp = max(0, defender.hp - _THROW_DAMAGE)
                         
                         # ヒットストップ
                         hitstop = 10
@@ -2180,7 +2556,7 @@ def main() -> None:
                         break
             
             # ヒット判定（Hitbox vs Hurtbox）。
-            for attacker, defender in ((p1, p2), (p2, p1)):
+            for attacker, defender in player_pairs:
                 hit_point = CollisionSystem.check_hit_collision(attacker, defender)
                 if hit_point is not None:
                     result = combat_system.apply_hit(
@@ -2212,10 +2588,7 @@ def main() -> None:
                 frame_meter_adv_attacker_side = projectile_hit_result["frame_meter_adv_attacker_side"]
 
             # AttackEffectのヒット判定（砂ぼこりエフェクトなど）
-            from src.entities.effect import AttackEffect
-            for effect in effects:
-                if not isinstance(effect, AttackEffect):
-                    continue
+            for effect in attack_effects:
                 if not effect.can_deal_damage():
                     continue
                 
@@ -2224,31 +2597,22 @@ def main() -> None:
                 defender = p2 if effect.owner_side == 1 else p1
                 
                 # ダウン中は無敵
-                if bool(getattr(defender, "_down_anim_active", False)) or bool(getattr(defender, "_ko_down_anim_active", False)):
+                if defender._down_anim_active or defender._ko_down_anim_active:
                     continue
                 
                 effect_hitbox = effect.get_hitbox()
                 if effect_hitbox is None:
                     continue
                 
-                # 防御側のハートボックスと衝突判定
-                defender_hurtboxes = defender.get_hurtboxes()
-                hit_detected = False
-                for hurtbox in defender_hurtboxes:
-                    if effect_hitbox.colliderect(hurtbox):
-                        hit_detected = True
-                        break
-                
-                if not hit_detected:
+                # 防御側のハートボックスと衝突判定（走査は Rect.collidelist に任せる）
+                if effect_hitbox.collidelist(defender.get_hurtboxes()) == -1:
                     continue
                 
                 # ヒット処理
                 effect.register_hit()
                 
                 # ガード判定
-                is_guarding = bool(getattr(defender, "can_guard_now", lambda: False)()) and bool(
-                    getattr(defender, "is_guarding_intent", lambda: False)()
-                )
+                is_guarding = defender.can_guard_now() and defender.is_guarding_intent()
                 if game_state == GameState.TRAINING and training_p2_all_guard and (defender is p2):
                     is_guarding = True
                 
@@ -2261,11 +2625,9 @@ def main() -> None:
                     defender.knockback_vx = -float(defender.facing) * float(knockback) * 0.3
                     
                     # ガードエフェクト
-                    from src.entities.effect import StaticImageBurstEffect
-                    guard_img = getattr(constants, "GUARD_EFFECT_IMAGE", None)
-                    if guard_img is not None:
+                    if _GUARD_EFFECT_IMAGE is not None:
                         effects.append(StaticImageBurstEffect(
-                            image=guard_img,
+                            image=_GUARD_EFFECT_IMAGE,
                             pos=hit_point,
                             total_frames=8,
                             start_scale=1.0,
@@ -2283,11 +2645,9 @@ def main() -> None:
                     defender.knockback_vx = -float(defender.facing) * float(knockback)
                     
                     # ヒットエフェクト
-                    from src.entities.effect import StaticImageBurstEffect
-                    hit_img = getattr(constants, "HIT_EFFECT_IMAGE", None)
-                    if hit_img is not None:
+                    if _HIT_EFFECT_IMAGE is not None:
                         effects.append(StaticImageBurstEffect(
-                            image=hit_img,
+                            image=_HIT_EFFECT_IMAGE,
                             pos=hit_point,
                             total_frames=10,
                             start_scale=1.2,
@@ -2335,7 +2695,7 @@ def main() -> None:
 
             stage_renderer.draw_background(
                 stage_surface,
-                tick_ms=int(tick_ms),
+                tick_ms=tick_ms,
                 stage_bg_frames=stage_bg_frames,
                 stage_bg_img=(stage_bg_override_img or stage_bg_img),
             )
@@ -2343,178 +2703,152 @@ def main() -> None:
             stage_renderer.draw_rain(stage_surface)
 
             # グリッド表示（トレーニングモード専用）
-            if game_state == GameState.TRAINING and debug_show_grid:
+            if game_state == GameState.TRAINING and debug_flags["debug_show_grid"]:
                 hud_renderer.draw_grid(stage_surface)
 
             # 地面ライン（目印）。
-            pygame.draw.line(
-                stage_surface,
-                (80, 80, 80),
-                (0, constants.GROUND_Y),
-                (constants.STAGE_WIDTH, constants.GROUND_Y),
-                2,
-            )
+            stage_surface.blit(ground_line, (0, constants.GROUND_Y))
 
         # キャラクター描画（内部でデバッグ枠線も描画）。
         if shungoku_cine_frames_left <= 0:
-            shungoku_bg_active = (stage_bg_override_img is not None) and (stage_bg_override_img is assets.shungoku_stage_bg_img)
-            if shungoku_bg_active and int(shungoku_ko_anim_side) in {1, 2}:
+            # 瞬獄殺KO演出中か（背景が瞬獄殺用に差し替わっていて、倒れた側が決まっている）。普段は False。
+            ko_anim_active = (
+                stage_bg_override_img is not None
+                and stage_bg_override_img is assets.shungoku_stage_bg_img
+                and shungoku_ko_anim_side in (1, 2)
+            )
+            if ko_anim_active:
                 shungoku_ko_anim_tick += 1
-                if int(shungoku_ko_anim_tick) >= int(shungoku_ko_anim_frames_per_image):
+                if shungoku_ko_anim_tick >= shungoku_ko_anim_frames_per_image:
                     shungoku_ko_anim_tick = 0
-                    if int(shungoku_ko_anim_idx) < 16:
+                    if shungoku_ko_anim_idx < 16:
                         shungoku_ko_anim_idx += 1
                     else:
                         shungoku_ko_anim_idx = 10
 
             def _draw_shungoku_ko_anim(pl: Player) -> bool:
-                if not (shungoku_bg_active and int(shungoku_ko_anim_side) in {1, 2}):
+                if not ko_anim_active:
                     return False
-                if (int(shungoku_ko_anim_side) == 1 and pl is not p1) or (int(shungoku_ko_anim_side) == 2 and pl is not p2):
+                if (shungoku_ko_anim_side == 1 and pl is not p1) or (shungoku_ko_anim_side == 2 and pl is not p2):
                     return False
-                idx = max(1, min(16, int(shungoku_ko_anim_idx)))
-                key = (5400, int(idx))
-                img = getattr(pl, "_sprites", {}).get(key)
+                idx = max(1, min(16, shungoku_ko_anim_idx))
+                img = shungoku_ko_sprites.get((shungoku_ko_anim_side, idx, -1 if pl.facing < 0 else 1))
                 if img is None:
                     return False
-                x = int(pl.rect.centerx) - (img.get_width() // 2)
-                y = int(pl.rect.bottom) - img.get_height()
-                if int(getattr(pl, "facing", 1)) < 0:
-                    img = pygame.transform.flip(img, True, False)
+                x = pl.rect.centerx - (img.get_width() // 2)
+                y = pl.rect.bottom - img.get_height()
                 stage_surface.blit(img, (x, y))
                 return True
 
             drew_p1 = _draw_shungoku_ko_anim(p1)
             drew_p2 = _draw_shungoku_ko_anim(p2)
             if not drew_p1:
-                p1.draw(stage_surface, debug_draw=debug_draw)
+                p1.draw(stage_surface, debug_draw=debug_flags["debug_draw"])
             if not drew_p2:
-                p2.draw(stage_surface, debug_draw=debug_draw)
+                p2.draw(stage_surface, debug_draw=debug_flags["debug_draw"])
 
         # ヒットボックス情報表示（トレーニングモード専用、プレイヤーの後）
-        if game_state == GameState.TRAINING and debug_show_grid and debug_draw:
+        if game_state == GameState.TRAINING and debug_flags["debug_show_grid"] and debug_flags["debug_draw"]:
             hud_renderer.draw_hitbox_info(stage_surface, p1=p1, p2=p2)
 
         # エフェクト描画（キャラより手前）。
+        # 通常の Effect と StaticImageBurstEffect（加算合成）は fblits でまとめて描画する。
+        # 合成モードが変わるところと、特殊な描画が必要なものの直前で吐き出して描画順を保つ。
+        # ステージのクリップ範囲外に出たものは blit 列に積まない。
+        stage_clip = stage_surface.get_clip()
+        effect_blits: list[tuple[pygame.Surface, tuple[int, int]]] = []
+        effect_blit_flags = 0
         for e in effects:
+            e_type = type(e)
+            if e_type is Effect or e_type is StaticImageBurstEffect:
+                item = e.get_blit()
+                if item is None or not stage_clip.colliderect(item[0].get_rect(topleft=item[1])):
+                    continue
+                flags = pygame.BLEND_RGBA_ADD if e_type is StaticImageBurstEffect else 0
+                if flags != effect_blit_flags:
+                    if effect_blits:
+                        stage_surface.fblits(effect_blits, effect_blit_flags)
+                        effect_blits.clear()
+                    effect_blit_flags = flags
+                effect_blits.append(item)
+                continue
+            if effect_blits:
+                stage_surface.fblits(effect_blits, effect_blit_flags)
+                effect_blits.clear()
             # AttackEffectの場合はdebug_drawフラグを渡す
-            from src.entities.effect import AttackEffect
-            if isinstance(e, AttackEffect):
-                e.draw(stage_surface, debug_draw=debug_draw)
+            if e_type is AttackEffect:
+                e.draw(stage_surface, debug_draw=debug_flags["debug_draw"])
             else:
                 e.draw(stage_surface)
+        if effect_blits:
+            stage_surface.fblits(effect_blits, effect_blit_flags)
 
         projectile_system.draw_all(stage_surface)
 
         if game_state == GameState.TRAINING:
-            if bool(training_auto_recover_hp):
-                p1_target = int(round(p1.max_hp * (float(training_hp_percent_p1) / 100.0)))
-                p2_target = int(round(p2.max_hp * (float(training_hp_percent_p2) / 100.0)))
-                if int(getattr(p1, "hp", 0)) < int(p1_target):
-                    p1.hp = int(p1_target)
-                if int(getattr(p2, "hp", 0)) < int(p2_target):
-                    p2.hp = int(p2_target)
-            if bool(training_auto_recover_sp):
-                max_sp = int(getattr(constants, "POWER_GAUGE_MAX", 1000))
-                p1_target_sp = int(round(max_sp * (float(training_sp_percent_p1) / 100.0)))
-                p2_target_sp = int(round(max_sp * (float(training_sp_percent_p2) / 100.0)))
-                if int(getattr(p1, "power_gauge", 0)) < int(p1_target_sp):
-                    p1.power_gauge = int(p1_target_sp)
-                if int(getattr(p2, "power_gauge", 0)) < int(p2_target_sp):
-                    p2.power_gauge = int(p2_target_sp)
-
-        if game_state == GameState.TRAINING and bool(frame_meter_enabled):
-            def _classify(pl: Player, *, synth_fc: int) -> FrameState:
-                if shungoku_cine_frames_left > 0 and (
-                    (shungoku_attacker_side == 1 and pl is p1)
-                    or (shungoku_attacker_side == 2 and pl is p2)
-                ):
-                    return FrameState.SPECIAL
-                if int(getattr(pl, "hitstun_frames_left", 0)) > 0 or int(getattr(pl, "blockstun_frames_left", 0)) > 0:
-                    return FrameState.STUN
-                if bool(getattr(pl, "in_hitstun", False)) or bool(getattr(pl, "in_blockstun", False)):
-                    return FrameState.STUN
-
-                info = pl.get_last_move_frame_info()
-                oneshot_playing = (
-                    (pl.get_current_action_id() is not None)
-                    and (str(getattr(pl, "_action_mode", "")) == "oneshot")
-                    and (not bool(getattr(pl, "_action_finished", False)))
+            if training_auto_recover_hp:
+                p1.hp = max(p1.hp, training_hp_target_p1)
+                p2.hp = max(p2.hp, training_hp_target_p2)
+            if training_auto_recover_sp:
+                p1.power_gauge = max(p1.power_gauge, training_sp_target_p1)
+                p2.power_gauge = max(p2.power_gauge, training_sp_target_p2)
+
+        if game_state == GameState.TRAINING and debug_flags["frame_meter_enabled"]:
+            # ポーズ中は合成フレームカウンタを進めない（ヒットストップ扱いで増え続けてしまうため）。
+            if should_update:
+                frame_meter_last_action_id_p1, frame_meter_last_action_fc_p1, frame_meter_synth_action_fc_p1 = _update_frame_meter_counter(
+                    pl=p1,
+                    last_action_id=frame_meter_last_action_id_p1,
+                    last_fc=frame_meter_last_action_fc_p1,
+                    synth_fc=frame_meter_synth_action_fc_p1,
+                )
+                frame_meter_last_action_id_p2, frame_meter_last_action_fc_p2, frame_meter_synth_action_fc_p2 = _update_frame_meter_counter(
+                    pl=p2,
+                    last_action_id=frame_meter_last_action_id_p2,
+                    last_fc=frame_meter_last_action_fc_p2,
+                    synth_fc=frame_meter_synth_action_fc_p2,
                 )
-                is_rushing = bool(getattr(pl, "is_rushing", lambda: False)())
-                is_attack_like = bool(getattr(pl, "attacking", False)) or bool(oneshot_playing) or bool(is_rushing)
-                if is_attack_like and (info is not None):
-                    f0 = max(0, int(synth_fc) - 1)
-                    if f0 < int(getattr(info, "startup_frames", 0)):
-                        return FrameState.STARTUP
-                    if f0 < (int(getattr(info, "startup_frames", 0)) + int(getattr(info, "active_frames", 0))):
-                        return FrameState.ACTIVE
-                    if f0 < int(getattr(info, "total_frames", 0)):
-                        return FrameState.RECOVERY
-                return FrameState.IDLE
-
-            def _update_synth_counter(
-                *,
-                pl: Player,
-                last_action_id: int | None,
-                last_fc: int,
-                synth_fc: int,
-            ) -> tuple[int | None, int, int]:
-                now_aid = pl.get_current_action_id()
-                now_fc = int(pl.get_action_frame_counter())
-                hitstop = int(getattr(pl, "hitstop_frames_left", 0)) > 0
-                if now_aid is None:
-                    return None, int(now_fc), int(now_fc)
-                if last_action_id is None or int(now_aid) != int(last_action_id):
-                    return int(now_aid), int(now_fc), int(now_fc)
-                if hitstop and int(now_fc) == int(last_fc):
-                    return int(last_action_id), int(now_fc), int(synth_fc) + 1
-                return int(last_action_id), int(now_fc), int(now_fc)
-
-            frame_meter_last_action_id_p1, frame_meter_last_action_fc_p1, frame_meter_synth_action_fc_p1 = _update_synth_counter(
-                pl=p1,
-                last_action_id=frame_meter_last_action_id_p1,
-                last_fc=frame_meter_last_action_fc_p1,
+
+            shungoku_cinematic = shungoku_cine_frames_left > 0
+            s1 = _classify_frame_state(
+                p1,
                 synth_fc=frame_meter_synth_action_fc_p1,
+                in_shungoku_cinematic=shungoku_cinematic and shungoku_attacker_side == 1,
             )
-            frame_meter_last_action_id_p2, frame_meter_last_action_fc_p2, frame_meter_synth_action_fc_p2 = _update_synth_counter(
-                pl=p2,
-                last_action_id=frame_meter_last_action_id_p2,
-                last_fc=frame_meter_last_action_fc_p2,
+            s2 = _classify_frame_state(
+                p2,
                 synth_fc=frame_meter_synth_action_fc_p2,
+                in_shungoku_cinematic=shungoku_cinematic and shungoku_attacker_side == 2,
             )
+            hs1 = p1.hitstop_frames_left > 0
+            hs2 = p2.hitstop_frames_left > 0
+
+            p1_combo = p1.is_in_combo
+            p2_combo = p2.is_in_combo
+            combo_overlap_p1 = s1 is _FS_ACTIVE and s2 is _FS_STUN and p2_combo
+            combo_overlap_p2 = s2 is _FS_ACTIVE and s1 is _FS_STUN and p1_combo
+
+            # メーターへの記録はシミュレーションが進んだフレームだけ行う。
+            if should_update:
+                if s1 is not _FS_IDLE or s2 is not _FS_IDLE:
+                    frame_meter_paused = False
+                    frame_meter_idle_run = 0
+                else:
+                    frame_meter_idle_run += 1
+                    if frame_meter_idle_run >= _FRAME_METER_IDLE_PAUSE_FRAMES:
+                        frame_meter_paused = True
 
-            s1 = _classify(p1, synth_fc=frame_meter_synth_action_fc_p1)
-            s2 = _classify(p2, synth_fc=frame_meter_synth_action_fc_p2)
-            hs1 = int(getattr(p1, "hitstop_frames_left", 0)) > 0
-            hs2 = int(getattr(p2, "hitstop_frames_left", 0)) > 0
-
-            p1_combo = bool(getattr(p1, "is_in_combo", False))
-            p2_combo = bool(getattr(p2, "is_in_combo", False))
-            combo_overlap_p1 = (s1 == FrameState.ACTIVE) and (s2 == FrameState.STUN) and p2_combo
-            combo_overlap_p2 = (s2 == FrameState.ACTIVE) and (s1 == FrameState.STUN) and p1_combo
-
-            any_non_idle = (s1 != FrameState.IDLE) or (s2 != FrameState.IDLE)
-            any_hitstop = bool(hs1 or hs2)
-            if any_non_idle:
-                frame_meter_paused = False
-                frame_meter_idle_run = 0
-            else:
-                frame_meter_idle_run = int(frame_meter_idle_run) + 1
-                if int(frame_meter_idle_run) >= 20:
-                    frame_meter_paused = True
-
-            if any_hitstop:
-                frame_meter_paused = False
+                if hs1 or hs2:
+                    frame_meter_paused = False
 
-            if not frame_meter_paused:
-                frame_meter_p1.push(FrameSample(state=s1, hitstop=bool(hs1), combo=bool(combo_overlap_p1)))
-                frame_meter_p2.push(FrameSample(state=s2, hitstop=bool(hs2), combo=bool(combo_overlap_p2)))
+                if not frame_meter_paused:
+                    frame_meter_p1.push(_FRAME_SAMPLES[s1, hs1, combo_overlap_p1])
+                    frame_meter_p2.push(_FRAME_SAMPLES[s2, hs2, combo_overlap_p2])
 
-            frame_meter_adv_frames_left = max(0, int(frame_meter_adv_frames_left) - 1)
-            if frame_meter_adv_frames_left <= 0:
-                frame_meter_adv_value = None
-                frame_meter_adv_attacker_side = 0
+                frame_meter_adv_frames_left = max(0, frame_meter_adv_frames_left - 1)
+                if frame_meter_adv_frames_left <= 0:
+                    frame_meter_adv_value = None
+                    frame_meter_adv_attacker_side = 0
 
             hud_renderer.draw_frame_meter(
                 stage_surface,
@@ -2523,8 +2857,8 @@ def main() -> None:
                 adv_value=frame_meter_adv_value,
                 adv_frames_left=frame_meter_adv_frames_left,
                 adv_attacker_side=frame_meter_adv_attacker_side,
-                combo_overlap_p1=bool(combo_overlap_p1),
-                combo_overlap_p2=bool(combo_overlap_p2),
+                combo_overlap_p1=combo_overlap_p1,
+                combo_overlap_p2=combo_overlap_p2,
             )
 
         if game_state == GameState.TRAINING:
@@ -2532,9 +2866,9 @@ def main() -> None:
                 stage_surface,
                 p1=p1,
                 p2=p2,
-                show_key_history=bool(debug_ui_show_key_history),
-                show_p1_frames=bool(debug_ui_show_p1_frames),
-                show_p2_frames=bool(debug_ui_show_p2_frames),
+                show_key_history=debug_flags["debug_ui_show_key_history"],
+                show_p1_frames=debug_flags["debug_ui_show_p1_frames"],
+                show_p2_frames=debug_flags["debug_ui_show_p2_frames"],
                 key_history=p1_key_history,
             )
 
@@ -2543,7 +2877,7 @@ def main() -> None:
         p1_hp = float(p1.hp)
         p2_hp = float(p2.hp)
 
-        if game_state == GameState.BATTLE and int(round_over_frames_left) <= 0:
+        if game_state == GameState.BATTLE and round_over_frames_left <= 0:
             if p1_hp <= 0 and p2_hp > 0:
                 round_over_frames_left = int(constants.FPS * 2)
                 round_over_winner_side = 2
@@ -2558,13 +2892,15 @@ def main() -> None:
                 p1.enter_knockdown()
                 p2.enter_knockdown()
 
-        if p1_chip_hp < p1_hp:
+        # チップが現在HPに追いついている（ほとんどのフレーム）なら補間は不要。
+        if p1_chip_hp <= p1_hp:
             p1_chip_hp = p1_hp
-        if p2_chip_hp < p2_hp:
+        else:
+            p1_chip_hp += (p1_hp - p1_chip_hp) * _HP_BAR_DAMAGE_LERP
+        if p2_chip_hp <= p2_hp:
             p2_chip_hp = p2_hp
-
-        p1_chip_hp += (p1_hp - p1_chip_hp) * constants.HP_BAR_DAMAGE_LERP
-        p2_chip_hp += (p2_hp - p2_chip_hp) * constants.HP_BAR_DAMAGE_LERP
+        else:
+            p2_chip_hp += (p2_hp - p2_chip_hp) * _HP_BAR_DAMAGE_LERP
 
         hud_renderer.draw_hp_bars(
             stage_surface,
@@ -2576,115 +2912,98 @@ def main() -> None:
             p2_max_hp=float(p2.max_hp),
         )
 
-        if game_state in {GameState.BATTLE, GameState.TRAINING}:
+        if game_state in _IN_PLAY_STATES:
             hud_renderer.draw_round_markers(
                 stage_surface,
                 p1_wins=p1_round_wins,
                 p2_wins=p2_round_wins,
-                tick_ms=int(tick_ms),
+                tick_ms=tick_ms,
             )
 
-        # Round timer (top center)
-        if game_state in {GameState.BATTLE, GameState.TRAINING}:
+            # Round timer (top center)
             if (
                 game_state == GameState.BATTLE
+                and should_update
                 and round_timer_frames_left is not None
-                and int(round_over_frames_left) <= 0
-                and int(battle_countdown_frames_left) <= 0
+                and round_over_frames_left <= 0
+                and battle_countdown_frames_left <= 0
             ):
-                round_timer_frames_left = max(0, int(round_timer_frames_left) - 1)
+                round_timer_frames_left = max(0, round_timer_frames_left - 1)
 
             if game_state == GameState.TRAINING:
                 timer_text = "∞"
             else:
-                left = 0 if round_timer_frames_left is None else int(round_timer_frames_left)
-                sec = int(math.ceil(left / max(1, int(constants.FPS))))
-                timer_text = "TIME UP" if sec <= 0 else f"{sec:02d}"
+                left = 0 if round_timer_frames_left is None else round_timer_frames_left
+                sec = (left + _FPS - 1) // _FPS
+                timer_text = _TIMER_TEXTS[sec] if sec < len(_TIMER_TEXTS) else f"{sec:02d}"
 
             hud_renderer.draw_timer(stage_surface, timer_text=timer_text)
 
         # Pre-round countdown (Battle only)
-        if game_state == GameState.BATTLE and int(round_over_frames_left) <= 0 and int(battle_countdown_frames_left) > 0:
-            battle_countdown_frames_left = max(0, int(battle_countdown_frames_left) - 1)
-            sec_left = int(math.ceil(int(battle_countdown_frames_left) / max(1, int(constants.FPS))))
+        if game_state == GameState.BATTLE and round_over_frames_left <= 0 and battle_countdown_frames_left > 0:
+            if should_update:
+                battle_countdown_frames_left = max(0, battle_countdown_frames_left - 1)
+            sec_left = (battle_countdown_frames_left + _FPS - 1) // _FPS
             show = max(1, sec_left)
 
-            if battle_countdown_last_announce != int(show):
-                battle_countdown_last_announce = int(show)
-                if int(show) == 3 and countdown_se_3 is not None:
+            if battle_countdown_last_announce != show:
+                battle_countdown_last_announce = show
+                if show == 3 and countdown_se_3 is not None:
                     countdown_se_3.play()
-                elif int(show) == 2 and countdown_se_2 is not None:
+                elif show == 2 and countdown_se_2 is not None:
                     countdown_se_2.play()
-                elif int(show) == 1 and countdown_se_1 is not None:
+                elif show == 1 and countdown_se_1 is not None:
                     countdown_se_1.play()
 
             hud_renderer.draw_countdown(stage_surface, number=show)
-        elif game_state == GameState.BATTLE and int(round_over_frames_left) <= 0 and int(battle_countdown_frames_left) == 0:
+        elif game_state == GameState.BATTLE and round_over_frames_left <= 0 and battle_countdown_frames_left == 0:
             if battle_countdown_last_announce is not None:
                 battle_countdown_last_announce = None
                 if countdown_se_go is not None:
                     countdown_se_go.play()
 
-        if int(round_over_frames_left) > 0:
-            round_over_frames_left = max(0, int(round_over_frames_left) - 1)
+        if round_over_frames_left > 0:
+            if should_update:
+                round_over_frames_left = max(0, round_over_frames_left - 1)
             hud_renderer.draw_ko(stage_surface)
 
-            if int(round_over_frames_left) == 0 and game_state == GameState.BATTLE:
-                if int(round_over_winner_side or 0) == 1:
+            if round_over_frames_left == 0 and game_state == GameState.BATTLE:
+                if round_over_winner_side == 1:
                     p1_round_wins += 1
-                elif int(round_over_winner_side or 0) == 2:
+                elif round_over_winner_side == 2:
                     p2_round_wins += 1
 
-                if int(p1_round_wins) >= 2 or int(p2_round_wins) >= 2:
+                if p1_round_wins >= 2 or p2_round_wins >= 2:
                     game_state = GameState.RESULT
                     menu_open = False
                     cmdlist_open = False
                     result_menu_selection = 0
-                    result_winner_side = 1 if int(p1_round_wins) >= 2 and int(p2_round_wins) < 2 else (2 if int(p2_round_wins) >= 2 and int(p1_round_wins) < 2 else None)
+                    result_winner_side = 1 if p1_round_wins >= 2 and p2_round_wins < 2 else (2 if p2_round_wins >= 2 and p1_round_wins < 2 else None)
                     result_anim_counter = 0
                     _ensure_bgm_for_state(game_state)
                 else:
                     reset_match()
 
         # Power gauge (super meter)
-        mx = float(getattr(constants, "POWER_GAUGE_MAX", 1000))
         hud_renderer.draw_power_gauges(
             stage_surface,
-            p1_power=float(getattr(p1, "power_gauge", 0)),
-            p2_power=float(getattr(p2, "power_gauge", 0)),
-            max_power=mx,
+            p1_power=p1.power_gauge,
+            p2_power=p2.power_gauge,
+            max_power=_POWER_GAUGE_MAX,
         )
 
         hud_renderer.draw_combo(stage_surface, p1=p1, p2=p2)
 
-        scaled = pygame.transform.smoothscale(stage_surface, (constants.SCREEN_WIDTH, constants.SCREEN_HEIGHT))
-
         pan_x = 0
-        if int(shungoku_pan_frames_left) > 0:
-            shungoku_pan_frames_left = max(0, int(shungoku_pan_frames_left) - 1)
-            t = float(int(shungoku_pan_total_frames) - int(shungoku_pan_frames_left)) / float(max(1, int(shungoku_pan_total_frames)))
-            if t < 0.5:
-                ease = t / 0.5
-            else:
-                ease = (1.0 - t) / 0.5
-            ease = max(0.0, min(1.0, float(ease)))
-            pan_x = int(round(-float(shungoku_pan_target_px) * float(ease)))
-        screen.blit(scaled, (int(pan_x), 0))
+        if shungoku_pan_frames_left > 0:
+            shungoku_pan_frames_left -= 1
+            pan_x = shungoku_pan_offsets[shungoku_pan_total_frames - shungoku_pan_frames_left]
+        _blit_stage_scaled(screen, pan_x)
 
         # ポーズ中の表示
-        if frame_paused and game_state in {GameState.BATTLE, GameState.TRAINING}:
-            try:
-                pause_font = pygame.font.Font(None, 48)
-                pause_text = pause_font.render("PAUSED (M: Resume / >: Frame Advance)", True, (255, 255, 0))
-                pause_rect = pause_text.get_rect(center=(constants.SCREEN_WIDTH // 2, 50))
-                # 半透明の背景
-                bg_surf = pygame.Surface((pause_rect.width + 20, pause_rect.height + 10))
-                bg_surf.set_alpha(180)
-                bg_surf.fill((0, 0, 0))
-                screen.blit(bg_surf, (pause_rect.x - 10, pause_rect.y - 5))
-                screen.blit(pause_text, pause_rect)
-            except Exception:
-                pass
+        if frame_paused and game_state in _IN_PLAY_STATES:
+            pause_rect = pause_text.get_rect(center=(constants.SCREEN_WIDTH // 2, 50))
+            screen.fblits(((pause_bg, (pause_rect.x - 10, pause_rect.y - 5)), (pause_text, pause_rect)))
 
         pygame.display.flip()
 
@@ -2692,6 +3011,7 @@ def main() -> None:
         clock.tick(constants.FPS)
 
     # 終了処理。
+    _flush_settings()
     pygame.quit()
 
 
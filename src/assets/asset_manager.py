@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+import hashlib
+import importlib.util
+import marshal
 import re
 from dataclasses import dataclass
 from pathlib import Path
@@ -7,6 +10,7 @@ from typing import Any
 
 import pygame
 
+from src.engine.settings import settings_path
 from src.entities.effect import Projectile
 from src.utils import constants
 from src.utils.paths import resource_path
@@ -35,9 +39,64 @@ class GameAssets:
     shungoku_stage_bg_img: pygame.Surface | None
 
 
+# AIR アクション表キャッシュの形式バージョン（中身の形を変えたら上げる）。
+_AIR_ACTIONS_CACHE_VERSION = 2
+
+
 class AssetManager:
     """ゲームアセットの読み込みと管理を行うクラス"""
     
+    @staticmethod
+    def _air_actions_cache_path(air_py: Path) -> Path:
+        """AIR アクション表キャッシュの保存先（設定ファイルと同じ書き込み可能な場所）"""
+        return settings_path().with_name(f"{settings_path().stem}.{air_py.stem}.cache")
+
+    @staticmethod
+    def load_air_actions(air_py: Path) -> list[dict[str, Any]] | None:
+        """
+        AIR から生成したアクション表（ACTIONS）を読み込む
+        
+        巨大な .py をモジュールとして実行するとバイトコード未生成時（PyInstaller の展開直後など）に
+        コンパイルで時間がかかるため、ソースのサイズと内容のハッシュが一致する間は marshal キャッシュから復元する。
+        onefile ビルドでは起動のたびに新しい場所へ展開され mtime が変わるので、mtime はキーに使わない。
+        パッチ適用前の素の ACTIONS を返す。
+        
+        Args:
+            air_py: ACTIONS を定義した .py ファイル
+            
+        Returns:
+            アクション辞書のリスト（読み込めない場合は None）
+        """
+        try:
+            source = air_py.read_bytes()
+        except OSError:
+            return None
+        key = (_AIR_ACTIONS_CACHE_VERSION, len(source), hashlib.blake2b(source, digest_size=16).digest())
+
+        cache_path = AssetManager._air_actions_cache_path(air_py)
+        try:
+            cached_key, cached_actions = marshal.loads(cache_path.read_bytes())
+            if tuple(cached_key) == key and isinstance(cached_actions, list):
+                return cached_actions
+        except Exception:
+            pass
+
+        spec = importlib.util.spec_from_file_location(air_py.stem, str(air_py))
+        if spec is None or spec.loader is None:
+            return None
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        actions = getattr(module, "ACTIONS", None)
+        if not isinstance(actions, list):
+            return None
+
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            cache_path.write_bytes(marshal.dumps((key, actions)))
+        except Exception:
+            pass
+        return actions
+
     @staticmethod
     def _scale_frames(frames: list[pygame.Surface] | None, *, scale: float) -> list[pygame.Surface] | None:
         """
@@ -258,7 +317,7 @@ class AssetManager:
         preferred_title_bg = resource_path("assets/images/Gemini_Generated_Image_897hvv897hvv897h.png")
         if preferred_title_bg.exists():
             try:
-                title_bg_img = pygame.image.load(str(preferred_title_bg)).convert_alpha()
+                title_bg_img = pygame.image.load(str(preferred_title_bg)).convert()
             except pygame.error:
                 title_bg_img = None
 
@@ -285,7 +344,7 @@ class AssetManager:
         stage_bg_path = resource_path("assets/images/stage/01.png")
         if stage_bg_path.exists():
             try:
-                stage_bg_img = pygame.image.load(str(stage_bg_path)).convert_alpha()
+                stage_bg_img = pygame.image.load(str(stage_bg_path)).convert()
             except pygame.error:
                 stage_bg_img = None
         return stage_bg_img
@@ -297,7 +356,7 @@ class AssetManager:
         shungoku_stage_path = resource_path(Path("assets/images/stage/瞬獄殺.png"))
         if shungoku_stage_path.exists():
             try:
-                shungoku_stage_bg_img = pygame.image.load(str(shungoku_stage_path)).convert_alpha()
+                shungoku_stage_bg_img = pygame.image.load(str(shungoku_stage_path)).convert()
             except pygame.error:
                 shungoku_stage_bg_img = None
         return shungoku_stage_bg_img
@@ -326,7 +385,7 @@ class AssetManager:
         rush_dust_frames = AssetManager._load_rush_dust_frames(p1, p2)
         k_attack_dust_frames = AssetManager._load_k_attack_dust_frames(p1, p2)
         
-        # 背景画像
+        # 背景画像（不透明な一枚絵は convert() でαブレンド無しの高速経路に乗せる）
         title_bg_img = AssetManager._load_title_bg()
         stage_bg_img = AssetManager._load_stage_bg()
         shungoku_stage_bg_img = AssetManager._load_shungoku_stage_bg()
@@ -8,14 +8,71 @@ from src.engine.context import GameState
 from src.utils.paths import resource_path
 
 
+# 連打されやすい SE 用に予約するチャンネル番号。
+_CHANNEL_MENU = 0
+_CHANNEL_HIT = 1
+_CHANNEL_GUARD = 2
+_RESERVED_CHANNELS = 3
+
+
+class ChannelSound:
+    """専用チャンネルで鳴らす SE。
+
+    空きチャンネルの探索を省き、同じ種類の SE は新しいもので上書きする。
+    同じ tick 内での重複再生（キーリピート等）は 1 回にまとめる。
+    """
+
+    def __init__(self, sound: pygame.mixer.Sound, channel: pygame.mixer.Channel) -> None:
+        self.sound = sound
+        self.channel = channel
+        self._last_play_ms = -1
+
+    def play(self) -> None:
+        now = pygame.time.get_ticks()
+        if now == self._last_play_ms:
+            return
+        self._last_play_ms = now
+        self.channel.play(self.sound)
+
+    def stop(self) -> None:
+        self.channel.stop()
+
+    def set_volume(self, value: float) -> None:
+        self.sound.set_volume(value)
+
+
+class NullSound:
+    """読み込めなかった SE の代わりに置く、何もしない Sound。
+
+    呼び出し側で毎回 None チェックをしなくて済むようにする。
+    """
+
+    def play(self) -> None:
+        pass
+
+    def stop(self) -> None:
+        pass
+
+    def set_volume(self, value: float) -> None:
+        pass
+
+
+NULL_SOUND = NullSound()
+
+
 class SoundManager:
     """サウンドエフェクトとBGMの読み込み・管理を担当するクラス。"""
 
     def __init__(self) -> None:
         # SE読み込み
-        self.start_se = self._load_sound_any(["start.wav", "start.ogg", "start.mp3"])
-        self.menu_confirm_se = self._load_sound(Path("assets/sounds/SE/決定ボタンを押す15.mp3"))
-        self.menu_move_se = self._load_sound(Path("assets/sounds/SE/カーソル移動8.mp3"))
+        # メニュー系 SE は読み込めなくても NULL_SOUND にして、常に .play() できるようにする。
+        self.start_se = self._or_null(self._load_sound_any(["start.wav", "start.ogg", "start.mp3"]))
+        self.menu_confirm_se = self._or_null(
+            self._bind_channel(self._load_sound(Path("assets/sounds/SE/決定ボタンを押す15.mp3")), _CHANNEL_MENU)
+        )
+        self.menu_move_se = self._or_null(
+            self._bind_channel(self._load_sound(Path("assets/sounds/SE/カーソル移動8.mp3")), _CHANNEL_MENU)
+        )
         
         # カウントダウンSE
         self.countdown_se_3 = self._load_sound(Path("assets/sounds/SE/「3」.mp3"))
@@ -25,8 +82,8 @@ class SoundManager:
         
         # 戦闘SE
         self.beam_se = self._load_sound(Path("assets/sounds/SE/ビーム改.mp3"))
-        self.hit_se = self._load_sound(Path("assets/sounds/SE/打撃1.mp3"))
-        self.guard_se = self._load_sound(Path("assets/sounds/SE/ガード.wav"))
+        self.hit_se = self._bind_channel(self._load_sound(Path("assets/sounds/SE/打撃1.mp3")), _CHANNEL_HIT)
+        self.guard_se = self._bind_channel(self._load_sound(Path("assets/sounds/SE/ガード.wav")), _CHANNEL_GUARD)
         
         # 瞬獄殺SE
         self.shungoku_ko_se = self._load_sound(Path("assets/sounds/SE/瞬獄殺.mp3"))
@@ -56,6 +113,25 @@ class SoundManager:
         except pygame.error:
             return None
 
+    @staticmethod
+    def _or_null(sound: pygame.mixer.Sound | ChannelSound | None) -> pygame.mixer.Sound | ChannelSound | NullSound:
+        """None の代わりに NULL_SOUND を返す。"""
+        return NULL_SOUND if sound is None else sound
+
+    @staticmethod
+    def _bind_channel(sound: pygame.mixer.Sound | None, channel_id: int) -> ChannelSound | None:
+        """SE を予約済みチャンネルに割り当てる。ミキサーが使えなければ None。"""
+        if sound is None:
+            return None
+        try:
+            if pygame.mixer.get_num_channels() < _RESERVED_CHANNELS + 8:
+                pygame.mixer.set_num_channels(_RESERVED_CHANNELS + 8)
+            # 予約したチャンネルは通常の Sound.play() からは使われない。
+            pygame.mixer.set_reserved(_RESERVED_CHANNELS)
+            return ChannelSound(sound, pygame.mixer.Channel(channel_id))
+        except pygame.error:
+            return None
+
     @staticmethod
     def _load_sound_any(candidates: list[str]) -> pygame.mixer.Sound | None:
         """複数の候補から最初に見つかったサウンドを読み込む。"""
@@ -73,12 +149,9 @@ class SoundManager:
         """全SEに音量を適用する。"""
         vol = max(0.0, min(1.0, float(self.se_volume_level) / 100.0))
         try:
-            if self.start_se is not None:
-                self.start_se.set_volume(0.50 * vol)
-            if self.menu_confirm_se is not None:
-                self.menu_confirm_se.set_volume(0.55 * vol)
-            if self.menu_move_se is not None:
-                self.menu_move_se.set_volume(0.45 * vol)
+            self.start_se.set_volume(0.50 * vol)
+            self.menu_confirm_se.set_volume(0.55 * vol)
+            self.menu_move_se.set_volume(0.45 * vol)
             if self.countdown_se_3 is not None:
                 self.countdown_se_3.set_volume(0.22 * vol)
             if self.countdown_se_2 is not None:
@@ -46,9 +46,12 @@ class FrameSample:
 class FrameDataTracker:
     def __init__(self, *, max_frames: int) -> None:
         self._buf: deque[FrameSample] = deque(maxlen=max(1, int(max_frames)))
+        # push のたびに増える。描画側はこれが変わっていなければ前回の描画を使い回せる。
+        self.revision = 0
 
     def push(self, sample: FrameSample) -> None:
         self._buf.append(sample)
+        self.revision += 1
 
     def items(self) -> list[FrameSample]:
         return list(self._buf)
@@ -88,10 +88,9 @@ def load_keybinds(settings: dict[str, Any]) -> dict[str, int]:
     return keybinds
 
 
-def save_keybinds(settings: dict[str, Any], keybinds: dict[str, int]) -> None:
-    """キーバインドを settings dict に書き込みファイルへ保存する。"""
+def store_keybinds(settings: dict[str, Any], keybinds: dict[str, int]) -> None:
+    """キーバインドを settings dict に書き込む（ファイルへの保存は呼び出し側で行う）。"""
     settings["keybinds"] = dict(keybinds)
-    save_settings(settings)
 
 
 def key_name(code: int) -> str:
@@ -63,15 +63,21 @@ class Effect:
         if self._frame_index >= len(self.frames):
             self._finished = True
 
-    def draw(self, surface: pygame.Surface) -> None:
+    def get_blit(self) -> tuple[pygame.Surface, tuple[int, int]] | None:
+        """現在フレームの (Surface, 左上座標) を返す（fblits でまとめて描画する用）。"""
         if self._finished:
-            return
+            return None
         if self._frame_index < 0 or self._frame_index >= len(self.frames):
-            return
+            return None
 
         img = self.frames[self._frame_index]
         x, y = self.pos
-        surface.blit(img, (x - (img.get_width() // 2), y - (img.get_height() // 2)))
+        return img, (x - (img.get_width() // 2), y - (img.get_height() // 2))
+
+    def draw(self, surface: pygame.Surface) -> None:
+        item = self.get_blit()
+        if item is not None:
+            surface.blit(*item)
 
 
 @dataclass
@@ -99,9 +105,10 @@ class StaticImageBurstEffect:
         if int(self._frame) >= int(max(1, self.total_frames)):
             self._finished = True
 
-    def draw(self, surface: pygame.Surface) -> None:
+    def get_blit(self) -> tuple[pygame.Surface, tuple[int, int]] | None:
+        """現在フレームの (Surface, 左上座標) を返す（BLEND_RGBA_ADD の fblits でまとめて描画する用）。"""
         if self._finished:
-            return
+            return None
 
         total = int(max(1, self.total_frames))
         i = int(max(0, min(total - 1, self._frame)))
@@ -134,14 +141,12 @@ class StaticImageBurstEffect:
                 pass
 
         x, y = self.pos
-        try:
-            surface.blit(
-                img,
-                (x - (img.get_width() // 2), y - (img.get_height() // 2)),
-                special_flags=pygame.BLEND_RGBA_ADD,
-            )
-        except Exception:
-            surface.blit(img, (x - (img.get_width() // 2), y - (img.get_height() // 2)))
+        return img, (x - (img.get_width() // 2), y - (img.get_height() // 2))
+
+    def draw(self, surface: pygame.Surface) -> None:
+        item = self.get_blit()
+        if item is not None:
+            surface.blit(*item, special_flags=pygame.BLEND_RGBA_ADD)
 
 
 @dataclass
@@ -12,6 +12,10 @@ from src.utils import constants
 from src.utils.paths import resource_path
 
 
+# ゲージ最大値。起動後に変わらないので、毎回 getattr しないよう一度だけ読む。
+_POWER_GAUGE_MAX = int(getattr(constants, "POWER_GAUGE_MAX", 1000))
+
+
 @dataclass
 class PlayerInput:
     # Player に渡す入力の「意図（intent）」をまとめたデータ。
@@ -35,6 +39,20 @@ class MoveFrameInfo:
     recovery_frames: int
 
 
+@dataclass(frozen=True)
+class SpecialInputResult:
+    # process_special_inputs の結果。どの必殺技を出したか、通常攻撃IDを取り消すべきかを返す。
+    did_rush: bool = False
+    did_hadoken: bool = False
+    did_shinku: bool = False
+    did_shungoku: bool = False
+    clear_attack_id: bool = False
+
+
+# 何も出なかったフレームの結果（ほとんどのフレームがこれなので使い回す）。
+_NO_SPECIAL_INPUT = SpecialInputResult()
+
+
 class Player:
     def __init__(
         self,
@@ -562,7 +580,7 @@ class Player:
         attack_id: str | None,
         early_frames: int,
         super_cost: int,
-    ) -> dict[str, Any]:
+    ) -> SpecialInputResult:
         now = int(self.get_input_frame_counter())
         early = max(0, int(early_frames))
 
@@ -615,7 +633,7 @@ class Player:
                 # ヒットキャンセルウィンドウ中は瞬獄殺を発動させない（確定で入らないようにする）
                 if self._hit_cancel_window_frames_left > 0:
                     return False
-                mx = int(getattr(constants, "POWER_GAUGE_MAX", 1000))
+                mx = _POWER_GAUGE_MAX
                 if int(self.power_gauge) < mx:
                     return False
                 # HP 20% 以下でのみ発動可能
@@ -654,7 +672,7 @@ class Player:
                 did_rush = True
                 return
             if spec_key == "SHUNGOKUSATSU":
-                mx = int(getattr(constants, "POWER_GAUGE_MAX", 1000))
+                mx = _POWER_GAUGE_MAX
                 if int(self.power_gauge) < mx:
                     return
                 if not self.spend_power(mx):
@@ -692,13 +710,13 @@ class Player:
                     _trigger(sp_key)
                     if sp_key == "RUSH":
                         clear_attack_id = True
-                    return {
-                        "did_rush": did_rush,
-                        "did_hadoken": did_hadoken,
-                        "did_shinku": did_shinku,
-                        "did_shungoku": did_shungoku,
-                        "clear_attack_id": clear_attack_id,
-                    }
+                    return SpecialInputResult(
+                        did_rush=did_rush,
+                        did_hadoken=did_hadoken,
+                        did_shinku=did_shinku,
+                        did_shungoku=did_shungoku,
+                        clear_attack_id=clear_attack_id,
+                    )
 
             # 2) Early input: button within early window
             if _any_match(seqs):
@@ -709,21 +727,16 @@ class Player:
                     _trigger(sp_key)
                     if sp_key == "RUSH":
                         clear_attack_id = True
-                    return {
-                        "did_rush": did_rush,
-                        "did_hadoken": did_hadoken,
-                        "did_shinku": did_shinku,
-                        "did_shungoku": did_shungoku,
-                        "clear_attack_id": clear_attack_id,
-                    }
+                    return SpecialInputResult(
+                        did_rush=did_rush,
+                        did_hadoken=did_hadoken,
+                        did_shinku=did_shinku,
+                        did_shungoku=did_shungoku,
+                        clear_attack_id=clear_attack_id,
+                    )
 
-        return {
-            "did_rush": did_rush,
-            "did_hadoken": did_hadoken,
-            "did_shinku": did_shinku,
-            "did_shungoku": did_shungoku,
-            "clear_attack_id": clear_attack_id,
-        }
+        # ここまで来るのは何も発動しなかったときだけ（発動時は上で return 済み）。
+        return _NO_SPECIAL_INPUT
 
     def start_shungokusatsu(self) -> None:
         self.attack_buffer.clear()
@@ -1254,7 +1267,7 @@ class Player:
         return True
 
     def add_power(self, amount: int) -> None:
-        mx = int(getattr(constants, "POWER_GAUGE_MAX", 1000))
+        mx = _POWER_GAUGE_MAX
         self.power_gauge = max(0, min(mx, int(self.power_gauge) + max(0, int(amount))))
 
     def _can_start_buffered_attack_now(self) -> bool:
@@ -1644,18 +1657,22 @@ class Player:
                 self._current_hit_id = 0
                 self._attack_elapsed_frames = 0
 
+        # 位置更新はローカル変数で計算し、最後に一度だけ書き戻す。
+        knockback_vx = self.knockback_vx
+        vel_y = self.vel_y
+
         # 空中にいる間だけ重力を加える。
         if not self.on_ground:
-            self.vel_y += constants.GRAVITY
+            vel_y += constants.GRAVITY
 
-        # 位置更新。
-        self.pos_x += float(self.vel_x) + float(self.knockback_vx)
-        self.pos_y += float(self.vel_y)
+        pos_x = self.pos_x + self.vel_x + knockback_vx
+        pos_y = self.pos_y + vel_y
 
         # 地面より下に落ちないように補正。
-        if self.pos_y >= constants.GROUND_Y:
-            self.pos_y = float(constants.GROUND_Y)
-            self.vel_y = 0.0
+        ground_y = constants.GROUND_Y
+        if pos_y >= ground_y:
+            pos_y = float(ground_y)
+            vel_y = 0.0
             self.on_ground = True
             self._jump_direction = 0  # 着地時にジャンプ方向をリセット
 
@@ -1663,17 +1680,26 @@ class Player:
         half_w = self.rect.width / 2.0
         min_x = half_w
         max_x = constants.STAGE_WIDTH - half_w
-        self.pos_x = max(min_x, min(max_x, self.pos_x))
+        if pos_x < min_x:
+            pos_x = min_x
+        elif pos_x > max_x:
+            pos_x = max_x
 
         # 壁に当たっている間は、壁方向へ押すノックバック速度を打ち消す。
         # これにより、クランプと減衰がぶつかって「押し付け続ける」挙動になりにくくする。
-        if self.pos_x <= (min_x + 0.01) and self.knockback_vx < 0:
-            self.knockback_vx = 0.0
-        if self.pos_x >= (max_x - 0.01) and self.knockback_vx > 0:
-            self.knockback_vx = 0.0
+        if knockback_vx < 0:
+            if pos_x <= (min_x + 0.01):
+                self.knockback_vx = 0.0
+        elif knockback_vx > 0:
+            if pos_x >= (max_x - 0.01):
+                self.knockback_vx = 0.0
+
+        self.pos_x = pos_x
+        self.pos_y = pos_y
+        self.vel_y = vel_y
 
         # pos -> rect を同期。
-        self.rect.midbottom = (int(self.pos_x), int(self.pos_y))
+        self.rect.midbottom = (int(pos_x), int(pos_y))
 
         # 攻撃モーション中以外は、状態に応じてアクションを切り替える。
         if self._action_mode != "oneshot" and (not self.in_hitstun):
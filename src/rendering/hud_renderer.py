@@ -1,10 +1,11 @@
 from __future__ import annotations
 
-from typing import Any, TYPE_CHECKING
+from typing import Any, Sequence, TYPE_CHECKING
 
 import pygame
 
 from src.engine.context import FrameState, FrameSample, FrameDataTracker
+from src.rendering.text_cache import render_cached
 from src.ui import hud
 from src.utils import constants
 
@@ -28,8 +29,17 @@ class HUDRenderer:
         self.debug_font = debug_font
         self.frame_meter_adv_font = frame_meter_adv_font
 
-        # frame meter panel cache
-        self._frame_meter_panel: pygame.Surface | None = None
+        # フレームメーターのパネル（背景・バー・目盛り）。両トラッカーの revision が
+        # 変わったときだけ描き直す。
+        self._frame_meter_layer: pygame.Surface | None = None
+        self._frame_meter_layer_key: tuple[int, int] | None = None
+
+        # 拡大済みテキスト（カウントダウン数字 / KO）のキャッシュ
+        self._scaled_text_cache: dict[tuple[str, float], pygame.Surface] = {}
+
+        # グリッド / ヒットボックス情報用フォント（描画のたびに生成しない）
+        self._grid_font: pygame.font.Font | None = None
+        self._hitbox_info_font: pygame.font.Font | None = None
 
     # ------------------------------------------------------------------
     # HP bars
@@ -113,7 +123,7 @@ class HUDRenderer:
         *,
         timer_text: str,
     ) -> None:
-        timer_surf = self.title_font.render(timer_text, True, (245, 245, 245))
+        timer_surf = render_cached(self.title_font, timer_text, (245, 245, 245))
         timer_rect = timer_surf.get_rect(midtop=(constants.STAGE_WIDTH // 2, int(constants.HP_BAR_MARGIN_Y)))
         surface.blit(timer_surf, timer_rect)
 
@@ -121,16 +131,25 @@ class HUDRenderer:
     # Countdown
     # ------------------------------------------------------------------
 
+    def _render_scaled(self, text: str, color: tuple[int, int, int], *, scale: float) -> pygame.Surface:
+        # 拡大表示する大きな文字は、描画結果と smoothscale 結果をまとめてキャッシュする。
+        key = (text, float(scale))
+        surf = self._scaled_text_cache.get(key)
+        if surf is None:
+            base = render_cached(self.title_font, text, color)
+            w = max(1, int(round(base.get_width() * scale)))
+            h = max(1, int(round(base.get_height() * scale)))
+            surf = pygame.transform.smoothscale(base, (w, h))
+            self._scaled_text_cache[key] = surf
+        return surf
+
     def draw_countdown(
         self,
         surface: pygame.Surface,
         *,
         number: int,
     ) -> None:
-        cd_surf = self.title_font.render(str(number), True, (255, 240, 120))
-        w = max(1, int(round(cd_surf.get_width() * 2.2)))
-        h = max(1, int(round(cd_surf.get_height() * 2.2)))
-        cd_surf = pygame.transform.smoothscale(cd_surf, (w, h))
+        cd_surf = self._render_scaled(str(number), (255, 240, 120), scale=2.2)
         cd_rect = cd_surf.get_rect(center=(constants.STAGE_WIDTH // 2, constants.STAGE_HEIGHT // 2 - 40))
         surface.blit(cd_surf, cd_rect)
 
@@ -139,10 +158,7 @@ class HUDRenderer:
     # ------------------------------------------------------------------
 
     def draw_ko(self, surface: pygame.Surface) -> None:
-        ko_surf = self.title_font.render("KO", True, (255, 240, 120))
-        w = max(1, int(round(ko_surf.get_width() * 1.8)))
-        h = max(1, int(round(ko_surf.get_height() * 1.8)))
-        ko_surf = pygame.transform.smoothscale(ko_surf, (w, h))
+        ko_surf = self._render_scaled("KO", (255, 240, 120), scale=1.8)
         rect = ko_surf.get_rect(center=(constants.STAGE_WIDTH // 2, constants.STAGE_HEIGHT // 2 - 30))
         surface.blit(ko_surf, rect)
 
@@ -193,25 +209,21 @@ class HUDRenderer:
         p1: Player,
         p2: Player,
     ) -> None:
-        if int(getattr(p1, "combo_display_frames_left", 0)) > 0 and int(getattr(p1, "combo_display_count", 0)) >= 2:
-            txt = f"{int(p1.combo_display_count)} Hits"
-            surf = self.title_font.render(txt, True, (255, 240, 120))
-            surface.blit(surf, (16, 110))
-
-            dmg = int(getattr(p1, "combo_damage_display", 0))
-            dmg_surf = self.prompt_font.render(f"{dmg}", True, (255, 240, 200))
-            surface.blit(dmg_surf, (16, 110 + surf.get_height() - 6))
-
-        if int(getattr(p2, "combo_display_frames_left", 0)) > 0 and int(getattr(p2, "combo_display_count", 0)) >= 2:
-            txt = f"{int(p2.combo_display_count)} Hits"
-            surf = self.title_font.render(txt, True, (255, 240, 120))
+        if p1.combo_display_frames_left > 0 and p1.combo_display_count >= 2:
+            txt = f"{p1.combo_display_count} Hits"
+            surf = render_cached(self.title_font, txt, (255, 240, 120))
+
+            dmg_surf = render_cached(self.prompt_font, f"{p1.combo_damage_display}", (255, 240, 200))
+            surface.fblits(((surf, (16, 110)), (dmg_surf, (16, 110 + surf.get_height() - 6))))
+
+        if p2.combo_display_frames_left > 0 and p2.combo_display_count >= 2:
+            txt = f"{p2.combo_display_count} Hits"
+            surf = render_cached(self.title_font, txt, (255, 240, 120))
             rect = surf.get_rect(topright=(constants.STAGE_WIDTH - 16, 110))
-            surface.blit(surf, rect)
 
-            dmg = int(getattr(p2, "combo_damage_display", 0))
-            dmg_surf = self.prompt_font.render(f"{dmg}", True, (255, 240, 200))
+            dmg_surf = render_cached(self.prompt_font, f"{p2.combo_damage_display}", (255, 240, 200))
             dmg_rect = dmg_surf.get_rect(topright=(constants.STAGE_WIDTH - 16, 110 + surf.get_height() - 6))
-            surface.blit(dmg_surf, dmg_rect)
+            surface.fblits(((surf, rect), (dmg_surf, dmg_rect)))
 
     # ------------------------------------------------------------------
     # Frame meter (drawing only — state updates stay in main.py)
@@ -240,13 +252,84 @@ class HUDRenderer:
         panel_x = int((constants.STAGE_WIDTH - panel_w) // 2)
         panel_y = int(constants.STAGE_HEIGHT - panel_h - 8)
 
-        if self._frame_meter_panel is None:
-            self._frame_meter_panel = pygame.Surface((panel_w, panel_h), pygame.SRCALPHA)
-            self._frame_meter_panel.fill((0, 0, 0, 150))
+        # メーターが止まっている（両者 IDLE が続いている）間は revision が変わらないので、
+        # 240 個のブロックと目盛りを毎フレーム描き直さずにパネルごと 1 回の blit で済ませる。
+        # 記録中は毎フレーム描き直すので、Surface は最初の 1 回だけ作って使い回す。
+        if self._frame_meter_layer is None:
+            self._frame_meter_layer = pygame.Surface((panel_w, panel_h), pygame.SRCALPHA)
+            self._frame_meter_layer_key = None
+        layer_key = (tracker_p1.revision, tracker_p2.revision)
+        if self._frame_meter_layer_key != layer_key:
+            self._render_frame_meter_layer(
+                self._frame_meter_layer,
+                tracker_p1.items(),
+                tracker_p2.items(),
+                history=history,
+                block_w=block_w,
+                bar_h=bar_h,
+                gap=gap,
+                panel_pad=panel_pad,
+                panel_w=panel_w,
+                panel_h=panel_h,
+            )
+            self._frame_meter_layer_key = layer_key
+        surface.blit(self._frame_meter_layer, (panel_x, panel_y))
+
+        row1_y = int(panel_y + panel_pad)
+        row2_y = int(panel_y + panel_pad + bar_h + gap)
+        bar_right = int(panel_x + panel_pad + bar_w)
+
+        # 文字（P1/P2 の見出しと Combo!）はまとめて fblits する。
+        tag1 = render_cached(self.debug_font, "P1", (240, 240, 240))
+        tag2 = render_cached(self.debug_font, "P2", (240, 240, 240))
+        text_blits = [(tag1, (panel_x + 6, row1_y - 2)), (tag2, (panel_x + 6, row2_y - 2))]
+
+        combo_now = bool(combo_overlap_p1 or combo_overlap_p2)
+        if combo_now:
+            combo_surf = render_cached(self.debug_font, "Combo!", (255, 170, 255))
+            combo_x = int(bar_right - combo_surf.get_width() - 6)
+            combo_y = int(panel_y - combo_surf.get_height() - 2)
+            text_blits.append((combo_surf, (combo_x, combo_y)))
+
+        surface.fblits(text_blits)
+
+        if adv_value is not None and adv_attacker_side in {1, 2}:
+            adv = int(adv_value)
+            sign = "+" if adv >= 0 else ""
+            txt = f"{sign}{adv}"
+            ratio = 0.0
+            if int(constants.FPS) > 0:
+                ratio = float(adv_frames_left) / float(constants.FPS * 3)
+            a = int(max(0, min(255, round(255 * ratio))))
+            if adv >= 0:
+                c = (90, 255, 220)
+            else:
+                c = (255, 90, 90)
+            adv_surf = self.frame_meter_adv_font.render(txt, True, c)
+            adv_surf.set_alpha(a)
+            adv_x = int((panel_x + panel_pad + bar_w) - (adv_surf.get_width() // 2))
+            adv_y = int(panel_y - adv_surf.get_height() - 6)
+            surface.blit(adv_surf, (adv_x, adv_y))
 
-        surface.blit(self._frame_meter_panel, (panel_x, panel_y))
-        pygame.draw.rect(surface, (110, 110, 110), pygame.Rect(panel_x, panel_y, panel_w, panel_h), 2)
+    @staticmethod
+    def _render_frame_meter_layer(
+        layer: pygame.Surface,
+        items_p1: list[FrameSample],
+        items_p2: list[FrameSample],
+        *,
+        history: int,
+        block_w: int,
+        bar_h: int,
+        gap: int,
+        panel_pad: int,
+        panel_w: int,
+        panel_h: int,
+    ) -> None:
+        # パネル左上を原点にして、前回の内容ごと塗り直してから描く。
+        layer.fill((0, 0, 0, 150))
+        pygame.draw.rect(layer, (110, 110, 110), pygame.Rect(0, 0, panel_w, panel_h), 2)
 
+        bar_w = int(history * block_w)
         colors = {
             FrameState.IDLE: (110, 110, 110),
             FrameState.STARTUP: (60, 220, 120),
@@ -262,26 +345,26 @@ class HUDRenderer:
 
         def _draw_bar(items: list[FrameSample], *, row_y: int) -> None:
             seg = items[-history:] if len(items) > history else items
-            start_x = panel_x + panel_pad + (bar_w - (len(seg) * block_w))
+            start_x = panel_pad + (bar_w - (len(seg) * block_w))
             x = int(start_x)
             for smp in seg:
                 st = smp.state
                 base = colors.get(st, (110, 110, 110))
-                col = _brighten(base, amount=35) if bool(smp.hitstop) else base
+                col = _brighten(base, amount=35) if smp.hitstop else base
                 r = pygame.Rect(x, row_y, block_w - 1, bar_h)
-                pygame.draw.rect(surface, col, r)
-                if bool(smp.hitstop):
-                    pygame.draw.rect(surface, (245, 245, 245), r, 1)
-                if bool(smp.combo):
-                    pygame.draw.rect(surface, (255, 120, 255), r, 2)
+                pygame.draw.rect(layer, col, r)
+                if smp.hitstop:
+                    pygame.draw.rect(layer, (245, 245, 245), r, 1)
+                if smp.combo:
+                    pygame.draw.rect(layer, (255, 120, 255), r, 2)
                 x += int(block_w)
 
-        row1_y = int(panel_y + panel_pad)
-        row2_y = int(panel_y + panel_pad + bar_h + gap)
-        _draw_bar(tracker_p1.items(), row_y=row1_y)
-        _draw_bar(tracker_p2.items(), row_y=row2_y)
+        row1_y = int(panel_pad)
+        row2_y = int(panel_pad + bar_h + gap)
+        _draw_bar(items_p1, row_y=row1_y)
+        _draw_bar(items_p2, row_y=row2_y)
 
-        bar_left = int(panel_x + panel_pad)
+        bar_left = int(panel_pad)
         bar_right = int(bar_left + bar_w)
         grid_top = int(row1_y)
         grid_bottom = int(row2_y + bar_h)
@@ -297,39 +380,9 @@ class HUDRenderer:
             else:
                 gc = (120, 120, 120)
                 gw = 1
-            pygame.draw.line(surface, gc, (gx, grid_top), (gx, grid_bottom), gw)
-
-        pygame.draw.line(surface, (235, 235, 235), (bar_right, grid_top - 2), (bar_right, grid_bottom + 2), 2)
+            pygame.draw.line(layer, gc, (gx, grid_top), (gx, grid_bottom), gw)
 
-        combo_now = bool(combo_overlap_p1 or combo_overlap_p2)
-        if combo_now:
-            combo_surf = self.debug_font.render("Combo!", True, (255, 170, 255))
-            combo_x = int(bar_right - combo_surf.get_width() - 6)
-            combo_y = int(panel_y - combo_surf.get_height() - 2)
-            surface.blit(combo_surf, (combo_x, combo_y))
-
-        tag1 = self.debug_font.render("P1", True, (240, 240, 240))
-        tag2 = self.debug_font.render("P2", True, (240, 240, 240))
-        surface.blit(tag1, (panel_x + 6, row1_y - 2))
-        surface.blit(tag2, (panel_x + 6, row2_y - 2))
-
-        if adv_value is not None and adv_attacker_side in {1, 2}:
-            adv = int(adv_value)
-            sign = "+" if adv >= 0 else ""
-            txt = f"{sign}{adv}"
-            ratio = 0.0
-            if int(constants.FPS) > 0:
-                ratio = float(adv_frames_left) / float(constants.FPS * 3)
-            a = int(max(0, min(255, round(255 * ratio))))
-            if adv >= 0:
-                c = (90, 255, 220)
-            else:
-                c = (255, 90, 90)
-            adv_surf = self.frame_meter_adv_font.render(txt, True, c)
-            adv_surf.set_alpha(a)
-            adv_x = int((panel_x + panel_pad + bar_w) - (adv_surf.get_width() // 2))
-            adv_y = int(panel_y - adv_surf.get_height() - 6)
-            surface.blit(adv_surf, (adv_x, adv_y))
+        pygame.draw.line(layer, (235, 235, 235), (bar_right, grid_top - 2), (bar_right, grid_bottom + 2), 2)
 
     # ------------------------------------------------------------------
     # Grid display for hitbox visualization
@@ -358,22 +411,29 @@ class HUDRenderer:
         
         # グリッド数値表示（X軸）
         try:
-            font = pygame.font.Font(None, 16)
-            for x in range(0, constants.STAGE_WIDTH, grid_spacing * 2):
-                text = font.render(str(x), True, (100, 100, 100))
-                surface.blit(text, (x + 2, 2))
+            if self._grid_font is None:
+                self._grid_font = pygame.font.Font(None, 16)
+            font = self._grid_font
+            label_blits = [
+                (render_cached(font, str(x), (100, 100, 100)), (x + 2, 2))
+                for x in range(0, constants.STAGE_WIDTH, grid_spacing * 2)
+            ]
             
             # Y軸
-            for y in range(0, constants.STAGE_HEIGHT, grid_spacing * 2):
-                text = font.render(str(y), True, (100, 100, 100))
-                surface.blit(text, (2, y + 2))
+            label_blits.extend(
+                (render_cached(font, str(y), (100, 100, 100)), (2, y + 2))
+                for y in range(0, constants.STAGE_HEIGHT, grid_spacing * 2)
+            )
+            surface.fblits(label_blits)
         except Exception:
             pass
 
     def draw_hitbox_info(self, surface: pygame.Surface, *, p1: Player, p2: Player) -> None:
         """ヒットボックス情報表示（サイズ・オフセット）"""
         try:
-            font = pygame.font.Font(None, 20)
+            if self._hitbox_info_font is None:
+                self._hitbox_info_font = pygame.font.Font(None, 20)
+            font = self._hitbox_info_font
             
             for player, label in [(p1, "P1"), (p2, "P2")]:
                 hitboxes = player.get_hitboxes()
@@ -404,7 +464,7 @@ class HUDRenderer:
                 for hitbox in hitboxes:
                     # サイズ表示（ヒットボックスの上）
                     size_text = f"{hitbox_w}x{hitbox_h}"
-                    size_surf = font.render(size_text, True, (255, 255, 0))
+                    size_surf = render_cached(font, size_text, (255, 255, 0))
                     size_rect = size_surf.get_rect(midbottom=(hitbox.centerx, hitbox.top - 2))
                     
                     # 背景
@@ -416,7 +476,7 @@ class HUDRenderer:
                     
                     # オフセット表示（ヒットボックスの下）
                     offset_text = f"X:{offset_x} Y:{offset_y}"
-                    offset_surf = font.render(offset_text, True, (255, 200, 0))
+                    offset_surf = render_cached(font, offset_text, (255, 200, 0))
                     offset_rect = offset_surf.get_rect(midtop=(hitbox.centerx, hitbox.bottom + 2))
                     
                     # 背景
@@ -428,7 +488,7 @@ class HUDRenderer:
                     
                     # プレイヤーラベル（ヒットボックスの中央）
                     label_text = f"{label}: {attack_id}"
-                    label_surf = font.render(label_text, True, (255, 255, 255))
+                    label_surf = render_cached(font, label_text, (255, 255, 255))
                     label_rect = label_surf.get_rect(center=hitbox.center)
                     
                     # 背景
@@ -453,7 +513,7 @@ class HUDRenderer:
         show_key_history: bool,
         show_p1_frames: bool,
         show_p2_frames: bool,
-        key_history: list[str],
+        key_history: Sequence[str],
     ) -> None:
         hud_top = 120
         line_h = int(self.debug_font.get_linesize())
@@ -461,9 +521,10 @@ class HUDRenderer:
         if bool(show_key_history) and key_history:
             x = 12
             y = hud_top
-            for i, t in enumerate(key_history):
-                surf = self.debug_font.render(t, True, (240, 240, 240))
-                surface.blit(surf, (x, y + i * line_h))
+            # 入力履歴は同じ数種類の文字だけなので、キャッシュ済みの文字をまとめて fblits する。
+            surface.fblits(
+                [(render_cached(self.debug_font, t, (240, 240, 240)), (x, y + i * line_h)) for i, t in enumerate(key_history)]
+            )
 
         if bool(show_p1_frames):
             p1_info = p1.get_last_move_frame_info()
@@ -479,9 +540,9 @@ class HUDRenderer:
                 ]
                 x = 96
                 y = hud_top
-                for i, t in enumerate(lines):
-                    surf = self.debug_font.render(t, True, (240, 240, 240))
-                    surface.blit(surf, (x, y + i * line_h))
+                surface.fblits(
+                    [(render_cached(self.debug_font, t, (240, 240, 240)), (x, y + i * line_h)) for i, t in enumerate(lines)]
+                )
 
         if bool(show_p2_frames):
             p2_info = p2.get_last_move_frame_info()
@@ -497,7 +558,8 @@ class HUDRenderer:
                 ]
                 x = constants.STAGE_WIDTH - 12
                 y = hud_top
+                line_blits = []
                 for i, t in enumerate(lines):
-                    surf = self.debug_font.render(t, True, (240, 240, 240))
-                    rect = surf.get_rect(topright=(x, y + i * line_h))
-                    surface.blit(surf, rect)
+                    surf = render_cached(self.debug_font, t, (240, 240, 240))
+                    line_blits.append((surf, surf.get_rect(topright=(x, y + i * line_h))))
+                surface.fblits(line_blits)
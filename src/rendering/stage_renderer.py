@@ -14,7 +14,19 @@ class StageRenderer:
 
     def __init__(self, *, rain_count: int = 90) -> None:
         self.stage_bg_frames: list[pygame.Surface] = self._load_stage_frames()
-        self.rain_drops: list[dict[str, float]] = self._init_rain_drops(rain_count)
+        # 拡大＋色味付け済みの背景と、その元画像。
+        self._bg_source: pygame.Surface | None = None
+        self._bg_composed: pygame.Surface | None = None
+        # 雨粒スプライトのキャッシュ（(長さ, α) ごとに1枚だけ作って fblits で使い回す）。
+        self._drop_sprites: dict[tuple[int, int], pygame.Surface] = {}
+        # 雨粒は属性ごとの並列リスト（SoA）で持ち、更新ループで dict を引かないようにする。
+        self._rain_x: list[float] = []
+        self._rain_y: list[float] = []
+        self._rain_vx: list[float] = []
+        self._rain_vy: list[float] = []
+        self._rain_len: list[int] = []
+        self._rain_sprite: list[pygame.Surface] = []
+        self._init_rain_drops(rain_count)
 
     # ------------------------------------------------------------------
     # Stage background frames
@@ -28,7 +40,7 @@ class StageRenderer:
             if not p.exists():
                 return []
             try:
-                frames.append(pygame.image.load(str(p)).convert_alpha())
+                frames.append(pygame.image.load(str(p)).convert())
             except pygame.error:
                 return []
         return frames
@@ -37,41 +49,57 @@ class StageRenderer:
     # Rain
     # ------------------------------------------------------------------
 
-    @staticmethod
-    def _init_rain_drops(count: int) -> list[dict[str, float]]:
-        drops: list[dict[str, float]] = []
+    def _init_rain_drops(self, count: int) -> None:
+        drops: list[tuple[float, float, float, float, int, int]] = []
         for _ in range(max(0, int(count))):
             drops.append(
-                {
-                    "x": float(random.randrange(0, constants.STAGE_WIDTH)),
-                    "y": float(random.randrange(-constants.STAGE_HEIGHT, constants.STAGE_HEIGHT)),
-                    "vy": float(random.uniform(9.0, 15.0)),
-                    "vx": float(random.uniform(-1.0, 0.8)),
-                    "len": float(random.uniform(10.0, 18.0)),
-                    "a": float(random.uniform(90.0, 150.0)),
-                }
+                (
+                    float(random.randrange(0, constants.STAGE_WIDTH)),
+                    float(random.randrange(-constants.STAGE_HEIGHT, constants.STAGE_HEIGHT)),
+                    float(random.uniform(-1.0, 0.8)),
+                    float(random.uniform(9.0, 15.0)),
+                    int(random.uniform(10.0, 18.0)),
+                    int(random.uniform(90.0, 150.0)),
+                )
             )
-        return drops
+        # 長さ/α（= 使うスプライト）が同じ雨粒を隣り合わせに並べておき、fblits でソースが連続するようにする。
+        drops.sort(key=lambda d: (d[4], d[5]))
+        for x, y, vx, vy, ln, a in drops:
+            self._rain_x.append(x)
+            self._rain_y.append(y)
+            self._rain_vx.append(vx)
+            self._rain_vy.append(vy)
+            self._rain_len.append(ln)
+            self._rain_sprite.append(self._get_drop_sprite(ln, a))
 
     def update_rain(self) -> None:
-        for d in self.rain_drops:
-            d["x"] = float(d.get("x", 0.0)) + float(d.get("vx", 0.0))
-            d["y"] = float(d.get("y", 0.0)) + float(d.get("vy", 0.0))
-
-            if d["y"] > float(constants.STAGE_HEIGHT + 30):
-                d["y"] = float(random.uniform(-120.0, -20.0))
-                d["x"] = float(random.randrange(-20, constants.STAGE_WIDTH + 20))
-            if d["x"] < -40:
-                d["x"] = float(constants.STAGE_WIDTH + 40)
-            if d["x"] > float(constants.STAGE_WIDTH + 40):
-                d["x"] = float(-40)
+        xs = self._rain_x
+        ys = self._rain_y
+        vxs = self._rain_vx
+        vys = self._rain_vy
+        bottom = float(constants.STAGE_HEIGHT + 30)
+        right = float(constants.STAGE_WIDTH + 40)
+        for i in range(len(xs)):
+            x = xs[i] + vxs[i]
+            y = ys[i] + vys[i]
+
+            if y > bottom:
+                y = random.uniform(-120.0, -20.0)
+                x = float(random.randrange(-20, constants.STAGE_WIDTH + 20))
+            if x < -40:
+                x = right
+            if x > right:
+                x = -40.0
+
+            xs[i] = x
+            ys[i] = y
 
     # ------------------------------------------------------------------
     # Drawing helpers
     # ------------------------------------------------------------------
 
-    @staticmethod
     def draw_background(
+        self,
         surface: pygame.Surface,
         *,
         tick_ms: int,
@@ -85,21 +113,44 @@ class StageRenderer:
             bg_img = stage_bg_img
 
         if bg_img is not None:
-            bg = pygame.transform.smoothscale(bg_img, (constants.STAGE_WIDTH, constants.STAGE_HEIGHT))
-            surface.blit(bg, (0, 0))
-
-            dark = pygame.Surface((constants.STAGE_WIDTH, constants.STAGE_HEIGHT), pygame.SRCALPHA)
-            dark.fill((20, 40, 70, 95))
-            surface.blit(dark, (0, 0))
+            # 拡大と暗い色味の重ね塗りは元画像が同じなら毎回同じ結果なので、合成済みの1枚を使い回す。
+            if self._bg_source is not bg_img or self._bg_composed is None:
+                bg = pygame.transform.smoothscale(bg_img, (constants.STAGE_WIDTH, constants.STAGE_HEIGHT)).convert()
+                dark = pygame.Surface((constants.STAGE_WIDTH, constants.STAGE_HEIGHT)).convert()
+                dark.fill((20, 40, 70))
+                dark.set_alpha(95)
+                bg.blit(dark, (0, 0))
+                self._bg_source = bg_img
+                self._bg_composed = bg
+            surface.blit(self._bg_composed, (0, 0))
+
+    def _get_drop_sprite(self, ln: int, a: int) -> pygame.Surface:
+        a = max(0, min(255, int(a)))
+        key = (ln, a)
+        spr = self._drop_sprites.get(key)
+        if spr is None:
+            # (x, y) -> (x - 2, y + ln) の線を、左上 (x - 2, y) 基準の小さな Surface に焼き込む。
+            spr = pygame.Surface((3, ln + 1), pygame.SRCALPHA)
+            pygame.draw.line(spr, (170, 210, 255, a), (2, 0), (0, ln), 1)
+            self._drop_sprites[key] = spr
+        return spr
 
     def draw_rain(self, surface: pygame.Surface) -> None:
-        if not self.rain_drops:
+        if not self._rain_sprite:
             return
-        rain = pygame.Surface((constants.STAGE_WIDTH, constants.STAGE_HEIGHT), pygame.SRCALPHA)
-        for d in self.rain_drops:
-            x = int(d.get("x", 0.0))
-            y = int(d.get("y", 0.0))
-            ln = int(d.get("len", 14.0))
-            a = int(max(0, min(255, int(d.get("a", 120.0)))))
-            pygame.draw.line(rain, (170, 210, 255, a), (x, y), (x - 2, y + ln), 1)
-        surface.blit(rain, (0, 0))
+        # 同じスプライトの雨粒は初期化時に隣接させてあるので、そのまま fblits に渡せば
+        # ソースが続く間はピクセル読込が使い回される。
+        # クリップ範囲外（画面上の待機中・画面下へ抜けた雨粒など）は最初から並べない。
+        clip = surface.get_clip()
+        top = clip.top
+        bottom = clip.bottom
+        left = clip.left - 3
+        right = clip.right
+        seq: list[tuple[pygame.Surface, tuple[int, int]]] = []
+        for spr, fx, fy, ln in zip(self._rain_sprite, self._rain_x, self._rain_y, self._rain_len):
+            x = int(fx) - 2
+            y = int(fy)
+            if y > bottom or (y + ln) < top or x >= right or x <= left:
+                continue
+            seq.append((spr, (x, y)))
+        surface.fblits(seq)
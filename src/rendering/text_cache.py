@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+from functools import lru_cache
+
+import pygame
+
+
+@lru_cache(maxsize=512)
+def render_cached(
+    font: pygame.font.Font,
+    text: str,
+    color: tuple[int, int, int],
+    antialias: bool = True,
+) -> pygame.Surface:
+    """font.render の結果を (フォント, 文字列, 色) ごとにキャッシュして返す。
+
+    返した Surface は共有されるため、呼び出し側で set_alpha 等の変更をしないこと。
+    """
+    return font.render(text, antialias, color).convert_alpha()
+
+
+@lru_cache(maxsize=64)
+def render_scaled_cached(
+    font: pygame.font.Font,
+    text: str,
+    color: tuple[int, int, int],
+    scale: float,
+) -> pygame.Surface:
+    """render_cached の結果を scale 倍に縮小/拡大したものをキャッシュして返す（パネルの見出し用）。"""
+    base = render_cached(font, text, color)
+    w = max(1, int(round(base.get_width() * scale)))
+    h = max(1, int(round(base.get_height() * scale)))
+    return pygame.transform.smoothscale(base, (w, h))
+
+
+def clear_text_cache() -> None:
+    """テキストキャッシュを破棄する（画面モード変更時など）。"""
+    render_cached.cache_clear()
+    render_scaled_cached.cache_clear()
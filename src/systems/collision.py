@@ -64,19 +64,15 @@ class CollisionSystem:
             return None
 
         hurtboxes = defender.get_hurtboxes()
-        hit_point: tuple[int, int] | None = None
 
+        # hurtbox 側の走査は Rect.collidelist（C実装）に任せ、Python の二重ループを避ける。
         for hitbox in hitboxes:
-            for hurtbox in hurtboxes:
-                if not hitbox.colliderect(hurtbox):
-                    continue
-                overlap = hitbox.clip(hurtbox)
-                if overlap.width > 0 and overlap.height > 0:
-                    hit_point = overlap.center
-                else:
-                    hit_point = hitbox.center
-                break
-            if hit_point is not None:
-                break
-
-        return hit_point
+            idx = hitbox.collidelist(hurtboxes)
+            if idx < 0:
+                continue
+            overlap = hitbox.clip(hurtboxes[idx])
+            if overlap.width > 0 and overlap.height > 0:
+                return overlap.center
+            return hitbox.center
+
+        return None
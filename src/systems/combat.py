@@ -115,19 +115,17 @@ class CombatSystem:
         
         # ガード判定：後ろ入力中（defender.holding_back）ならガード成功。
         # ただし、攻撃属性とガード姿勢の組み合わせをチェック
-        can_guard_basic = bool(getattr(defender, "can_guard_now", lambda: False)()) and bool(
-            getattr(defender, "is_guarding_intent", lambda: False)()
-        )
+        can_guard_basic = defender.can_guard_now() and defender.is_guarding_intent()
         
         # 攻撃属性に応じたガード判定
         is_guarding = False
         if can_guard_basic:
             if attack_attribute == AttackAttribute.OVERHEAD:
                 # 中段攻撃：立ちガードでのみガード可能
-                is_guarding = bool(getattr(defender, "is_standing_guard", lambda: False)())
+                is_guarding = defender.is_standing_guard()
             elif attack_attribute == AttackAttribute.LOW:
                 # 下段攻撃：しゃがみガードでのみガード可能
-                is_guarding = bool(getattr(defender, "is_crouching_guard", lambda: False)())
+                is_guarding = defender.is_crouching_guard()
             else:  # AttackAttribute.MID
                 # 通常攻撃：立ち・しゃがみ両方でガード可能
                 is_guarding = True
@@ -282,7 +280,7 @@ class CombatSystem:
         else:
             attacker.start_combo_on_opponent(opponent_side=(2 if attacker_side == 1 else 1))
 
-        dmg_mul = float(getattr(constants, "get_damage_multiplier", lambda _c: 1.0)(attacker.get_combo_count()))
+        dmg_mul = constants.get_damage_multiplier(attacker.get_combo_count())
         scaled_damage = int(max(0, round(float(damage) * dmg_mul)))
 
         defender.take_damage(scaled_damage)
@@ -342,7 +340,7 @@ class CombatSystem:
         should_knockdown = False
         if attack_id == "RUSH":
             # 突進攻撃は根元（発動直後）でヒットした場合のみダウンさせる
-            should_knockdown = bool(getattr(attacker, "is_rush_early_hit", lambda: False)())
+            should_knockdown = attacker.is_rush_early_hit()
         else:
             # その他の技はフレームデータのcauses_knockdownフラグを参照
             frame_data_dict = getattr(attacker.character, "frame_data", None)
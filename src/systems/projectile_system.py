@@ -108,26 +108,36 @@ class ProjectileSystem:
             "frame_meter_adv_attacker_side": 0,
         }
 
+        if not self.projectiles:
+            return result
+
+        # 被弾側の食らい判定は弾ごとに作り直さず、ヒット/ガードで状態が変わるまで使い回す。
+        # （対象は owner_side で決まるため、候補は常に相手1人に絞られる）
+        hurtbox_cache: dict[int, pygame.Rect] = {}
+
         for pr in self.projectiles:
             if pr.finished:
                 continue
 
-            if int(getattr(pr, "owner_side", 0)) == 1:
+            owner_side = int(getattr(pr, "owner_side", 0))
+            if owner_side == 1:
                 target = p2
                 attacker = p1
-            elif int(getattr(pr, "owner_side", 0)) == 2:
+            elif owner_side == 2:
                 target = p1
                 attacker = p2
             else:
                 continue
 
-            if not pr.get_rect().colliderect(target.get_hurtbox()):
+            hurtbox = hurtbox_cache.get(owner_side)
+            if hurtbox is None:
+                hurtbox = hurtbox_cache[owner_side] = target.get_hurtbox()
+            if not pr.get_rect().colliderect(hurtbox):
                 continue
+            hurtbox_cache.pop(owner_side, None)
 
             # ガード判定
-            is_guarding = bool(getattr(target, "can_guard_now", lambda: False)()) and bool(
-                getattr(target, "is_guarding_intent", lambda: False)()
-            )
+            is_guarding = target.can_guard_now() and target.is_guarding_intent()
             if game_state == GameState.TRAINING and training_p2_all_guard and (target is p2):
                 is_guarding = True
 
@@ -295,6 +305,9 @@ class ProjectileSystem:
         }
 
     def draw_all(self, surface: pygame.Surface) -> None:
-        """全弾を描画する。"""
+        """全弾を描画する。描画先のクリップ範囲外にある弾は blit 自体を省く。"""
+        clip = surface.get_clip()
         for pr in self.projectiles:
+            if not clip.colliderect(pr.get_rect()):
+                continue
             pr.draw(surface)
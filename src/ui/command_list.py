@@ -4,6 +4,7 @@ from typing import Any
 
 import pygame
 
+from src.rendering.text_cache import render_cached, render_scaled_cached
 from src.utils import constants
 
 
@@ -36,6 +37,8 @@ class CommandListMenu:
         self.close_start_ms = 0
         self.preview_start_ms = 0
         self.is_open = False
+        # 暗幕とパネル背景は毎フレーム作らず、画面サイズごとに一度だけ作って使い回す。
+        self._backdrop_cache: dict[tuple[int, int], tuple[pygame.Surface, pygame.Surface]] = {}
     
     def get_preview_sprite_key(self, action_id: int, *, elapsed_frames: int) -> tuple[int, int] | None:
         """
@@ -194,11 +197,6 @@ class CommandListMenu:
         if not self.is_open:
             return
         
-        # オーバーレイ
-        overlay2 = pygame.Surface((constants.SCREEN_WIDTH, constants.SCREEN_HEIGHT), pygame.SRCALPHA)
-        overlay2.fill((0, 0, 0, 210))
-        screen.blit(overlay2, (0, 0))
-        
         w = int(constants.SCREEN_WIDTH)
         h = int(constants.SCREEN_HEIGHT)
         
@@ -207,22 +205,32 @@ class CommandListMenu:
         panel_x = (w - panel_w) // 2
         panel_y = (h - panel_h) // 2
         
+        cached = self._backdrop_cache.get((w, h))
+        if cached is None:
+            overlay = pygame.Surface((w, h)).convert()
+            overlay.fill((0, 0, 0))
+            overlay.set_alpha(210)
+            panel = pygame.Surface((panel_w, panel_h)).convert()
+            panel.fill((18, 18, 22))
+            panel.set_alpha(235)
+            cached = (overlay, panel)
+            self._backdrop_cache[(w, h)] = cached
+        overlay, panel = cached
+        
+        # オーバーレイ
+        screen.blit(overlay, (0, 0))
+        
         # パネル背景
-        panel = pygame.Surface((panel_w, panel_h), pygame.SRCALPHA)
-        panel.fill((18, 18, 22, 235))
         screen.blit(panel, (panel_x, panel_y))
         pygame.draw.rect(screen, (90, 255, 220), pygame.Rect(panel_x, panel_y, panel_w, panel_h), 2)
         
         # ヘッダー
         header_txt = "COMMAND LIST"
-        header = title_font.render(header_txt, True, (245, 245, 245))
-        header_scale_w = max(1, int(round(header.get_width() * 0.38)))
-        header_scale_h = max(1, int(round(header.get_height() * 0.38)))
-        header = pygame.transform.smoothscale(header, (header_scale_w, header_scale_h))
+        header = render_scaled_cached(title_font, header_txt, (245, 245, 245), 0.38)
         screen.blit(header, (panel_x + 26, panel_y + 18))
         
         # サブテキスト
-        sub = keycfg_font.render("↑↓: 選択 / Enter: プレビュー / ESC or O: 戻る", True, (220, 220, 220))
+        sub = render_cached(keycfg_font, "↑↓: 選択 / Enter: プレビュー / ESC or O: 戻る", (220, 220, 220))
         screen.blit(sub, (panel_x + 28, panel_y + 58))
         
         inner_x = panel_x + 26
@@ -259,7 +267,7 @@ class CommandListMenu:
                 pygame.draw.rect(screen, (90, 255, 220, 28), pygame.Rect(list_x + 10, list_y - 6, list_w - 20, row_h), 0)
                 pygame.draw.rect(screen, (90, 255, 220), pygame.Rect(list_x + 10, list_y - 6, list_w - 20, row_h), 1)
             c = (255, 240, 120) if selected else (230, 230, 230)
-            s = keycfg_font.render(label, True, c)
+            s = render_cached(keycfg_font, label, c)
             screen.blit(s, (list_x + 18, list_y))
             list_y += row_h
         
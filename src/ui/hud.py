@@ -6,6 +6,9 @@ import pygame
 
 from src.utils import constants
 
+# パワーゲージの区切り数。起動後に変わらないので一度だけ読む。
+_POWER_GAUGE_SEGMENTS = max(1, int(getattr(constants, "POWER_GAUGE_SEGMENTS", 10)))
+
 
 def draw_hp_bar(
     surface: pygame.Surface,
@@ -64,8 +67,7 @@ def draw_power_gauge(
     pygame.draw.rect(surface, (80, 160, 255), fill_rect)
     pygame.draw.rect(surface, (200, 200, 200), bg_rect, 2)
 
-    segs = int(getattr(constants, "POWER_GAUGE_SEGMENTS", 10))
-    segs = max(1, segs)
+    segs = _POWER_GAUGE_SEGMENTS
     for i in range(1, segs):
         xx = int(x + (w * i) / segs)
         pygame.draw.line(surface, (130, 130, 150), (xx, y + 1), (xx, y + h - 2), 1)
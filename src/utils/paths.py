@@ -1,9 +1,11 @@
 from __future__ import annotations
 
+from functools import lru_cache
 from pathlib import Path
 import sys
 
 
+@lru_cache(maxsize=1)
 def get_base_path() -> Path:
     # PyInstaller onefile/onedir builds set sys._MEIPASS to the temporary extraction directory.
     mei = getattr(sys, "_MEIPASS", None)
@@ -15,6 +17,7 @@ def get_base_path() -> Path:
     return Path(__file__).resolve().parents[2]
 
 
+@lru_cache(maxsize=256)
 def resource_path(relative_path: str | Path) -> Path:
     rel = Path(relative_path)
     return get_base_path() / rel